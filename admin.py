@@ -0,0 +1,104 @@
+"""
+Admin CLI: reminders ka bulk import / export, seedha DB file pe.
+
+    python admin.py import reminders.jsonl [--chat-id 123] [--format csv]
+    python admin.py export [--chat-id 123] [--format csv] [--out backup.csv]
+
+Import file streaming padhi jaati hai aur IMPORT_CHUNK_SIZE ke chunks
+executemany se insert hote hain. Bot chal raha ho to uski dispatch window
+ke andar wale rows nahi dikhenge, isliye CLI sirf 2 windows se aage ke
+reminders import karta hai (paas wale Telegram /import se karo).
+"""
+import argparse
+import logging
+import sys
+import time
+
+from config import DB_PATH, DISPATCH_WINDOW_MINUTES, IMPORT_CHUNK_SIZE, EXPORT_PAGE_SIZE
+from database import (
+    set_db_path, init_db, close_db, import_reminders,
+    get_reminders_page, get_chat_reminders_page,
+)
+from utils.bulk_io import FORMATS, ExportWriter, detect_format, iter_chunks, iter_import_records
+from utils.logger import setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Itne seconds se pehle due rows CLI import nahi karta
+MIN_LEAD_SECONDS = 2 * DISPATCH_WINDOW_MINUTES * 60
+
+def import_file(path: str, fmt: str, chat_id: int = None):
+    now = int(time.time())
+    errors = []
+    
+    def far_enough(records):
+        for record in records:
+            if record[2] <= now + MIN_LEAD_SECONDS:
+                errors.append(("-", f"{record[1]!r}: {DISPATCH_WINDOW_MINUTES * 2} min se pehle due hai"))
+                continue
+            yield record
+    
+    imported = 0
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        records = iter_import_records(f, fmt, now, chat_id=chat_id, errors=errors)
+        try:
+            for chunk in iter_chunks(far_enough(records), IMPORT_CHUNK_SIZE):
+                count, _ = import_reminders(chunk, schedule_until=0)
+                imported += count
+        except UnicodeDecodeError:
+            errors.append(("-", "file UTF-8 text nahi hai - import yahin ruk gaya"))
+    
+    print(f"✅ Imported {imported} reminders from {path}")
+    if errors:
+        print(f"⚠️ Skipped {len(errors)} rows:")
+        for line_no, reason in errors:
+            print(f"  line {line_no}: {reason}")
+
+def export_file(out, fmt: str, chat_id: int = None):
+    writer = ExportWriter(out, fmt)
+    key = (-1, 0)
+    while True:
+        if chat_id is None:
+            rows = get_reminders_page(key[0], key[1], sys.maxsize, EXPORT_PAGE_SIZE)
+        else:
+            rows = get_chat_reminders_page(chat_id, key[0], key[1], EXPORT_PAGE_SIZE)
+        if not rows:
+            break
+        writer.write_rows(rows)
+        key = (rows[-1][3], rows[-1][0])
+    return writer.count
+
+def main():
+    parser = argparse.ArgumentParser(description="Reminder bot admin tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    p_import = sub.add_parser("import", help="JSONL/CSV file se reminders import karo")
+    p_import.add_argument("path")
+    p_import.add_argument("--format", choices=FORMATS)
+    p_import.add_argument("--chat-id", type=int, help="Saare rows is chat ke (warna file ka chat_id)")
+    
+    p_export = sub.add_parser("export", help="Pending reminders JSONL/CSV mein export karo")
+    p_export.add_argument("--format", choices=FORMATS, default="jsonl")
+    p_export.add_argument("--chat-id", type=int)
+    p_export.add_argument("--out", help="Output file (default: stdout)")
+    
+    args = parser.parse_args()
+    # Logs stderr pe: `admin.py export > backup.jsonl` mein sirf data jaaye
+    setup_logging(sys.stderr)
+    set_db_path(DB_PATH)
+    init_db()
+    
+    try:
+        if args.command == "import":
+            import_file(args.path, args.format or detect_format(args.path), args.chat_id)
+        elif args.out:
+            with open(args.out, "w", encoding="utf-8", newline="") as out:
+                count = export_file(out, args.format, args.chat_id)
+            print(f"📤 Exported {count} reminders to {args.out}")
+        else:
+            export_file(sys.stdout, args.format, args.chat_id)
+    finally:
+        close_db()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Awaitable facade over database.py.
+
+Saari sqlite3 calls ek dedicated DB thread pe chalti hain, taaki slow disk
+ya lock wait ki wajah se event loop (aur baaki chats ke updates) na ruke.
+Queue bounded hai - DB_QUEUE_SIZE se zyada pending queries hone pe naye
+callers wait karte hain.
+"""
+import asyncio
+import functools
+import logging
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import database
+from config import DB_QUEUE_SIZE, GROUP_COMMIT_ENABLED
+
+logger = logging.getLogger(__name__)
+
+# Ek hi worker: SQLite writes waise bhi serialize hote hain, aur thread ka
+# pooled connection reuse hota rehta hai
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db")
+_slots = None
+
+async def run_db(func, *args, **kwargs):
+    """Koi bhi sync DB function DB thread pe chalao aur result ka wait karo"""
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(DB_QUEUE_SIZE)
+    
+    async with _slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _executor, functools.partial(func, *args, **kwargs)
+        )
+
+async def shutdown():
+    """Group-commit queue flush karo, DB thread ke connections band karo aur thread roko"""
+    await asyncio.to_thread(database.write_queue.stop)
+    await run_db(database.close_db)
+    _executor.shutdown(wait=True)
+    logger.info("DB thread stopped")
+
+# ========== CHANNELS ==========
+
+async def save_channel(chat_id: int, channel_type: str, value: str, verified: bool):
+    return await run_db(database.save_channel, chat_id, channel_type, value, verified)
+
+async def delete_channel(chat_id: int, channel_type: str):
+    return await run_db(database.delete_channel, chat_id, channel_type)
+
+async def _channel_profile(chat_id: int):
+    # Cache hit pe DB thread tak jaane ki zaroorat nahi
+    profile = database.channel_profiles.get(chat_id)
+    if profile is None:
+        profile = await run_db(database.get_channel_profile, chat_id)
+    return profile
+
+async def get_channel_status(chat_id: int) -> dict:
+    return dict((await _channel_profile(chat_id)).status)
+
+async def get_channels_summary(chat_id: int) -> str:
+    return (await _channel_profile(chat_id)).summary
+
+async def is_user_verified(chat_id: int) -> bool:
+    return (await _channel_profile(chat_id)).verified
+
+async def get_user_channels(chat_id: int):
+    return list((await _channel_profile(chat_id)).channels)
+
+# ========== REMINDERS ==========
+
+async def save_reminder(chat_id: int, text: str, run_at: datetime, job_name: str) -> int:
+    if GROUP_COMMIT_ENABLED:
+        # Write-behind batch; id commit ke baad milti hai
+        return await asyncio.wrap_future(database.write_queue.submit(
+            database._insert_reminder, chat_id, text, run_at, job_name
+        ))
+    return await run_db(database.save_reminder, chat_id, text, run_at, job_name)
+
+async def save_reminders(rows):
+    return await run_db(database.save_reminders, rows)
+
+async def cancel_reminders(chat_id: int, reminder_ids=None):
+    if GROUP_COMMIT_ENABLED:
+        return await asyncio.wrap_future(database.write_queue.submit(
+            database._cancel_reminders, chat_id, reminder_ids
+        ))
+    return await run_db(database.cancel_reminders, chat_id, reminder_ids)
+
+async def get_chat_reminders_page(chat_id: int, after_run_at: int, after_id: int, limit: int):
+    return await run_db(database.get_chat_reminders_page, chat_id, after_run_at, after_id, limit)
+
+async def get_chat_reminders_page_before(chat_id: int, before_run_at: int, before_id: int, limit: int):
+    return await run_db(
+        database.get_chat_reminders_page_before, chat_id, before_run_at, before_id, limit
+    )
+
+async def import_reminders(rows, schedule_until: int):
+    return await run_db(database.import_reminders, rows, schedule_until)
+
+async def compact_reminders(now: int, batch_size: int) -> int:
+    return await run_db(database.compact_reminders, now, batch_size)
+
+# ========== DELIVERY OUTBOX ==========
+
+async def enqueue_delivery(reminder_id, chat_id: int, text: str, late: bool, now: int,
+                           channels=None) -> int:
+    if GROUP_COMMIT_ENABLED:
+        # Fire path: ek tick mein fire hue saare reminders ek commit mein
+        return await asyncio.wrap_future(database.write_queue.submit(
+            database._enqueue_delivery, reminder_id, chat_id, text, late, now, channels
+        ))
+    return await run_db(
+        database.enqueue_delivery, reminder_id, chat_id, text, late, now, channels
+    )
+
+async def claim_due_deliveries(now: int, limit: int, lease_seconds: int):
+    return await run_db(database.claim_due_deliveries, now, limit, lease_seconds)
+
+async def complete_deliveries(delivered_ids, failures):
+    if GROUP_COMMIT_ENABLED:
+        return await asyncio.wrap_future(database.write_queue.submit(
+            database._complete_deliveries, delivered_ids, failures
+        ))
+    return await run_db(database.complete_deliveries, delivered_ids, failures)
+
+# ========== SEMANTIC PARSE CACHE ==========
+
+async def get_parse_rule(template: str):
+    return await run_db(database.get_parse_rule, template)
+
+async def record_parse_rule_hit(template: str, now: int):
+    return await run_db(database.record_parse_rule_hit, template, now)
+
+async def save_parse_rule(template: str, rule: dict, now: int, max_entries: int) -> int:
+    return await run_db(database.save_parse_rule, template, rule, now, max_entries)
+
+async def get_parse_rule_stats() -> dict:
+    return await run_db(database.get_parse_rule_stats)
@@ -0,0 +1 @@
+# khali file, bas folder ko Python package banane ke liye.​
\ No newline at end of file
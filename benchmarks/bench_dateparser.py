@@ -0,0 +1,65 @@
+"""
+dateparser fallback latency: purana 10x prefix loop vs single-scan span detector.
+
+Sirf woh inputs jo regex templates se match nahi hote aur dateparser tak
+girte hain. dateparser installed hona chahiye.
+
+Run: python -m benchmarks.bench_dateparser [--rounds 5]
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime
+
+import dateparser
+
+from utils.nlp_parser import (
+    DATEPARSER_LANGUAGES, DATEPARSER_SETTINGS, normalize_hinglish, parse_with_dateparser,
+)
+
+FALLTHROUGH_CORPUS = [
+    "next friday at 5 pm presentation dena",
+    "parso 3pm dentist appointment",
+    "on monday 10am standup meeting",
+    "18 november 9am bijli ka bill",
+    "call mom tomorrow 5pm",
+    "in 3 weeks passport renew karna",
+    "koi date nahi sirf text hai yahan",
+]
+
+def _legacy(processed_text: str):
+    """Purana loop: har prefix (10 words tak) pe dateparser.parse"""
+    words = processed_text.split()
+    calls = 0
+    for i in range(min(10, len(words)), 0, -1):
+        calls += 1
+        parsed = dateparser.parse(' '.join(words[:i]), settings=DATEPARSER_SETTINGS,
+                                  languages=DATEPARSER_LANGUAGES)
+        if parsed and parsed > datetime.now():
+            break
+    return calls
+
+def _timed(fn, text: str, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(text)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    
+    dateparser.parse("tomorrow 5pm")  # locale data warm karo
+    
+    print(f"{'input':<40} {'legacy ms':>10} {'calls':>6} {'span ms':>10}")
+    for text in FALLTHROUGH_CORPUS:
+        processed = normalize_hinglish(text)
+        legacy_ms = _timed(_legacy, processed, args.rounds)
+        span_ms = _timed(lambda t: parse_with_dateparser(t, text), processed, args.rounds)
+        print(f"{text:<40} {legacy_ms:10.1f} {_legacy(processed):6d} {span_ms:10.1f}")
+
+if __name__ == "__main__":
+    main()
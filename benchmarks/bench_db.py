@@ -0,0 +1,69 @@
+"""
+DB helpers ka ops/sec benchmark: purana per-call connect vs pooled connection.
+
+Run: python -m benchmarks.bench_db [--ops 5000]
+"""
+import argparse
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+from contextlib import contextmanager
+from pathlib import Path
+
+import database
+
+RUN_AT = datetime(2030, 1, 1, 9, 0)
+
+@contextmanager
+def _per_call_db():
+    """Purana get_db(): har call pe connect + close"""
+    conn = sqlite3.connect(database.DB_PATH)
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def _remind_round_trip(chat_id: int, i: int):
+    """Ek /remind jitna kaam: verify check, save, channels, delete"""
+    database.is_user_verified(chat_id)
+    rid = database.save_reminder(chat_id, f"bench {i}", RUN_AT, f"bench_{i}")
+    database.get_user_channels(chat_id)
+    database.delete_reminder(rid)
+
+def _run(ops: int) -> float:
+    start = time.perf_counter()
+    for i in range(ops):
+        _remind_round_trip(1000 + i % 50, i)
+    return ops / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.set_db_path(Path(tmp) / "bench.db")
+        database.init_db()
+        for chat_id in range(1000, 1050):
+            database.save_channel(chat_id, "telegram", str(chat_id), True)
+
+        pooled_get_db = database.get_db
+        database.get_db = _per_call_db
+        try:
+            before = _run(args.ops)
+        finally:
+            database.get_db = pooled_get_db
+        after = _run(args.ops)
+        database.close_db()
+
+    print(f"per-call connect : {before:10.0f} round-trips/sec")
+    print(f"pooled connection: {after:10.0f} round-trips/sec")
+    print(f"speedup          : {after / before:10.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Dispatcher memory benchmark: 1M stored reminders, sirf window heap mein.
+
+Purana tareeka har future reminder ke liye ek JobQueue job (aur usme
+reminder ka data) memory mein rakhta tha; yahan uska lower bound (saare
+rows memory mein) dispatcher ki window se compare hota hai.
+
+Run: python -m benchmarks.bench_dispatcher [--reminders 1000000]
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import database
+from utils.dispatcher import ReminderDispatcher
+
+YEAR_SECONDS = 365 * 24 * 3600
+
+class _NullJobQueue:
+    """Bench ke liye JobQueue stand-in - fired jobs sirf gin-ta hai"""
+    def __init__(self):
+        self.fired = 0
+    
+    def run_once(self, callback, when, chat_id, data, name):
+        self.fired += 1
+    
+    def run_repeating(self, callback, interval, first, name):
+        pass
+
+def _seed(count: int, now: int):
+    rng = random.Random(42)
+    chunk = []
+    with database.get_db() as conn:
+        for i in range(count):
+            run_at = now + rng.randint(1, YEAR_SECONDS)
+            chunk.append((1000 + i % 5000, f"bench reminder {i}", run_at, f"bench_{i}"))
+            if len(chunk) == 50_000:
+                conn.executemany(
+                    "INSERT INTO reminders (chat_id, reminder_text, run_at, job_name) "
+                    "VALUES (?, ?, ?, ?)", chunk
+                )
+                chunk.clear()
+        conn.executemany(
+            "INSERT INTO reminders (chat_id, reminder_text, run_at, job_name) "
+            "VALUES (?, ?, ?, ?)", chunk
+        )
+
+def _measure(label: str, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed * 1000:9.1f} ms  "
+          f"{current / 1e6:8.2f} MB held  {peak / 1e6:8.2f} MB peak")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reminders", type=int, default=1_000_000)
+    parser.add_argument("--window-minutes", type=int, default=10)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        database.set_db_path(Path(tmp) / "bench.db")
+        database.init_db()
+        now = int(time.time())
+        
+        start = time.perf_counter()
+        _seed(args.reminders, now)
+        print(f"Seeded {args.reminders} reminders in {time.perf_counter() - start:.1f}s\n")
+        
+        all_rows = _measure(
+            "load all (old restore)",
+            lambda: database.get_reminders_between(now, now + YEAR_SECONDS),
+        )
+        del all_rows
+        
+        dispatcher = ReminderDispatcher(args.window_minutes * 60, tick_seconds=1)
+        job_queue = _NullJobQueue()
+        _measure("dispatcher window prime", lambda: dispatcher.start(job_queue, None))
+        print(f"\nReminders held in window: {len(dispatcher)}")
+        
+        # Ek ghanta aage simulate karo: har tick pe refill + fire
+        async def advance():
+            for minute in range(1, 61):
+                fake_now = now + minute * 60
+                dispatcher._fire_due(fake_now)
+                if dispatcher.horizon - fake_now < dispatcher.window_seconds / 2:
+                    await dispatcher._refill(fake_now)
+        
+        start = time.perf_counter()
+        asyncio.run(advance())
+        print(f"Simulated 60 min: {job_queue.fired} fired, {len(dispatcher)} held, "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms total refill/fire time")
+        database.close_db()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+End-to-end /remind latency benchmark, poora offline.
+
+Pipeline: parse (regex / dateparser / Gemini fallback) -> save_reminder ->
+fire (outbox enqueue) -> delivery (Telegram + email). Gemini ki jagah
+FakeGeminiModel (recordings replay), Gmail ki jagah SMTPSink, Telegram ki
+jagah in-memory bot; DB temp directory mein.
+
+Run: python -m benchmarks.bench_e2e [--users 50] [--gemini-latency 0.3]
+                                    [--recordings gemini_recordings.jsonl]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+TEXTS = [
+    "10 min baad meeting attend karna",
+    "kal shaam 5 baje gym jana",
+    "tomorrow 9am standup",
+    "2 ghante baad khaana banana",
+    "next friday 7pm dinner with family",
+    "Friday shaam 6 baje dentist appointment",
+    "agle mangalvaar ko bill bharna",
+    "parso dopahar mummy ko call karna",
+]
+
+class _FakeBot:
+    """Telegram Bot ka send_message, network ke bina"""
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.sent = 0
+    
+    async def send_message(self, chat_id, text, **kwargs):
+        await asyncio.sleep(self.latency)
+        self.sent += 1
+
+def _summary(name: str, samples):
+    if not samples:
+        return f"{name:9s}: -"
+    samples = sorted(samples)
+    p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+    return (
+        f"{name:9s}: p50 {statistics.median(samples) * 1000:8.1f} ms | "
+        f"p95 {p95 * 1000:8.1f} ms | n {len(samples)}"
+    )
+
+async def _run(args):
+    # Backends env se select hote hain - isliye imports yahan, env set hone ke baad
+    import async_db
+    import database
+    from handlers.reminders import drain_outbox
+    from utils import gemini_parser
+    from utils.nlp_parser import parse_natural_reminder_async
+    from utils.notifications import smtp_sink
+    
+    for chat_id in range(1, args.users + 1):
+        database.save_channel(chat_id, "telegram", str(chat_id), True)
+        database.save_channel(chat_id, "email", f"user{chat_id}@example.com", True)
+    
+    bot = _FakeBot(args.telegram_latency)
+    stages = {"parse": [], "save": [], "deliver": [], "total": []}
+    sources = {}
+    
+    async def one_user(chat_id: int):
+        for i in range(args.reminders):
+            text = TEXTS[(chat_id + i) % len(TEXTS)]
+            start = time.perf_counter()
+            result = await parse_natural_reminder_async(text)
+            parsed = time.perf_counter()
+            source = result.get("parsed_as", "error").split(":")[0] if result["success"] else "error"
+            sources[source] = sources.get(source, 0) + 1
+            if not result["success"]:
+                continue
+            
+            rid = await async_db.save_reminder(
+                chat_id, result["reminder_text"], result["datetime"], f"bench_{chat_id}_{i}"
+            )
+            saved = time.perf_counter()
+            await async_db.enqueue_delivery(
+                rid, chat_id, result["reminder_text"], False, int(time.time())
+            )
+            await drain_outbox(bot)
+            delivered = time.perf_counter()
+            
+            stages["parse"].append(parsed - start)
+            stages["save"].append(saved - parsed)
+            stages["deliver"].append(delivered - saved)
+            stages["total"].append(delivered - start)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(one_user(c) for c in range(1, args.users + 1)))
+    # Kisi aur user ke drain ke andar pending rows bhi nipat jaayein
+    await drain_outbox(bot)
+    wall = time.perf_counter() - start
+    
+    print(f"{args.users} users x {args.reminders} reminders in {wall:.2f}s")
+    for name, samples in stages.items():
+        print(_summary(name, samples))
+    print("parsed by: " + ", ".join(f"{k} {v}" for k, v in sorted(sources.items())))
+    print(f"gemini    : {gemini_parser.model.stats()}")
+    print(f"telegram  : {bot.sent} sent | email sink: {smtp_sink.count} messages "
+          f"over {smtp_sink.connections} connections")
+    
+    await async_db.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--reminders", type=int, default=4)
+    parser.add_argument("--gemini-latency", type=float, default=0.3)
+    parser.add_argument("--gemini-failure-rate", type=float, default=0.0)
+    parser.add_argument("--smtp-connect-delay", type=float, default=0.05)
+    parser.add_argument("--telegram-latency", type=float, default=0.05)
+    parser.add_argument("--recordings", default="gemini_recordings.jsonl")
+    args = parser.parse_args()
+    
+    os.environ["GEMINI_BACKEND"] = "fake"
+    os.environ["GEMINI_RECORDINGS_PATH"] = args.recordings
+    os.environ["GEMINI_FAKE_LATENCY_SECONDS"] = str(args.gemini_latency)
+    os.environ["GEMINI_FAKE_FAILURE_RATE"] = str(args.gemini_failure_rate)
+    os.environ["SMTP_BACKEND"] = "sink"
+    os.environ["SMTP_SINK_CONNECT_DELAY_SECONDS"] = str(args.smtp_connect_delay)
+    
+    import database
+    with tempfile.TemporaryDirectory() as tmp:
+        database.set_db_path(Path(tmp) / "bench.db")
+        database.init_db()
+        asyncio.run(_run(args))
+        database.close_db()
+
+if __name__ == "__main__":
+    main()
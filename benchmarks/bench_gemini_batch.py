@@ -0,0 +1,81 @@
+"""
+Gemini fallback benchmark: har text ka alag prompt vs micro-batching.
+
+FakeGeminiModel use hota hai (network nahi); --latency aur --per-token
+real Gemini ka response time simulate karte hain. Token counts ~4 chars/token
+estimate hain.
+
+Run: python -m benchmarks.bench_gemini_batch [--requests 64] [--spread 0.5]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from utils import gemini_parser
+from utils.fakes import FakeGeminiModel
+
+TEXTS = [
+    "Friday shaam 6 baje dentist appointment",
+    "agle mangalvaar ko bill bharna",
+    "parso dopahar mummy ko call karna",
+    "next wednesday subah standup notes",
+    "somvaar raat ko packing",
+]
+
+async def _run(batcher, model, requests: int, spread: float, seed: int):
+    gemini_parser.model = model
+    gemini_parser.breaker.record_success()
+    rng = random.Random(seed)
+    latencies = []
+    
+    async def one(i):
+        await asyncio.sleep(rng.uniform(0, spread))
+        start = time.perf_counter()
+        result = await batcher.parse(f"{TEXTS[i % len(TEXTS)]} #{i}")
+        latencies.append(time.perf_counter() - start)
+        return result["success"]
+    
+    start = time.perf_counter()
+    ok = sum(await asyncio.gather(*(one(i) for i in range(requests))))
+    wall = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "ok": ok,
+        "wall": wall,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        **model.stats(),
+    }
+
+async def _main(args):
+    single = gemini_parser.GeminiBatcher(window=0, max_size=1)
+    batched = gemini_parser.GeminiBatcher(args.window_ms / 1000, args.max_batch)
+    
+    rows = []
+    for name, batcher in (("single", single), ("batched", batched)):
+        model = FakeGeminiModel(args.latency, args.per_token, seed=args.seed)
+        rows.append((name, await _run(batcher, model, args.requests, args.spread, args.seed)))
+    
+    print(f"{args.requests} fallback parses arriving over {args.spread}s")
+    for name, r in rows:
+        print(
+            f"{name:8s}: {r['calls']:4d} calls | prompt {r['prompt_tokens']:7d} tok | "
+            f"output {r['output_tokens']:6d} tok | p50 {r['p50'] * 1000:7.1f} ms | "
+            f"p95 {r['p95'] * 1000:7.1f} ms | wall {r['wall']:5.2f}s | ok {r['ok']}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--spread", type=float, default=0.5)
+    parser.add_argument("--window-ms", type=float, default=20)
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--per-token", type=float, default=0.002)
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(_main(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Group commit benchmark: har save / fire (status + outbox insert) ka apna
+transaction vs write-behind queue (GroupCommitQueue) jo ops ko ek
+transaction mein batch karta hai.
+
+Concurrent writers async facade jaise hi chalte hain (asyncio + threads).
+
+Run: python -m benchmarks.bench_group_commit [--writers 50] [--ops 40] [--delay-ms 0 2 5]
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import async_db
+import database
+
+RUN_AT = datetime(2030, 1, 1, 9, 0)
+FIRED_AT = int(RUN_AT.timestamp())
+CHANNELS = [("telegram", "bench")]
+
+async def _direct(chat_id: int, i: int):
+    rid = await async_db.run_db(database.save_reminder, chat_id, f"bench {i}", RUN_AT, f"b_{i}")
+    await async_db.run_db(
+        database.enqueue_delivery, rid, chat_id, f"bench {i}", False, FIRED_AT, CHANNELS
+    )
+
+async def _grouped(queue, chat_id: int, i: int):
+    rid = await asyncio.wrap_future(
+        queue.submit(database._insert_reminder, chat_id, f"bench {i}", RUN_AT, f"b_{i}")
+    )
+    await asyncio.wrap_future(queue.submit(
+        database._enqueue_delivery, rid, chat_id, f"bench {i}", False, FIRED_AT, CHANNELS
+    ))
+
+async def _run(op, writers: int, ops: int) -> float:
+    async def writer(w):
+        for i in range(ops):
+            await op(1000 + w, i)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(writer(w) for w in range(writers)))
+    return time.perf_counter() - start
+
+async def _main(args):
+    total = args.writers * args.ops * 2
+    
+    seconds = await _run(_direct, args.writers, args.ops)
+    print(f"per-op commit   : {total / seconds:8.1f} ops/sec | "
+          f"{total / seconds:8.1f} commits/sec | {total} commits")
+    
+    for delay_ms in args.delay_ms:
+        queue = database.GroupCommitQueue(args.max_batch, delay_ms / 1000)
+        seconds = await _run(lambda c, i: _grouped(queue, c, i), args.writers, args.ops)
+        queue.stop()
+        print(f"group {delay_ms:4.1f} ms: {total / seconds:8.1f} ops/sec | "
+              f"{queue.commits / seconds:8.1f} commits/sec | {queue.commits} commits "
+              f"(avg batch {queue.ops / max(queue.commits, 1):.1f})")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=50)
+    parser.add_argument("--ops", type=int, default=40)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--delay-ms", type=float, nargs="+", default=[0, 2, 5])
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        database.set_db_path(Path(tmp) / "bench.db")
+        database.init_db()
+        asyncio.run(_main(args))
+        database.close_db()
+
+if __name__ == "__main__":
+    main()
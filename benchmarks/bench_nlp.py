@@ -0,0 +1,66 @@
+"""
+Hinglish parse microbenchmark: regex stage ke parses/sec.
+
+"legacy" purane parse_natural_reminder ka regex stage hai (har call pe
+14 re.sub + 9 uncompiled re.search); "compiled" naya normalize_hinglish +
+ek combined template regex.
+
+Run: python -m benchmarks.bench_nlp [--rounds 2000]
+"""
+import argparse
+import re
+import time
+from datetime import datetime
+
+from utils.nlp_parser import HINGLISH_WORDS, TEMPLATES, match_template, normalize_hinglish
+
+CORPUS = [
+    "10 min baad meeting attend karna",
+    "2 ghante baad khaana banana",
+    "3 din baad bijli ka bill bharna",
+    "kal 9:30 pm mummy ko call",
+    "kal raat 11:50 movie dekhni hai",
+    "kal shaam 5 baje gym jana",
+    "tomorrow 9am standup",
+    "aaj raat 11 baje so jao",
+    "aaj 11 baje dentist",
+    "23:59 diary likhna",
+    "11 pm party ki taiyari",
+    "45 min baad chai",
+]
+
+def _legacy_regex_stage(text: str):
+    processed = text.lower()
+    for hindi, english in {rf'\b{k}\b': v for k, v in HINGLISH_WORDS.items()}.items():
+        processed = re.sub(hindi, english, processed, flags=re.IGNORECASE)
+    for pattern, _, _ in [(p, n, b) for n, p, b in TEMPLATES]:
+        match = re.search(pattern, processed, re.IGNORECASE)
+        if match:
+            return match
+    return None
+
+def _compiled_regex_stage(text: str):
+    return match_template(normalize_hinglish(text), datetime.now())
+
+def _rate(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in CORPUS:
+            fn(text)
+    return rounds * len(CORPUS) / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+    
+    # re module ka internal cache legacy ko thoda help karta hai - fair hai,
+    # production mein bhi yahi hota tha
+    before = _rate(_legacy_regex_stage, args.rounds)
+    after = _rate(_compiled_regex_stage, args.rounds)
+    print(f"legacy   : {before:10.0f} parses/sec")
+    print(f"compiled : {after:10.0f} parses/sec")
+    print(f"speedup  : {after / before:10.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Concurrent /remind parse throughput: inline (event loop thread) vs
+ParseService process pool.
+
+Corpus ke texts regex templates se miss hote hain, taaki har parse
+dateparser tak jaaye (CPU-bound hissa). Parse cache bypass hota hai.
+
+Run: python -m benchmarks.bench_parse_service [--requests 400] [--workers 1 2 4]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from utils.parse_service import ParseService
+
+CORPUS = [
+    "next friday 7pm dinner with family",
+    "on 18 november 10am doctor appointment",
+    "this saturday evening movie night",
+    "coming monday at 9 submit report",
+    "21st december birthday party",
+    "next wednesday 7am flight to delhi",
+]
+
+async def _throughput(service: ParseService, requests: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        service.parse_local(f"{CORPUS[i % len(CORPUS)]} {i}") for i in range(requests)
+    ))
+    return requests / (time.perf_counter() - start)
+
+async def _main(args):
+    inline = ParseService(0, args.queue_size, args.timeout)
+    await inline.parse_local(CORPUS[0])  # dateparser import + locale load bahar rakho
+    print(f"inline     : {await _throughput(inline, args.requests):8.1f} parses/sec")
+    
+    for workers in args.workers:
+        service = ParseService(workers, args.queue_size, args.timeout)
+        await service.start()
+        rate = await _throughput(service, args.requests)
+        print(f"{workers:2d} worker(s): {rate:8.1f} parses/sec | {service.stats()}")
+        service.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, os.cpu_count() or 1}))
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--timeout", type=float, default=30)
+    asyncio.run(_main(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+SMTP throughput benchmark: har email pe naya connection vs SMTPPool.
+
+Local SMTPSink use hota hai; --connect-delay real Gmail ke TLS handshake +
+login cost ko simulate karta hai.
+
+Run: python -m benchmarks.bench_smtp [--emails 200] [--connect-delay 0.05]
+"""
+import argparse
+import smtplib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.text import MIMEText
+
+from utils.fakes import SMTPSink
+from utils.notifications import SMTPPool
+
+def _message(i: int):
+    msg = MIMEText(f"Benchmark reminder {i}")
+    msg["Subject"] = "⏰ Reminder Notification"
+    msg["To"] = f"user{i}@example.com"
+    return msg
+
+def _per_email_connect(host, port, i):
+    """Purana tareeka: connect -> send -> quit, har email pe"""
+    with smtplib.SMTP(host, port) as server:
+        server.sendmail("bot@localhost", f"user{i}@example.com", _message(i).as_string())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--emails", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--connect-delay", type=float, default=0.05)
+    args = parser.parse_args()
+    
+    sink = SMTPSink(connect_delay=args.connect_delay).start()
+    host, port = sink.address
+    
+    with ThreadPoolExecutor(args.workers) as pool_threads:
+        start = time.perf_counter()
+        list(pool_threads.map(lambda i: _per_email_connect(host, port, i), range(args.emails)))
+        before = args.emails / (time.perf_counter() - start)
+        
+        pool = SMTPPool(host, port, use_ssl=False, username=None, password=None,
+                        size=args.workers)
+        start = time.perf_counter()
+        list(pool_threads.map(lambda i: pool.send(f"user{i}@example.com", _message(i)),
+                              range(args.emails)))
+        after = args.emails / (time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        pool.send_many([(f"user{i}@example.com", _message(i)) for i in range(args.emails)])
+        batched = args.emails / (time.perf_counter() - start)
+        pool.close()
+    
+    sink.stop()
+    print(f"connect per email : {before:8.1f} emails/sec")
+    print(f"pooled            : {after:8.1f} emails/sec")
+    print(f"pooled send_many  : {batched:8.1f} emails/sec (one connection)")
+    print(f"sink received {sink.count} messages over {sink.connections} connections")
+
+if __name__ == "__main__":
+    main()
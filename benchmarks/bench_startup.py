@@ -0,0 +1,59 @@
+"""
+Cold-start benchmark: fresh interpreter mein bot modules import karne ka time.
+
+Har run naya `python -c "import ..."` process hai (warm page cache, cold
+interpreter). main ko import karna = bot ke pehle update tak ka import cost;
+dateparser / gemini_parser alag se dikhate hain ki lazy hone se kya bacha.
+--budget-ms diya ho aur main ka median us se zyada ho to exit code 1
+(CI regression check).
+
+Run: python -m benchmarks.bench_startup [--runs 5] [--budget-ms 1500]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+MODULES = [
+    "main",
+    "handlers.reminders",
+    "utils.nlp_parser",
+    "dateparser",
+    "utils.gemini_parser",
+]
+
+def _import_seconds(module: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+    
+    baseline = statistics.median(_import_seconds("sys") for _ in range(args.runs))
+    print(f"{'interpreter':22s}: {baseline * 1000:8.1f} ms (subtracted below)")
+    
+    medians = {}
+    for module in MODULES:
+        try:
+            samples = [_import_seconds(module) - baseline for _ in range(args.runs)]
+        except subprocess.CalledProcessError:
+            print(f"{module:22s}: import failed (missing dependency?)")
+            continue
+        medians[module] = statistics.median(samples)
+        print(f"{module:22s}: {medians[module] * 1000:8.1f} ms median, "
+              f"{max(samples) * 1000:8.1f} ms max")
+    
+    if args.budget_ms is not None and "main" in medians:
+        if medians["main"] * 1000 > args.budget_ms:
+            print(f"❌ main import {medians['main'] * 1000:.1f} ms > budget {args.budget_ms} ms")
+            sys.exit(1)
+        print(f"✅ main import within budget ({args.budget_ms} ms)")
+
+if __name__ == "__main__":
+    main()
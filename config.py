@@ -6,13 +6,51 @@ load_dotenv()
 
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 DB_PATH = Path("reminders.db")
+# Async DB facade: ek saath kitni queries DB thread ke queue mein wait kar sakti hain
+DB_QUEUE_SIZE = 256
+# Group commit: save/delete reminder ops ek transaction mein batch (GROUP_COMMIT=1 se on)
+GROUP_COMMIT_ENABLED = os.getenv("GROUP_COMMIT", "0") == "1"
+GROUP_COMMIT_MAX_DELAY_MS = 2
+GROUP_COMMIT_MAX_BATCH = 256
+# Per-chat channel profile cache (verified flag, channels, summary) - LRU size
+CHANNEL_CACHE_MAX_ENTRIES = 10000
 
 # Gmail config
 GMAIL_EMAIL = os.getenv("GMAIL_EMAIL")
 GMAIL_APP_PASSWORD = os.getenv("GMAIL_APP_PASSWORD")
 
+# SMTP connection pool (sessions reuse hote hain, har email pe TLS + login nahi)
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "465"))
+SMTP_USE_SSL = os.getenv("SMTP_USE_SSL", "1") == "1"
+SMTP_POOL_SIZE = 4
+SMTP_TIMEOUT_SECONDS = 30
+# Itni der idle rehne ke baad connection pe NOOP check, aur max idle ke baad reconnect
+SMTP_NOOP_AFTER_SECONDS = 15
+SMTP_MAX_IDLE_SECONDS = 120
+
 # Gemini AI config
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+GEMINI_TIMEOUT_SECONDS = 8
+GEMINI_MAX_CONCURRENCY = 4
+# Itne lagataar failures ke baad circuit open: cooldown tak Gemini skip
+GEMINI_BREAKER_FAILURES = 5
+GEMINI_BREAKER_COOLDOWN_SECONDS = 60
+# Micro-batching: itne ms tak aaye fallback parses ek hi prompt mein (0 = off)
+GEMINI_BATCH_WINDOW_MS = 20
+GEMINI_BATCH_MAX_SIZE = 8
+
+# Offline / load-test backends (utils/fakes.py):
+# GEMINI_BACKEND=fake -> FakeGeminiModel (recordings replay + simulated latency/failures)
+# GEMINI_RECORD=1 -> real Gemini ke answers GEMINI_RECORDINGS_PATH mein record karo
+# SMTP_BACKEND=sink -> emails in-process SMTPSink mein jaate hain, Gmail nahi
+GEMINI_BACKEND = os.getenv("GEMINI_BACKEND", "real")
+GEMINI_RECORD = os.getenv("GEMINI_RECORD", "0") == "1"
+GEMINI_RECORDINGS_PATH = Path(os.getenv("GEMINI_RECORDINGS_PATH", "gemini_recordings.jsonl"))
+GEMINI_FAKE_LATENCY_SECONDS = float(os.getenv("GEMINI_FAKE_LATENCY_SECONDS", "0.3"))
+GEMINI_FAKE_FAILURE_RATE = float(os.getenv("GEMINI_FAKE_FAILURE_RATE", "0"))
+SMTP_BACKEND = os.getenv("SMTP_BACKEND", "real")
+SMTP_SINK_CONNECT_DELAY_SECONDS = float(os.getenv("SMTP_SINK_CONNECT_DELAY_SECONDS", "0"))
 
 SIGNUP_STATES = {
     "CHOOSE_TELEGRAM": 0,
@@ -28,5 +66,59 @@ REMIND_STATES = {
     "CONFIRM": 13,
 }
 
+# Ek /remind message mein max itni lines (har line = ek reminder)
+REMIND_BATCH_MAX_LINES = 20
+
+# Bulk import/export: DB tak itne rows ka ek chunk (ek transaction)
+IMPORT_CHUNK_SIZE = 500
+EXPORT_PAGE_SIZE = 1000
+# Telegram /import file size limit
+IMPORT_MAX_FILE_BYTES = 5 * 1024 * 1024
+# Isse aage ke run_at import nahi hote (galat / overflow values)
+IMPORT_MAX_AHEAD_DAYS = 10 * 365
+
+# /list: ek message mein itne reminders, baaki next/prev buttons se
+LIST_PAGE_SIZE = 10
+
+# /remind parse cache (normalized template -> relative/anchored rule)
+PARSE_CACHE_MAX_ENTRIES = 2048
+PARSE_CACHE_TTL_SECONDS = 6 * 3600
+# Optional process pool for regex + dateparser (0 = event loop thread pe inline)
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "0"))
+PARSE_QUEUE_SIZE = 64
+PARSE_TIMEOUT_SECONDS = 5
+# Gemini se seekhe rules SQLite mein (restart ke baad bhi); itne se zyada pe LRU eviction
+SEMANTIC_CACHE_MAX_ENTRIES = 5000
+
+# Dispatcher: sirf agle itne minute ke reminders memory (heap) mein rehte hain
+DISPATCH_WINDOW_MINUTES = 10
+DISPATCH_TICK_SECONDS = 1
+# Startup restore DB se itne rows ke chunks mein padhta hai
+RESTORE_CHUNK_SIZE = 1000
+# Bot offline tha tab ke missed reminders: har interval pe ek batch deliver
+CATCHUP_BATCH_SIZE = 20
+CATCHUP_INTERVAL_SECONDS = 5
+
+# Delivery outbox: retries exponential backoff ke saath (base * 2^attempts, max tak)
+OUTBOX_POLL_SECONDS = 5
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_LEASE_SECONDS = 120
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_BACKOFF_BASE_SECONDS = 10
+OUTBOX_BACKOFF_MAX_SECONDS = 3600
+
+# Compactor: finished (sent/cancelled/failed) reminders history table mein,
+# har run mein max COMPACT_MAX_BATCHES batches (beech mein baaki queries chalti rahein)
+COMPACT_INTERVAL_SECONDS = 300
+COMPACT_BATCH_SIZE = 500
+COMPACT_MAX_BATCHES = 20
+
+# Telegram flood limits: global msgs/sec aur har chat ke liye msgs/sec (+ burst)
+TELEGRAM_GLOBAL_RATE = 30
+TELEGRAM_PER_CHAT_RATE = 1
+TELEGRAM_PER_CHAT_BURST = 3
+# RetryAfter aane pe ek message kitni baar dobara try ho
+TELEGRAM_MAX_RETRY_AFTER = 3
+
 OTP_EXPIRY_MINUTES = 10
 MAX_OTP_ATTEMPTS = 3
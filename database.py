@@ -1,19 +1,83 @@
+import json
+import queue
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime
 from pathlib import Path
 from contextlib import contextmanager
 import logging
 
+from config import CHANNEL_CACHE_MAX_ENTRIES, GROUP_COMMIT_MAX_BATCH, GROUP_COMMIT_MAX_DELAY_MS
+
 logger = logging.getLogger(__name__)
 
 DB_PATH = None
 
+# Har connection pe ek baar lagne wale pragmas
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
+# sqlite3 ka prepared-statement cache (per connection)
+STATEMENT_CACHE_SIZE = 256
+
+_local = threading.local()
+_connections = []
+_connections_lock = threading.Lock()
+_generation = 0
+
 def set_db_path(path: Path):
     global DB_PATH
+    close_db()
     DB_PATH = path
+    channel_profiles.clear()
+
+def _connect() -> sqlite3.Connection:
+    # check_same_thread=False sirf isliye ki close_db() kisi bhi thread se
+    # band kar sake; use hamesha owner thread hi karta hai
+    conn = sqlite3.connect(
+        DB_PATH,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        check_same_thread=False,
+    )
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    logger.info(f"Opened SQLite connection to {DB_PATH}")
+    return conn
+
+def _get_connection() -> sqlite3.Connection:
+    """
+    Har thread ka apna long-lived connection (sqlite3 connections
+    thread-bound hote hain). Pehli baar use pe open hota hai.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.generation != _generation:
+        conn = _connect()
+        with _connections_lock:
+            _connections.append(conn)
+        _local.conn = conn
+        _local.generation = _generation
+    return conn
+
+def close_db():
+    """Saare open connections band karo (shutdown / path change pe)"""
+    global _generation
+    with _connections_lock:
+        for conn in _connections:
+            conn.close()
+        _connections.clear()
+        # Baaki threads agli baar naya connection khol lenge
+        _generation += 1
 
 @contextmanager
 def get_db():
-    conn = sqlite3.connect(DB_PATH)
+    conn = _get_connection()
     try:
         yield conn
         conn.commit()
@@ -21,35 +85,262 @@ def get_db():
         conn.rollback()
         logger.error(f"Database error: {e}")
         raise
-    finally:
-        conn.close()
+
+def to_epoch(dt: datetime) -> int:
+    """datetime (naive = local time) -> UTC epoch seconds, DB mein yahi store hota hai"""
+    return int(dt.timestamp())
+
+def from_epoch(ts: int) -> datetime:
+    """DB ka UTC epoch -> local naive datetime (baaki code isi mein kaam karta hai)"""
+    return datetime.fromtimestamp(ts)
+
+# ========== MIGRATIONS ==========
+# Har migration ek baar chalti hai; version PRAGMA user_version mein rehta hai.
+# Naye schema changes hamesha list ke end mein add karo, purane mat chhedo.
+
+def _migrate_base_schema(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS user_channels (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            chat_id INTEGER NOT NULL,
+            channel_type TEXT NOT NULL,
+            value TEXT NOT NULL,
+            is_verified INTEGER NOT NULL DEFAULT 0,
+            UNIQUE(chat_id, channel_type)
+        )
+    """)
+    
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS reminders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            chat_id INTEGER NOT NULL,
+            reminder_text TEXT NOT NULL,
+            run_at TEXT NOT NULL,
+            job_name TEXT NOT NULL
+        )
+    """)
+
+def _migrate_run_at_epoch(cur):
+    """run_at ISO text se INTEGER UTC epoch mein convert karo (table rebuild)"""
+    cur.execute("ALTER TABLE reminders RENAME TO reminders_old")
+    cur.execute("""
+        CREATE TABLE reminders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            chat_id INTEGER NOT NULL,
+            reminder_text TEXT NOT NULL,
+            run_at INTEGER NOT NULL,
+            job_name TEXT NOT NULL
+        )
+    """)
+    
+    old_rows = cur.connection.execute(
+        "SELECT id, chat_id, reminder_text, run_at, job_name FROM reminders_old"
+    )
+    cur.executemany(
+        "INSERT INTO reminders (id, chat_id, reminder_text, run_at, job_name) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (
+            (rid, chat_id, text, to_epoch(datetime.fromisoformat(run_at)), job_name)
+            for rid, chat_id, text, run_at, job_name in old_rows
+        )
+    )
+    cur.execute("DROP TABLE reminders_old")
+
+def _migrate_reminder_indexes(cur):
+    # Startup restore / due range scans: WHERE run_at BETWEEN .. ORDER BY run_at
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reminders_run_at "
+        "ON reminders(run_at, id)"
+    )
+    # /list aur per-chat lookups: WHERE chat_id = ? ORDER BY run_at
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reminders_chat_run_at "
+        "ON reminders(chat_id, run_at, id)"
+    )
+
+def _migrate_delivery_outbox(cur):
+    # Ek row per (reminder, channel); success pe row delete, retries khatam
+    # hone pe status 'failed' (inspection ke liye rehti hai)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS delivery_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            reminder_id INTEGER,
+            chat_id INTEGER NOT NULL,
+            channel_type TEXT NOT NULL,
+            target TEXT NOT NULL,
+            reminder_text TEXT NOT NULL,
+            late INTEGER NOT NULL DEFAULT 0,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at INTEGER NOT NULL,
+            last_error TEXT,
+            UNIQUE(reminder_id, channel_type, target)
+        )
+    """)
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_outbox_due "
+        "ON delivery_outbox(status, next_attempt_at)"
+    )
+
+def _migrate_parse_rules(cur):
+    # Gemini answers se seekhe hue /remind rules (template -> JSON rule)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS parse_rules (
+            template TEXT PRIMARY KEY,
+            rule TEXT NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0,
+            created_at INTEGER NOT NULL,
+            last_used_at INTEGER NOT NULL
+        )
+    """)
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_parse_rules_last_used "
+        "ON parse_rules(last_used_at)"
+    )
+
+def _migrate_reminder_status(cur):
+    # Soft delete: fire / cancel pe row delete nahi hoti, status badalta hai.
+    # Finished rows compactor reminders_history mein le jaata hai.
+    cur.execute("ALTER TABLE reminders ADD COLUMN status TEXT NOT NULL DEFAULT 'pending'")
+    cur.execute("ALTER TABLE reminders ADD COLUMN sent_at INTEGER")
+    cur.execute("ALTER TABLE reminders ADD COLUMN latency INTEGER")
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS reminders_history (
+            id INTEGER PRIMARY KEY,
+            chat_id INTEGER NOT NULL,
+            reminder_text TEXT NOT NULL,
+            run_at INTEGER NOT NULL,
+            job_name TEXT,
+            status TEXT NOT NULL,
+            sent_at INTEGER,
+            latency INTEGER,
+            archived_at INTEGER NOT NULL
+        )
+    """)
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_history_chat_run_at "
+        "ON reminders_history(chat_id, run_at)"
+    )
+    # Hot-path indexes sirf pending rows pe (partial), taaki chhote rahein
+    cur.execute("DROP INDEX IF EXISTS idx_reminders_run_at")
+    cur.execute("DROP INDEX IF EXISTS idx_reminders_chat_run_at")
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reminders_pending_run_at "
+        "ON reminders(run_at, id) WHERE status = 'pending'"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reminders_pending_chat_run_at "
+        "ON reminders(chat_id, run_at, id) WHERE status = 'pending'"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reminders_finished "
+        "ON reminders(id) WHERE status != 'pending'"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_outbox_reminder "
+        "ON delivery_outbox(reminder_id, status)"
+    )
+
+MIGRATIONS = [
+    _migrate_base_schema,
+    _migrate_run_at_epoch,
+    _migrate_reminder_indexes,
+    _migrate_delivery_outbox,
+    _migrate_parse_rules,
+    _migrate_reminder_status,
+]
 
 def init_db():
-    with get_db() as conn:
-        cur = conn.cursor()
-        
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS user_channels (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                chat_id INTEGER NOT NULL,
-                channel_type TEXT NOT NULL,
-                value TEXT NOT NULL,
-                is_verified INTEGER NOT NULL DEFAULT 0,
-                UNIQUE(chat_id, channel_type)
-            )
-        """)
-        
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS reminders (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                chat_id INTEGER NOT NULL,
-                reminder_text TEXT NOT NULL,
-                run_at TEXT NOT NULL,
-                job_name TEXT NOT NULL
+    """Schema ko latest version tak upgrade karo (purani reminders.db in-place)"""
+    conn = _get_connection()
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    
+    for target, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            migration(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {target}")
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Migration {target} ({migration.__name__}) failed: {e}")
+            raise
+        logger.info(f"Applied migration {target}: {migration.__name__}")
+    
+    logger.info("Database initialized successfully")
+
+# ========== CHANNEL PROFILE CACHE ==========
+# Har command pe is_user_verified aur har fire hue reminder pe channels ki
+# query hoti thi. Ab per-chat profile (verified flag, channels, summary)
+# memory mein rehta hai; save_channel / delete_channel write ke baad usi
+# transaction ke rows se profile update karte hain (write-through).
+
+class ChannelProfile:
+    __slots__ = ("verified", "channels", "status", "summary")
+    
+    def __init__(self, rows):
+        # rows: (channel_type, value, is_verified)
+        self.channels = tuple((ctype, value) for ctype, value, verified in rows if verified)
+        self.verified = bool(self.channels)
+        self.status = {ctype: bool(verified) for ctype, _, verified in rows}
+        if rows:
+            self.summary = "\n".join(
+                f"• {ctype}: {value} ({'✅ verified' if verified else '⏳ pending'})"
+                for ctype, value, verified in rows
             )
-        """)
-        
-        logger.info("Database initialized successfully")
+        else:
+            self.summary = "Koi channel select nahi kiya."
+
+class ChannelProfileCache:
+    """Bounded LRU: chat_id -> ChannelProfile (thread-safe)"""
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, chat_id: int):
+        with self._lock:
+            profile = self._entries.get(chat_id)
+            if profile is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(chat_id)
+            self.hits += 1
+            return profile
+    
+    def put(self, chat_id: int, profile: ChannelProfile):
+        with self._lock:
+            self._entries[chat_id] = profile
+            self._entries.move_to_end(chat_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+channel_profiles = ChannelProfileCache(CHANNEL_CACHE_MAX_ENTRIES)
+
+def _load_profile(cur, chat_id: int) -> ChannelProfile:
+    cur.execute(
+        "SELECT channel_type, value, is_verified "
+        "FROM user_channels WHERE chat_id = ? ORDER BY id",
+        (chat_id,)
+    )
+    return ChannelProfile(cur.fetchall())
+
+def get_channel_profile(chat_id: int) -> ChannelProfile:
+    profile = channel_profiles.get(chat_id)
+    if profile is not None:
+        return profile
+    with get_db() as conn:
+        profile = _load_profile(conn.cursor(), chat_id)
+    channel_profiles.put(chat_id, profile)
+    return profile
+
+# ========== CHANNELS ==========
 
 def save_channel(chat_id: int, channel_type: str, value: str, verified: bool):
     with get_db() as conn:
@@ -73,6 +364,9 @@ def save_channel(chat_id: int, channel_type: str, value: str, verified: bool):
                 (chat_id, channel_type, value, int(verified))
             )
             logger.info(f"Added channel {channel_type} for chat {chat_id}")
+        profile = _load_profile(cur, chat_id)
+    # Commit ke baad hi cache update - rollback hua to purana profile hi sahi hai
+    channel_profiles.put(chat_id, profile)
 
 def delete_channel(chat_id: int, channel_type: str):
     with get_db() as conn:
@@ -82,92 +376,473 @@ def delete_channel(chat_id: int, channel_type: str):
             (chat_id, channel_type)
         )
         logger.info(f"Deleted channel {channel_type} for chat {chat_id}")
+        profile = _load_profile(cur, chat_id)
+    channel_profiles.put(chat_id, profile)
 
 def get_channels_summary(chat_id: int) -> str:
+    return get_channel_profile(chat_id).summary
+
+def get_channel_status(chat_id: int) -> dict:
+    """channel_type -> verified flag, signup flow ke liye"""
+    return dict(get_channel_profile(chat_id).status)
+
+def is_user_verified(chat_id: int) -> bool:
+    return get_channel_profile(chat_id).verified
+
+def get_user_channels(chat_id: int):
+    return list(get_channel_profile(chat_id).channels)
+
+def _insert_reminder(cur, chat_id: int, text: str, run_at: datetime, job_name: str) -> int:
+    cur.execute(
+        "INSERT INTO reminders (chat_id, reminder_text, run_at, job_name) "
+        "VALUES (?, ?, ?, ?)",
+        (chat_id, text, to_epoch(run_at), job_name)
+    )
+    return cur.lastrowid
+
+def save_reminder(chat_id: int, text: str, run_at: datetime, job_name: str) -> int:
+    with get_db() as conn:
+        rid = _insert_reminder(conn.cursor(), chat_id, text, run_at, job_name)
+        logger.info(f"Saved reminder {rid} for chat {chat_id}")
+        return rid
+
+def save_reminders(rows):
+    """
+    Kai reminders ek transaction mein (ek commit). rows: (chat_id, text,
+    run_at, job_name) tuples. Return: same order mein naye ids.
+    """
     with get_db() as conn:
         cur = conn.cursor()
+        ids = []
+        for chat_id, text, run_at, job_name in rows:
+            ids.append(_insert_reminder(cur, chat_id, text, run_at, job_name))
+        logger.info(f"Saved {len(ids)} reminders in one transaction")
+        return ids
+
+def _delete_reminder(cur, reminder_id: int, chat_id: int = None) -> int:
+    # Soft delete: row 'cancelled' ho jaati hai, compactor baad mein history mein le jaata hai
+    if chat_id:
         cur.execute(
-            "SELECT channel_type, value, is_verified "
-            "FROM user_channels WHERE chat_id = ?",
+            "UPDATE reminders SET status = 'cancelled' "
+            "WHERE id = ? AND chat_id = ? AND status = 'pending'",
+            (reminder_id, chat_id)
+        )
+    else:
+        cur.execute(
+            "UPDATE reminders SET status = 'cancelled' WHERE id = ? AND status = 'pending'",
+            (reminder_id,)
+        )
+    return cur.rowcount
+
+def delete_reminder(reminder_id: int, chat_id: int = None):
+    with get_db() as conn:
+        _delete_reminder(conn.cursor(), reminder_id, chat_id)
+        logger.info(f"Cancelled reminder {reminder_id}")
+
+def _cancel_reminders(cur, chat_id: int, reminder_ids=None):
+    """
+    Chat ke reminders ek saath cancel karo (reminder_ids None = saare pending).
+    Return: jo sach mein cancel hue unki ids - baaki mile nahi ya pehle hi
+    fire/cancel ho chuke the.
+    """
+    if reminder_ids is None:
+        cur.execute(
+            "SELECT id FROM reminders WHERE chat_id = ? AND status = 'pending'",
             (chat_id,)
         )
-        rows = cur.fetchall()
+        reminder_ids = [row[0] for row in cur.fetchall()]
+    cancelled = []
+    for rid in dict.fromkeys(reminder_ids):
+        if _delete_reminder(cur, rid, chat_id):
+            cancelled.append(rid)
+    return cancelled
+
+def cancel_reminders(chat_id: int, reminder_ids=None):
+    with get_db() as conn:
+        cancelled = _cancel_reminders(conn.cursor(), chat_id, reminder_ids)
+        logger.info(f"Cancelled {len(cancelled)} reminders for chat {chat_id}")
+        return cancelled
+
+def get_reminders_between(after: int, until: int):
+    """after < run_at <= until wale pending reminders (epoch), idx_reminders_pending_run_at se range scan"""
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id, chat_id, reminder_text, run_at FROM reminders "
+            "WHERE status = 'pending' AND run_at > ? AND run_at <= ? ORDER BY run_at, id",
+            (after, until)
+        )
+        return cur.fetchall()
+
+def iter_reminders_between(after: int, until: int, chunk_size: int = 1000):
+    """get_reminders_between jaisa, par cursor se chunks mein stream karta hai"""
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id, chat_id, reminder_text, run_at FROM reminders "
+            "WHERE status = 'pending' AND run_at > ? AND run_at <= ? ORDER BY run_at, id",
+            (after, until)
+        )
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+
+def get_reminders_page(after_run_at: int, after_id: int, until: int, limit: int):
+    """Keyset page: (run_at, id) > (after_run_at, after_id) aur run_at <= until"""
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id, chat_id, reminder_text, run_at FROM reminders "
+            "WHERE status = 'pending' AND (run_at, id) > (?, ?) AND run_at <= ? "
+            "ORDER BY run_at, id LIMIT ?",
+            (after_run_at, after_id, until, limit)
+        )
+        return cur.fetchall()
+
+def get_chat_reminders_page(chat_id: int, after_run_at: int, after_id: int, limit: int):
+    """Ek chat ke reminders ka keyset page (chat_id, run_at, id) index pe"""
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id, chat_id, reminder_text, run_at FROM reminders "
+            "WHERE chat_id = ? AND status = 'pending' AND (run_at, id) > (?, ?) "
+            "ORDER BY run_at, id LIMIT ?",
+            (chat_id, after_run_at, after_id, limit)
+        )
+        return cur.fetchall()
+
+def get_chat_reminders_page_before(chat_id: int, before_run_at: int, before_id: int, limit: int):
+    """
+    (before_run_at, before_id) se pehle wala keyset page - /list ka "prev".
+    Index ulta padha jaata hai, rows (run_at DESC, id DESC) order mein aati hain.
+    """
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id, chat_id, reminder_text, run_at FROM reminders "
+            "WHERE chat_id = ? AND status = 'pending' AND (run_at, id) < (?, ?) "
+            "ORDER BY run_at DESC, id DESC LIMIT ?",
+            (chat_id, before_run_at, before_id, limit)
+        )
+        return cur.fetchall()
+
+def import_reminders(rows, schedule_until: int):
+    """
+    Bulk import ka ek chunk, ek transaction mein. rows: (chat_id, text,
+    run_at epoch). Door ke rows executemany se; jo schedule_until (dispatcher
+    window) ke andar hain unki ids chahiye, woh alag insert hote hain.
+    Return: (inserted count, [(id, chat_id, text, run_at)] window ke andar wale)
+    """
+    near, far = [], []
+    for row in rows:
+        (near if row[2] <= schedule_until else far).append(row)
     
-    if not rows:
-        return "Koi channel select nahi kiya."
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.executemany(
+            "INSERT INTO reminders (chat_id, reminder_text, run_at, job_name) "
+            "VALUES (?, ?, ?, ?)",
+            [(chat_id, text, run_at, f"import_{chat_id}_{run_at}")
+             for chat_id, text, run_at in far]
+        )
+        scheduled = []
+        for chat_id, text, run_at in near:
+            cur.execute(
+                "INSERT INTO reminders (chat_id, reminder_text, run_at, job_name) "
+                "VALUES (?, ?, ?, ?)",
+                (chat_id, text, run_at, f"import_{chat_id}_{run_at}")
+            )
+            scheduled.append((cur.lastrowid, chat_id, text, run_at))
     
-    lines = []
-    for ctype, value, verified in rows:
-        status = "✅ verified" if verified else "⏳ pending"
-        lines.append(f"• {ctype}: {value} ({status})")
-    return "\n".join(lines)
+    logger.info(f"Imported {len(rows)} reminders ({len(scheduled)} inside dispatch window)")
+    return len(rows), scheduled
 
-def is_user_verified(chat_id: int) -> bool:
+def count_reminders_until(until: int) -> int:
     with get_db() as conn:
         cur = conn.cursor()
         cur.execute(
-            "SELECT COUNT(*) FROM user_channels "
-            "WHERE chat_id = ? AND is_verified = 1",
-            (chat_id,)
+            "SELECT COUNT(*) FROM reminders WHERE status = 'pending' AND run_at <= ?",
+            (until,)
         )
-        count = cur.fetchone()[0]
-    return count > 0
+        return cur.fetchone()[0]
 
-def get_user_channels(chat_id: int):
+def compact_reminders(now: int, batch_size: int) -> int:
+    """
+    Finished (sent/cancelled/failed) rows ka ek batch reminders_history mein
+    move karo. Jin reminders ki outbox delivery abhi pending hai woh ruk
+    jaate hain (fail hue to status update hona hai). Return: moved rows.
+    """
     with get_db() as conn:
         cur = conn.cursor()
+        cur.execute(
+            "SELECT id FROM reminders r WHERE status != 'pending' "
+            "AND NOT EXISTS (SELECT 1 FROM delivery_outbox o "
+            "WHERE o.reminder_id = r.id AND o.status = 'pending') "
+            "ORDER BY id LIMIT ?",
+            (batch_size,)
+        )
+        ids = [(row[0],) for row in cur.fetchall()]
+        if not ids:
+            return 0
+        cur.executemany(
+            "INSERT INTO reminders_history "
+            "(id, chat_id, reminder_text, run_at, job_name, status, sent_at, latency, archived_at) "
+            "SELECT id, chat_id, reminder_text, run_at, job_name, status, sent_at, latency, ? "
+            "FROM reminders WHERE id = ?",
+            [(now, rid) for (rid,) in ids]
+        )
+        cur.executemany("DELETE FROM reminders WHERE id = ?", ids)
+        return len(ids)
+
+# ========== DELIVERY OUTBOX ==========
+
+def _enqueue_delivery(cur, reminder_id, chat_id: int, text: str, late: bool, now: int,
+                      channels=None) -> int:
+    if reminder_id is not None:
+        cur.execute(
+            "UPDATE reminders SET status = 'sent', sent_at = ?, latency = ? - run_at "
+            "WHERE id = ? AND status = 'pending'",
+            (now, now, reminder_id)
+        )
+        if cur.rowcount == 0:
+            return 0
+    
+    if channels is None:
         cur.execute(
             "SELECT channel_type, value FROM user_channels "
             "WHERE chat_id = ? AND is_verified = 1",
             (chat_id,)
         )
-        return cur.fetchall()
+        channels = cur.fetchall()
+    # Koi channel nahi: sirf Telegram chat me bhejo
+    channels = channels or [("telegram", str(chat_id))]
+    
+    cur.executemany(
+        "INSERT OR IGNORE INTO delivery_outbox "
+        "(reminder_id, chat_id, channel_type, target, reminder_text, late, next_attempt_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (reminder_id, chat_id, ctype, value, text, int(late), now)
+            for ctype, value in channels
+        ]
+    )
+    logger.info(f"Enqueued reminder {reminder_id} for {len(channels)} channel(s)")
+    return len(channels)
+
+def enqueue_delivery(reminder_id, chat_id: int, text: str, late: bool, now: int,
+                     channels=None) -> int:
+    """
+    Fire hue reminder ko outbox mein daalo (har verified channel ki ek row)
+    aur reminder ko 'sent' mark karo (sent_at + latency) - dono ek hi
+    transaction mein.
+    reminder_id None = test reminder. channels (channel_type, value) diye
+    hon (profile cache se) to user_channels query skip. Return: kitni rows
+    enqueue hui (0 = reminder pehle hi cancel/deliver ho chuka tha).
+    """
+    with get_db() as conn:
+        return _enqueue_delivery(conn.cursor(), reminder_id, chat_id, text, late, now, channels)
 
-def save_reminder(chat_id: int, text: str, run_at: str, job_name: str) -> int:
+def claim_due_deliveries(now: int, limit: int, lease_seconds: int):
+    """
+    Due outbox rows claim karo: next_attempt_at ko lease tak aage badha do,
+    taaki worker crash ho jaye to lease ke baad row dobara try ho.
+    """
     with get_db() as conn:
         cur = conn.cursor()
         cur.execute(
-            "INSERT INTO reminders (chat_id, reminder_text, run_at, job_name) "
-            "VALUES (?, ?, ?, ?)",
-            (chat_id, text, run_at, job_name)
+            "SELECT id, reminder_id, chat_id, channel_type, target, reminder_text, "
+            "late, attempts FROM delivery_outbox "
+            "WHERE status = 'pending' AND next_attempt_at <= ? "
+            "ORDER BY next_attempt_at LIMIT ?",
+            (now, limit)
         )
-        rid = cur.lastrowid
-        logger.info(f"Saved reminder {rid} for chat {chat_id}")
-        return rid
+        rows = cur.fetchall()
+        cur.executemany(
+            "UPDATE delivery_outbox SET next_attempt_at = ? WHERE id = ?",
+            [(now + lease_seconds, row[0]) for row in rows]
+        )
+        return rows
 
-def delete_reminder(reminder_id: int, chat_id: int = None):
+def _complete_deliveries(cur, delivered_ids, failures):
+    cur.executemany(
+        "DELETE FROM delivery_outbox WHERE id = ?",
+        [(oid,) for oid in delivered_ids]
+    )
+    cur.executemany(
+        "UPDATE delivery_outbox SET attempts = attempts + 1, "
+        "next_attempt_at = ?, last_error = ?, status = ? WHERE id = ?",
+        [(next_at, error, status, oid) for oid, next_at, error, status in failures]
+    )
+    # Kisi channel pe permanently fail hua to reminder bhi 'failed'
+    cur.executemany(
+        "UPDATE reminders SET status = 'failed' WHERE id = "
+        "(SELECT reminder_id FROM delivery_outbox WHERE id = ?)",
+        [(oid,) for oid, _, _, status in failures if status == "failed"]
+    )
+
+def complete_deliveries(delivered_ids, failures):
+    """
+    Ek batch ka result ek transaction mein likho.
+    failures: (outbox_id, next_attempt_at, error, status) tuples.
+    """
     with get_db() as conn:
-        cur = conn.cursor()
-        if chat_id:
-            cur.execute(
-                "DELETE FROM reminders WHERE id = ? AND chat_id = ?",
-                (reminder_id, chat_id)
-            )
-        else:
-            cur.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
-        logger.info(f"Deleted reminder {reminder_id}")
+        _complete_deliveries(conn.cursor(), delivered_ids, failures)
+
+# ========== SEMANTIC PARSE CACHE ==========
 
-def get_pending_reminders(chat_id: int = None):
+def get_parse_rule(template: str):
+    """Template ka stored rule (dict) ya None"""
     with get_db() as conn:
         cur = conn.cursor()
-        if chat_id:
-            cur.execute(
-                "SELECT id, reminder_text, run_at FROM reminders "
-                "WHERE chat_id = ? ORDER BY run_at",
-                (chat_id,)
-            )
-        else:
-            cur.execute(
-                "SELECT id, chat_id, reminder_text, run_at, job_name "
-                "FROM reminders ORDER BY run_at"
-            )
-        return cur.fetchall()
+        cur.execute("SELECT rule FROM parse_rules WHERE template = ?", (template,))
+        row = cur.fetchone()
+        return json.loads(row[0]) if row else None
 
-def get_reminder_by_id(reminder_id: int, chat_id: int):
+def record_parse_rule_hit(template: str, now: int):
+    with get_db() as conn:
+        conn.execute(
+            "UPDATE parse_rules SET hits = hits + 1, last_used_at = ? WHERE template = ?",
+            (now, template)
+        )
+
+def save_parse_rule(template: str, rule: dict, now: int, max_entries: int) -> int:
+    """
+    Rule save karo; table max_entries se bada ho jaye to sabse purane
+    (last_used_at) rules hatao. Return: kitne evict hue.
+    """
     with get_db() as conn:
         cur = conn.cursor()
         cur.execute(
-            "SELECT job_name FROM reminders WHERE id = ? AND chat_id = ?",
-            (reminder_id, chat_id)
+            "INSERT INTO parse_rules (template, rule, created_at, last_used_at) "
+            "VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(template) DO UPDATE SET rule = excluded.rule, "
+            "last_used_at = excluded.last_used_at",
+            (template, json.dumps(rule, ensure_ascii=False), now, now)
+        )
+        cur.execute("SELECT COUNT(*) FROM parse_rules")
+        excess = cur.fetchone()[0] - max_entries
+        if excess <= 0:
+            return 0
+        cur.execute(
+            "DELETE FROM parse_rules WHERE template IN ("
+            "SELECT template FROM parse_rules ORDER BY last_used_at LIMIT ?)",
+            (excess,)
         )
-        return cur.fetchone()
+        logger.info(f"Evicted {excess} parse rule(s)")
+        return excess
+
+def get_parse_rule_stats() -> dict:
+    with get_db() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM parse_rules")
+        entries, hits = cur.fetchone()
+        return {"entries": entries, "gemini_calls_avoided": hits}
+
+# ========== GROUP COMMIT ==========
+# Optional write-behind queue: save/delete ops ek writer thread pe jama hote
+# hain aur har GROUP_COMMIT_MAX_DELAY_MS ya GROUP_COMMIT_MAX_BATCH ops pe ek
+# hi transaction (ek fsync) mein commit hote hain. Har op ka result (jaise
+# nayi row id) commit ke baad uske Future pe milta hai.
+
+class GroupCommitQueue:
+    def __init__(self, max_batch: int, max_delay: float):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.commits = 0
+        self.ops = 0
+    
+    def submit(self, func, *args) -> Future:
+        """func(cursor, *args) writer thread pe chalega; Future commit ke baad resolve"""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((func, args, future))
+        return future
+    
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="db-group-commit", daemon=True
+                    )
+                    self._thread.start()
+    
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                # Deadline ke baad bhi jo pehle se queue mein hai woh isi batch mein
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # stop signal is batch ke baad
+                break
+            batch.append(item)
+        return batch
+    
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                break
+            self._commit(self._collect(first))
+        close_db_thread()
+    
+    def _commit(self, batch):
+        conn = _get_connection()
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            cur = conn.cursor()
+            for func, args, _ in batch:
+                # Har op apne savepoint mein: ek fail ho to baaki commit hote hain
+                cur.execute("SAVEPOINT op")
+                try:
+                    results.append((True, func(cur, *args)))
+                    cur.execute("RELEASE op")
+                except Exception as e:
+                    cur.execute("ROLLBACK TO op")
+                    cur.execute("RELEASE op")
+                    results.append((False, e))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Group commit of {len(batch)} ops failed: {e}")
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+        
+        self.commits += 1
+        self.ops += len(batch)
+        for (_, _, future), (ok, value) in zip(batch, results):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+    
+    def stop(self):
+        """Pending ops commit karke writer thread roko"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+def close_db_thread():
+    """Sirf current thread ka connection band karo"""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        with _connections_lock:
+            if conn in _connections:
+                _connections.remove(conn)
+        conn.close()
+        _local.conn = None
+
+write_queue = GroupCommitQueue(GROUP_COMMIT_MAX_BATCH, GROUP_COMMIT_MAX_DELAY_MS / 1000)
@@ -0,0 +1,161 @@
+from telegram import Update
+from telegram.ext import ContextTypes
+from datetime import datetime
+import asyncio
+import io
+import logging
+import tempfile
+import time
+
+from config import IMPORT_CHUNK_SIZE, EXPORT_PAGE_SIZE, IMPORT_MAX_FILE_BYTES
+from async_db import is_user_verified, import_reminders, get_chat_reminders_page
+from utils.bulk_io import (
+    FORMATS, ExportWriter, detect_format, iter_chunks, iter_import_records,
+)
+from database import to_epoch
+from utils.dispatcher import dispatcher
+from utils.nlp_parser import parse_natural_reminder_async
+
+logger = logging.getLogger(__name__)
+
+IMPORT_HELP = (
+    "📥 **Bulk import**\n\n"
+    "Ek .jsonl ya .csv file bhejo, caption mein /import likh ke.\n\n"
+    "JSONL (har line ek reminder):\n"
+    '`{"text": "gym jana", "run_at": "2026-10-20 17:00"}`\n\n'
+    "CSV (header ke saath):\n"
+    "`text,run_at`\n"
+    "`gym jana,2026-10-20 17:00`\n\n"
+    "run_at khaali chhodo to text /remind jaise parse hota hai:\n"
+    '`{"text": "kal shaam 5 baje gym"}`\n\n'
+    "💡 /export se apne reminders isi format mein download karo"
+)
+
+# ========== /import ==========
+
+async def _parse_text_rows(chunk, errors: list):
+    """Bina run_at wali rows (run_at None) NL parser se - chunk ki saari ek saath (Gemini batch ho sake)"""
+    todo = [i for i, row in enumerate(chunk) if row[2] is None]
+    if not todo:
+        return chunk
+    
+    results = await asyncio.gather(*(parse_natural_reminder_async(chunk[i][1]) for i in todo))
+    now = datetime.now()
+    parsed = {}
+    for i, result in zip(todo, results):
+        chat_id, text, _ = chunk[i]
+        if result.get("success") and result["datetime"] > now:
+            parsed[i] = (chat_id, result["reminder_text"], to_epoch(result["datetime"]))
+        else:
+            reason = (result.get("error") or "time past mein hai").splitlines()[0]
+            errors.append(("-", f"{text!r}: {reason}"))
+    
+    return [parsed[i] if row[2] is None else row
+            for i, row in enumerate(chunk) if row[2] is not None or i in parsed]
+
+async def import_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/import bina file ke: format samjhao"""
+    await update.message.reply_text(IMPORT_HELP)
+
+async def import_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Caption '/import' wala document: rows chunks mein DB mein daalo"""
+    chat_id = update.effective_chat.id
+    document = update.message.document
+    
+    if not await is_user_verified(chat_id):
+        await update.message.reply_text("❌ Pehle signup + OTP verify kar lo: /signup")
+        return
+    
+    if document.file_size and document.file_size > IMPORT_MAX_FILE_BYTES:
+        await update.message.reply_text(
+            f"❌ File bahut badi hai (max {IMPORT_MAX_FILE_BYTES // (1024 * 1024)} MB)."
+        )
+        return
+    
+    processing_msg = await update.message.reply_text("🔄 Import ho raha hai...")
+    
+    fmt = detect_format(document.file_name or "")
+    tg_file = await context.bot.get_file(document.file_id)
+    data = await tg_file.download_as_bytearray()
+    
+    # newline='' - CSV quoted fields mein newlines ke liye
+    lines = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8-sig", newline="")
+    errors = []
+    records = iter_import_records(
+        lines, fmt, int(time.time()), chat_id=chat_id, errors=errors, text_only=True
+    )
+    
+    imported = 0
+    try:
+        for chunk in iter_chunks(records, IMPORT_CHUNK_SIZE):
+            chunk = await _parse_text_rows(chunk, errors)
+            # Ek window ka margin: chunk save hote hote dispatcher ki window aage badh sakti hai
+            count, near = await import_reminders(
+                chunk, dispatcher.horizon + dispatcher.window_seconds
+            )
+            dispatcher.add_many(near)
+            imported += count
+    except UnicodeDecodeError:
+        # Pichhle chunks save ho chuke - baaki file skip
+        errors.append(("-", "file UTF-8 text nahi hai - import yahin ruk gaya"))
+    except Exception as e:
+        logger.error(f"Import failed for chat {chat_id} after {imported} rows: {e}")
+        await processing_msg.edit_text(
+            f"❌ Import beech mein fail ho gaya. {imported} reminders save ho chuke hain.\n\n"
+            f"💡 /list se check karo, baaki rows dobara import karo."
+        )
+        return
+    
+    logger.info(f"Chat {chat_id} imported {imported} reminders, {len(errors)} rows skipped")
+    
+    msg = f"✅ {imported} reminders import ho gaye!"
+    if errors:
+        msg += f"\n\n⚠️ {len(errors)} rows skip hui:\n" + "\n".join(
+            f"• line {line_no}: {reason}" for line_no, reason in errors[:10]
+        )
+        if len(errors) > 10:
+            msg += f"\n• ... aur {len(errors) - 10}"
+    msg += "\n\n💡 /list - Pending reminders dekho"
+    await processing_msg.edit_text(msg)
+
+# ========== /export ==========
+
+async def export_reminders(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/export [jsonl|csv]: pending reminders file mein (keyset pages, streaming)"""
+    chat_id = update.effective_chat.id
+    
+    if not await is_user_verified(chat_id):
+        await update.message.reply_text("❌ Pehle signup + OTP verify kar lo: /signup")
+        return
+    
+    fmt = context.args[0].lower() if context.args else "jsonl"
+    if fmt not in FORMATS:
+        await update.message.reply_text("❌ Format: /export jsonl ya /export csv")
+        return
+    
+    with tempfile.TemporaryFile("w+b") as raw:
+        out = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        writer = ExportWriter(out, fmt)
+        
+        key = (-1, 0)
+        while True:
+            rows = await get_chat_reminders_page(chat_id, key[0], key[1], EXPORT_PAGE_SIZE)
+            if not rows:
+                break
+            writer.write_rows(rows)
+            key = (rows[-1][3], rows[-1][0])
+        out.flush()
+        out.detach()  # raw file with-block band karega, wrapper nahi
+        
+        if not writer.count:
+            await update.message.reply_text("📭 Export karne ke liye koi pending reminder nahi hai.")
+            return
+        
+        raw.seek(0)
+        await update.message.reply_document(
+            document=raw,
+            filename=f"reminders_{chat_id}.{fmt}",
+            caption=f"📤 {writer.count} pending reminders",
+        )
+    
+    logger.info(f"Exported {writer.count} reminders for chat {chat_id}")
@@ -1,15 +1,30 @@
-from telegram import Update, ReplyKeyboardMarkup, ReplyKeyboardRemove
+from telegram import (
+    Update, ReplyKeyboardMarkup, ReplyKeyboardRemove, InlineKeyboardButton, InlineKeyboardMarkup,
+)
+from telegram.error import BadRequest, Forbidden
 from telegram.ext import ContextTypes, ConversationHandler
 from datetime import datetime
+import asyncio
 import logging
+import time
 
-from config import REMIND_STATES
-from database import (
-    is_user_verified, save_reminder, get_pending_reminders,
-    get_reminder_by_id, delete_reminder, get_user_channels
+from config import (
+    REMIND_STATES, REMIND_BATCH_MAX_LINES, LIST_PAGE_SIZE,
+    OUTBOX_BATCH_SIZE, OUTBOX_LEASE_SECONDS, OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_BACKOFF_BASE_SECONDS, OUTBOX_BACKOFF_MAX_SECONDS,
+    COMPACT_BATCH_SIZE, COMPACT_MAX_BATCHES,
+)
+from async_db import (
+    is_user_verified, save_reminder, save_reminders,
+    get_chat_reminders_page, get_chat_reminders_page_before,
+    cancel_reminders, get_user_channels, enqueue_delivery,
+    claim_due_deliveries, complete_deliveries, compact_reminders,
 )
-from utils.notifications import send_email_reminder
-from utils.nlp_parser import parse_natural_reminder
+from database import from_epoch, to_epoch
+from utils.dispatcher import dispatcher
+from utils.notifications import send_email_reminder_async
+from utils.rate_limiter import telegram_limiter
+from utils.nlp_parser import parse_natural_reminder_async
 
 logger = logging.getLogger(__name__)
 
@@ -21,57 +36,115 @@ CONFIRM = REMIND_STATES["CONFIRM"]
 # ========== JOB CALLBACK ==========
 
 async def send_reminder_job(context: ContextTypes.DEFAULT_TYPE):
-    """Actual reminder bhejne ka function - JobQueue se call hota hai"""
+    """
+    Reminder fire hone pe JobQueue se call hota hai. Delivery seedha nahi
+    karta - outbox mein daal ke drain trigger karta hai, taaki fail hone pe
+    retry ho (at-least-once) aur scheduler retries pe block na ho.
+    """
     job = context.job
     chat_id = job.chat_id
     data = job.data
-    text = data["text"]
     db_id = data["db_id"]
     
-    logger.info(f"Sending reminder {db_id} for chat {chat_id}")
-    
-    # User ke verified channels nikalo
-    channels = get_user_channels(chat_id)
-    reminder_msg = f"⏰ Reminder:\n{text}"
+    # Test reminders ke liye db_id = -1 (DB mein row nahi hai)
+    reminder_id = None if db_id == -1 else db_id
+    # Channels profile cache se (burst mein har reminder pe SELECT nahi)
+    channels = await get_user_channels(chat_id)
+    enqueued = await enqueue_delivery(
+        reminder_id, chat_id, data["text"], data.get("late", False), int(time.time()),
+        channels,
+    )
     
-    sent_count = 0
+    if not enqueued:
+        logger.info(f"Reminder {db_id} already cancelled/delivered, skipping")
+        return
     
-    if channels:
-        for ctype, value in channels:
-            try:
-                if ctype == "telegram":
-                    await context.bot.send_message(
-                        chat_id=int(value),
-                        text=reminder_msg,
-                    )
-                    sent_count += 1
-                    logger.info(f"Telegram reminder sent to chat {value}")
-                    
-                elif ctype == "email":
-                    send_email_reminder(value, text)
-                    sent_count += 1
-                    logger.info(f"Email reminder sent to {value}")
-                    
-            except Exception as e:
-                logger.error(f"Failed to send reminder via {ctype}: {e}")
+    logger.info(f"Reminder {db_id} queued for {enqueued} channel(s)")
+    await drain_outbox(context.bot)
+
+def _outbox_message(text: str, late: bool) -> str:
+    if late:
+        # Bot offline tha tab ka missed reminder, catch-up se aa raha hai
+        return f"⏰ Reminder (late - bot offline tha):\n{text}"
+    return f"⏰ Reminder:\n{text}"
+
+async def _deliver(bot, ctype: str, target: str, text: str, late: bool):
+    if ctype == "telegram":
+        await telegram_limiter.send_message(bot, int(target), _outbox_message(text, late))
+    elif ctype == "email":
+        await send_email_reminder_async(target, text)
     else:
-        # Fallback: sirf Telegram chat me bhejo
-        try:
-            await context.bot.send_message(
-                chat_id=chat_id,
-                text=reminder_msg,
-            )
-            sent_count += 1
-            logger.warning(f"No channels found, sent to Telegram fallback for {chat_id}")
-        except Exception as e:
-            logger.error(f"Fallback Telegram send failed: {e}")
-    
-    # DB se reminder delete karo (test reminders ke liye db_id = -1)
-    if db_id != -1:
-        delete_reminder(db_id)
-        logger.info(f"Reminder {db_id} deleted from database")
+        raise ValueError(f"Unknown channel type: {ctype}")
+
+_drain_lock = asyncio.Lock()
+_outbox_dirty = False
+
+async def drain_outbox(bot):
+    """
+    Due outbox rows batches mein deliver karo. Ek time pe ek hi drain chalta
+    hai; beech mein naya enqueue hua to chalta hua drain use bhi utha leta hai.
+    """
+    global _outbox_dirty
+    _outbox_dirty = True
+    if _drain_lock.locked():
+        return
     
-    logger.info(f"✅ Reminder {db_id} sent successfully to {sent_count} channel(s)")
+    async with _drain_lock:
+        while _outbox_dirty:
+            _outbox_dirty = False
+            while True:
+                now = int(time.time())
+                rows = await claim_due_deliveries(now, OUTBOX_BATCH_SIZE, OUTBOX_LEASE_SECONDS)
+                if not rows:
+                    break
+                
+                results = await asyncio.gather(
+                    *(_deliver(bot, ctype, target, text, late)
+                      for _, _, _, ctype, target, text, late, _ in rows),
+                    return_exceptions=True,
+                )
+                
+                delivered, failures = [], []
+                for row, result in zip(rows, results):
+                    oid, rid, _, ctype, target, _, _, attempts = row
+                    if not isinstance(result, Exception):
+                        delivered.append(oid)
+                        logger.info(f"Reminder {rid} delivered via {ctype} to {target}")
+                        continue
+                    
+                    attempts += 1
+                    permanent = isinstance(result, (Forbidden, BadRequest, ValueError))
+                    if permanent or attempts >= OUTBOX_MAX_ATTEMPTS:
+                        failures.append((oid, now, str(result), "failed"))
+                        logger.error(f"Reminder {rid} via {ctype} failed permanently: {result}")
+                    else:
+                        delay = min(
+                            OUTBOX_BACKOFF_BASE_SECONDS * 2 ** (attempts - 1),
+                            OUTBOX_BACKOFF_MAX_SECONDS,
+                        )
+                        failures.append((oid, now + delay, str(result), "pending"))
+                        logger.warning(
+                            f"Reminder {rid} via {ctype} failed (attempt {attempts}), "
+                            f"retry in {delay}s: {result}"
+                        )
+                
+                await complete_deliveries(delivered, failures)
+
+async def drain_outbox_job(context: ContextTypes.DEFAULT_TYPE):
+    """Repeating job: retries aur crash ke baad bache outbox rows uthata hai"""
+    await drain_outbox(context.bot)
+
+async def compact_reminders_job(context: ContextTypes.DEFAULT_TYPE):
+    """Repeating job: finished reminders ko batches mein reminders_history mein le jao"""
+    now = int(time.time())
+    moved = 0
+    for _ in range(COMPACT_MAX_BATCHES):
+        batch = await compact_reminders(now, COMPACT_BATCH_SIZE)
+        moved += batch
+        if batch < COMPACT_BATCH_SIZE:
+            break
+    if moved:
+        logger.info(f"🗄️ Compacted {moved} finished reminders into history")
 
 # ========== /testremind COMMAND ==========
 
@@ -106,7 +179,7 @@ async def remind_natural(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     chat_id = update.effective_chat.id
     
-    if not is_user_verified(chat_id):
+    if not await is_user_verified(chat_id):
         await update.message.reply_text(
             "❌ Pehle signup + OTP verify kar lo: /signup\n\n"
             "Channels setup karne ke baad hi reminder set kar sakte ho."
@@ -127,6 +200,12 @@ async def remind_natural(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
     
+    # Multi-line message: har line ek alag reminder
+    lines = _remind_lines(update.message.text)
+    if len(lines) > 1:
+        await _remind_batch(update, chat_id, lines)
+        return
+    
     full_text = ' '.join(context.args)
     logger.info(f"🤖 Natural language reminder: {full_text}")
     
@@ -134,7 +213,7 @@ async def remind_natural(update: Update, context: ContextTypes.DEFAULT_TYPE):
     processing_msg = await update.message.reply_text("🔄 Parsing reminder...")
     
     # Parse natural language
-    result = parse_natural_reminder(full_text)
+    result = await parse_natural_reminder_async(full_text)
     
     if not result["success"]:
         await processing_msg.edit_text(
@@ -158,16 +237,10 @@ async def remind_natural(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     # Save to DB
     job_name = f"reminder_{chat_id}_{reminder_dt.timestamp()}"
-    rid = save_reminder(chat_id, text, reminder_dt.isoformat(), job_name)
+    rid = await save_reminder(chat_id, text, reminder_dt, job_name)
     
-    # Schedule job
-    context.job_queue.run_once(
-        send_reminder_job,
-        when=delay_seconds,
-        chat_id=chat_id,
-        data={"text": text, "db_id": rid},
-        name=job_name,
-    )
+    # Dispatcher ko batao (window ke andar hua to turant heap mein)
+    dispatcher.add(rid, chat_id, text, to_epoch(reminder_dt))
     
     logger.info(f"✅ Natural reminder {rid} scheduled: {parsed_as}")
     
@@ -191,13 +264,77 @@ async def remind_natural(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"• /cancel {rid} - Ye reminder cancel karo"
     )
 
+def _remind_lines(message_text: str):
+    """'/remind' ke baad ka text, non-empty lines mein"""
+    parts = message_text.split(None, 1)
+    if len(parts) < 2:
+        return []
+    return [line.strip() for line in parts[1].splitlines() if line.strip()]
+
+async def _remind_batch(update: Update, chat_id: int, lines):
+    """
+    Batch /remind: saari lines parallel parse (Gemini fallbacks ek prompt mein
+    batch ho jaate hain), ek transaction mein save, ek pass mein schedule,
+    aur ek hi combined confirmation.
+    """
+    if len(lines) > REMIND_BATCH_MAX_LINES:
+        await update.message.reply_text(
+            f"❌ Ek message mein max {REMIND_BATCH_MAX_LINES} reminders.\n"
+            f"Tumne {len(lines)} lines bheji hain."
+        )
+        return
+    
+    logger.info(f"🤖 Batch reminder: {len(lines)} lines")
+    processing_msg = await update.message.reply_text(
+        f"🔄 Parsing {len(lines)} reminders..."
+    )
+    
+    results = await asyncio.gather(*(parse_natural_reminder_async(line) for line in lines))
+    
+    now = datetime.now()
+    to_save, failed = [], []
+    for line, result in zip(lines, results):
+        if not result["success"]:
+            failed.append((line, result["error"]))
+        elif result["datetime"] <= now:
+            failed.append((line, "Ye time already nikal gaya hai."))
+        else:
+            to_save.append(result)
+    
+    ids = []
+    if to_save:
+        ids = await save_reminders([
+            (chat_id, r["reminder_text"], r["datetime"],
+             f"reminder_{chat_id}_{r['datetime'].timestamp()}")
+            for r in to_save
+        ])
+        dispatcher.add_many(
+            (rid, chat_id, r["reminder_text"], to_epoch(r["datetime"]))
+            for rid, r in zip(ids, to_save)
+        )
+        logger.info(f"✅ Batch: {len(ids)} reminders scheduled for chat {chat_id}")
+    
+    message = [f"✅ **{len(ids)}/{len(lines)} reminders set ho gaye!**\n"]
+    for rid, r in zip(ids, to_save):
+        message.append(
+            f"🆔 {rid} | ⏰ {r['datetime'].strftime('%d %b, %I:%M %p')}\n"
+            f"   📝 {r['reminder_text']}"
+        )
+    if failed:
+        message.append("\n❌ Ye lines set nahi hui:")
+        for line, error in failed:
+            message.append(f"• {line}\n   {error.splitlines()[0]}")
+    message.append("\n💡 /list - Pending reminders dekho")
+    
+    await processing_msg.edit_text("\n".join(message))
+
 # ========== INTERACTIVE /remindstep FLOW ==========
 
 async def remind_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Step 1: Reminder text pucho"""
     chat_id = update.effective_chat.id
     
-    if not is_user_verified(chat_id):
+    if not await is_user_verified(chat_id):
         await update.message.reply_text(
             "❌ Pehle signup + OTP verify kar lo: /signup\n\n"
             "Channels setup karne ke baad hi reminder set kar sakte ho."
@@ -349,16 +486,10 @@ async def remind_save(update: Update, context: ContextTypes.DEFAULT_TYPE):
     job_name = f"reminder_{chat_id}_{reminder_dt.timestamp()}"
     
     # DB mein save karo
-    rid = save_reminder(chat_id, text, reminder_dt.isoformat(), job_name)
+    rid = await save_reminder(chat_id, text, reminder_dt, job_name)
     
-    # JobQueue mein schedule karo
-    context.job_queue.run_once(
-        send_reminder_job,
-        when=delay_seconds,
-        chat_id=chat_id,
-        data={"text": text, "db_id": rid},
-        name=job_name,
-    )
+    # Dispatcher ko batao
+    dispatcher.add(rid, chat_id, text, to_epoch(reminder_dt))
     
     logger.info(f"✅ Reminder {rid} scheduled for chat {chat_id} at {reminder_dt}")
     
@@ -397,17 +528,105 @@ async def remind_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 # ========== /list COMMAND ==========
 
+# Callback data: "list:n:<run_at>:<id>" (us key ke baad) / "list:p:<run_at>:<id>" (pehle)
+LIST_CALLBACK_PREFIX = "list:"
+# "cancel:<rid>:<page key>" (/list button), "cancel:all" / "cancel:keep" (/cancel all confirm)
+CANCEL_CALLBACK_PREFIX = "cancel:"
+LIST_START_KEY = (-1, 0)
+
+def _format_list_row(rid: int, text: str, run_at: int, now: datetime) -> str:
+    try:
+        run_dt = from_epoch(run_at)
+        formatted_time = run_dt.strftime("%d %b %Y, %I:%M %p")
+        
+        # Calculate time remaining
+        diff = (run_dt - now).total_seconds()
+        if diff > 0:
+            hours = int(diff // 3600)
+            minutes = int((diff % 3600) // 60)
+            if hours > 0:
+                time_left = f"{hours}h {minutes}m"
+            else:
+                time_left = f"{minutes}m"
+            time_status = f"🕐 {time_left} mein"
+        else:
+            time_status = "⚠️ Time passed"
+        
+        return (
+            f"🆔 ID: {rid}\n"
+            f"📝 {text}\n"
+            f"⏰ {formatted_time}\n"
+            f"{time_status}\n"
+        )
+    except Exception as e:
+        logger.error(f"Error formatting reminder {rid}: {e}")
+        return f"🆔 ID: {rid}\n📝 {text}\n⏰ {run_at}\n"
+
+async def _list_page(chat_id: int, direction: str = "n", key=LIST_START_KEY):
+    """
+    Keyset page (run_at, id) pe - har page ek indexed range query, OFFSET nahi.
+    Ek extra row maang ke pata chalta hai ki us taraf aur page hai ya nahi.
+    Return: (rows, has_prev, has_next)
+    """
+    if direction == "p":
+        rows = await get_chat_reminders_page_before(chat_id, key[0], key[1], LIST_PAGE_SIZE + 1)
+        has_prev = len(rows) > LIST_PAGE_SIZE
+        rows = rows[:LIST_PAGE_SIZE][::-1]
+        if rows:
+            return rows, has_prev, True
+    else:
+        rows = await get_chat_reminders_page(chat_id, key[0], key[1], LIST_PAGE_SIZE + 1)
+        has_next = len(rows) > LIST_PAGE_SIZE
+        rows = rows[:LIST_PAGE_SIZE]
+        if rows or key == LIST_START_KEY:
+            return rows, key != LIST_START_KEY, has_next
+    
+    # Beech mein reminders fire / cancel ho gaye - pehle page se shuru karo
+    return await _list_page(chat_id)
+
+def _list_markup(rows, has_prev: bool, has_next: bool):
+    # Cancel button pe page ki start key bhi jaati hai, taaki cancel ke baad
+    # wahi page dobara render ho: (run_at, id - 1) ke baad = pehli row se
+    first = rows[0]
+    page_key = f"{first[3]}:{first[0] - 1}" if has_prev else "%d:%d" % LIST_START_KEY
+    cancel_buttons = [
+        InlineKeyboardButton(f"❌ {rid}", callback_data=f"{CANCEL_CALLBACK_PREFIX}{rid}:{page_key}")
+        for rid, _, _, _ in rows
+    ]
+    keyboard = [cancel_buttons[i:i + 5] for i in range(0, len(cancel_buttons), 5)]
+    
+    nav = []
+    if has_prev:
+        nav.append(InlineKeyboardButton(
+            "⬅️ Prev", callback_data=f"{LIST_CALLBACK_PREFIX}p:{first[3]}:{first[0]}"
+        ))
+    if has_next:
+        last = rows[-1]
+        nav.append(InlineKeyboardButton(
+            "Next ➡️", callback_data=f"{LIST_CALLBACK_PREFIX}n:{last[3]}:{last[0]}"
+        ))
+    if nav:
+        keyboard.append(nav)
+    return InlineKeyboardMarkup(keyboard)
+
+def _list_message(rows) -> str:
+    now = datetime.now()
+    lines = [_format_list_row(rid, text, run_at, now) for rid, _, text, run_at in rows]
+    msg = "📋 **Tumhare pending reminders:**\n\n" + "\n".join(lines)
+    msg += "\n💡 Cancel karne ke liye: ❌ button ya /cancel <id> [<id> ...]"
+    return msg
+
 async def list_reminders(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """User ke saare pending reminders show karo"""
+    """User ke pending reminders ka pehla page show karo"""
     chat_id = update.effective_chat.id
     
-    if not is_user_verified(chat_id):
+    if not await is_user_verified(chat_id):
         await update.message.reply_text(
             "❌ Pehle signup + OTP verify kar lo: /signup"
         )
         return
     
-    rows = get_pending_reminders(chat_id)
+    rows, has_prev, has_next = await _list_page(chat_id)
     
     if not rows:
         await update.message.reply_text(
@@ -420,107 +639,153 @@ async def list_reminders(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     logger.info(f"Listing {len(rows)} reminders for chat {chat_id}")
     
-    lines = []
-    for rid, text, run_at in rows:
-        try:
-            run_dt = datetime.fromisoformat(run_at)
-            formatted_time = run_dt.strftime("%d %b %Y, %I:%M %p")
-            
-            # Calculate time remaining
-            now = datetime.now()
-            diff = (run_dt - now).total_seconds()
-            if diff > 0:
-                hours = int(diff // 3600)
-                minutes = int((diff % 3600) // 60)
-                if hours > 0:
-                    time_left = f"{hours}h {minutes}m"
-                else:
-                    time_left = f"{minutes}m"
-                time_status = f"🕐 {time_left} mein"
-            else:
-                time_status = "⚠️ Time passed"
-            
-            lines.append(
-                f"🆔 ID: {rid}\n"
-                f"📝 {text}\n"
-                f"⏰ {formatted_time}\n"
-                f"{time_status}\n"
-            )
-        except Exception as e:
-            logger.error(f"Error formatting reminder {rid}: {e}")
-            lines.append(f"🆔 ID: {rid}\n📝 {text}\n⏰ {run_at}\n")
+    await update.message.reply_text(
+        _list_message(rows),
+        reply_markup=_list_markup(rows, has_prev, has_next),
+    )
+
+async def list_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/list ke Prev / Next buttons: usi message ko agle page se edit karo"""
+    query = update.callback_query
+    chat_id = update.effective_chat.id
+    await query.answer()
     
-    msg = f"📋 **Tumhare pending reminders ({len(rows)}):**\n\n" + "\n".join(lines)
-    msg += "\n💡 Cancel karne ke liye: /cancel <id>"
+    try:
+        _, direction, run_at, rid = query.data.split(":")
+        key = (int(run_at), int(rid))
+    except ValueError:
+        logger.warning(f"Bad list callback data: {query.data}")
+        return
     
-    await update.message.reply_text(msg)
+    await _edit_list_page(query, chat_id, direction, key)
+
+async def _edit_list_page(query, chat_id: int, direction: str, key):
+    rows, has_prev, has_next = await _list_page(chat_id, direction, key)
+    try:
+        if not rows:
+            await query.edit_message_text("📭 Abhi koi pending reminder nahi hai.")
+            return
+        await query.edit_message_text(
+            _list_message(rows),
+            reply_markup=_list_markup(rows, has_prev, has_next),
+        )
+    except BadRequest as e:
+        # Same page dobara (double tap) - "message is not modified"
+        if "not modified" not in str(e).lower():
+            raise
 
 # ========== /cancel COMMAND ==========
 
+CANCEL_USAGE = (
+    "❌ Reminder ID do.\n\n"
+    "Usage: /cancel <id> [<id> ...] ya /cancel all\n"
+    "Example: /cancel 5 ya /cancel 3 5 9\n\n"
+    "💡 IDs dekhne ke liye /list bhejo."
+)
+
+async def _cancel_ids(chat_id: int, reminder_ids=None):
+    """
+    Ek DB transaction mein cancel (None = chat ke saare pending), phir
+    dispatcher heap se - har id O(1) dict lookup, scheduled jobs scan nahi.
+    """
+    cancelled = await cancel_reminders(chat_id, reminder_ids)
+    in_window = dispatcher.cancel_many(cancelled)
+    logger.info(
+        f"Chat {chat_id} cancelled {len(cancelled)} reminders (in window: {in_window})"
+    )
+    return cancelled
+
 async def cancel_reminder(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Reminder cancel karo by ID"""
+    """/cancel <id> [<id> ...] ya /cancel all"""
     chat_id = update.effective_chat.id
+    message = update.message
     
-    # Fix: Handle both message and callback_query
-    if update.message:
-        message = update.message
-    elif update.callback_query:
-        message = update.callback_query.message
-        await update.callback_query.answer()
-    else:
-        logger.error("No message or callback_query found in update")
-        return
-    
-    if not is_user_verified(chat_id):
+    if not await is_user_verified(chat_id):
         await message.reply_text(
             "❌ Pehle signup + OTP verify kar lo: /signup"
         )
         return
     
     if not context.args:
+        await message.reply_text(CANCEL_USAGE)
+        return
+    
+    if context.args[0].lower() == "all":
+        # Saare reminders - pehle confirm karwa lo
         await message.reply_text(
-            "❌ Reminder ID do.\n\n"
-            "Usage: /cancel <reminder_id>\n"
-            "Example: /cancel 5\n\n"
-            "💡 IDs dekhne ke liye /list bhejo."
+            "⚠️ Saare pending reminders cancel karne hain?",
+            reply_markup=InlineKeyboardMarkup([[
+                InlineKeyboardButton("✅ Haan, sab cancel", callback_data=f"{CANCEL_CALLBACK_PREFIX}all"),
+                InlineKeyboardButton("↩️ Rehne do", callback_data=f"{CANCEL_CALLBACK_PREFIX}keep"),
+            ]])
         )
         return
     
     try:
-        rid = int(context.args[0])
+        # "3 5 9" ya "3,5,9" dono chalein
+        rids = [int(part) for part in " ".join(context.args).replace(",", " ").split()]
     except ValueError:
         await message.reply_text(
             "❌ Reminder ID number hona chahiye.\n\n"
-            "Example: /cancel 5"
+            "Example: /cancel 5 ya /cancel 3 5 9"
         )
         return
     
-    # DB se job_name nikalo
-    row = get_reminder_by_id(rid, chat_id)
+    cancelled = await _cancel_ids(chat_id, rids)
+    done = set(cancelled)
+    missing = [rid for rid in dict.fromkeys(rids) if rid not in done]
     
-    if not row:
+    if not cancelled:
         await message.reply_text(
-            f"❌ ID {rid} ka koi reminder nahi mila.\n\n"
+            f"❌ ID {', '.join(map(str, missing))} ka koi pending reminder nahi mila.\n\n"
             f"💡 /list se check karo konse reminders pending hain."
         )
         return
     
-    job_name = row[0]
+    if len(cancelled) == 1:
+        msg = f"✅ Reminder {cancelled[0]} cancel kar diya gaya."
+    else:
+        msg = f"✅ {len(cancelled)} reminders cancel ho gaye: {', '.join(map(str, cancelled))}"
+    if missing:
+        msg += f"\n⚠️ Nahi mile: {', '.join(map(str, missing))}"
+    msg += "\n\n💡 Baaki reminders dekhne ke liye /list bhejo."
+    await message.reply_text(msg)
+
+async def cancel_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/list ke ❌ buttons aur /cancel all ka confirm"""
+    query = update.callback_query
+    chat_id = update.effective_chat.id
+    action = query.data[len(CANCEL_CALLBACK_PREFIX):]
     
-    # DB se delete
-    delete_reminder(rid, chat_id)
+    if not await is_user_verified(chat_id):
+        await query.answer("❌ Pehle signup + OTP verify kar lo: /signup", show_alert=True)
+        return
+    
+    if action == "keep":
+        await query.answer()
+        await query.edit_message_text("👍 Koi reminder cancel nahi hua.")
+        return
     
-    # JobQueue se job hatao
-    current_jobs = context.job_queue.get_jobs_by_name(job_name)
-    removed_count = 0
-    for job in current_jobs:
-        job.schedule_removal()
-        removed_count += 1
+    if action == "all":
+        cancelled = await _cancel_ids(chat_id)
+        await query.answer()
+        await query.edit_message_text(
+            f"✅ {len(cancelled)} reminders cancel ho gaye.\n\n"
+            f"💡 Naya reminder: /remind"
+        )
+        return
     
-    logger.info(f"Reminder {rid} cancelled by chat {chat_id} ({removed_count} job(s) removed)")
+    try:
+        rid, run_at, after_id = (int(part) for part in action.split(":"))
+    except ValueError:
+        logger.warning(f"Bad cancel callback data: {query.data}")
+        await query.answer()
+        return
     
-    await message.reply_text(
-        f"✅ Reminder {rid} cancel kar diya gaya.\n\n"
-        f"💡 Baaki reminders dekhne ke liye /list bhejo."
+    cancelled = await _cancel_ids(chat_id, [rid])
+    await query.answer(
+        f"✅ Reminder {rid} cancel ho gaya" if cancelled
+        else f"Reminder {rid} pehle hi fire/cancel ho chuka hai"
     )
-
+    # Wahi page refresh karo (cancelled row hat jaayegi)
+    await _edit_list_page(query, chat_id, "n", (run_at, after_id))
@@ -3,9 +3,11 @@ from telegram.ext import ContextTypes, ConversationHandler
 import logging
 
 from config import SIGNUP_STATES, OTP_EXPIRY_MINUTES
-from database import save_channel, delete_channel, get_channels_summary, get_db
+from async_db import (
+    save_channel, delete_channel, get_channels_summary, get_channel_status
+)
 from utils.otp import create_otp, verify_otp, clear_otp
-from utils.notifications import send_email_otp
+from utils.notifications import send_email_otp_async
 
 logger = logging.getLogger(__name__)
 
@@ -21,13 +23,7 @@ async def signup_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     clear_otp(chat_id)
     
     # Check existing channels
-    with get_db() as conn:
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT channel_type, is_verified FROM user_channels WHERE chat_id = ?",
-            (chat_id,)
-        )
-        existing = {row[0]: bool(row[1]) for row in cur.fetchall()}
+    existing = await get_channel_status(chat_id)
     
     if existing:
         msg = "📋 Tumhare current channels:\n\n"
@@ -72,10 +68,10 @@ async def choose_telegram(update: Update, context: ContextTypes.DEFAULT_TYPE):
         # Else continue normal flow for "Nahi"
     
     if "haa" in choice or "update" in choice:
-        save_channel(chat_id, "telegram", str(chat_id), True)
+        await save_channel(chat_id, "telegram", str(chat_id), True)
         await update.message.reply_text("✅ Telegram channel add ho gaya.")
     elif not context.user_data.get("updating"):
-        delete_channel(chat_id, "telegram")
+        await delete_channel(chat_id, "telegram")
         await update.message.reply_text("❌ Telegram skip kar diya.")
     
     keyboard = [["Haan", "Nahi"]]
@@ -99,7 +95,7 @@ async def choose_email_enable(update: Update, context: ContextTypes.DEFAULT_TYPE
         )
         return ASK_EMAIL
     else:
-        summary = get_channels_summary(chat_id)
+        summary = await get_channels_summary(chat_id)
         await update.message.reply_text(
             "✅ Signup complete ho gaya!\n\n"
             "📋 Tumhare selected channels:\n"
@@ -124,7 +120,7 @@ async def ask_email(update: Update, context: ContextTypes.DEFAULT_TYPE):
     otp = create_otp(chat_id, "email", email, OTP_EXPIRY_MINUTES)
     
     try:
-        send_email_otp(email, otp)
+        await send_email_otp_async(email, otp)
         await update.message.reply_text(
             f"✅ OTP tumhare email par bhej diya gaya hai.\n\n"
             f"⏰ OTP **{OTP_EXPIRY_MINUTES} minute** mein expire ho jayega.\n"
@@ -158,10 +154,10 @@ async def ask_otp(update: Update, context: ContextTypes.DEFAULT_TYPE):
     data = result["data"]
     value = data["value"]
     
-    save_channel(chat_id, "email", value, True)
+    await save_channel(chat_id, "email", value, True)
     clear_otp(chat_id)
     
-    summary = get_channels_summary(chat_id)
+    summary = await get_channels_summary(chat_id)
     await update.message.reply_text(
         "✅ Email verify ho gaya!\n\n"
         "🎉 Signup complete!\n\n"
@@ -1,7 +1,7 @@
 from telegram import Update
 from telegram.ext import ContextTypes
 import logging
-from database import is_user_verified, get_channels_summary
+from async_db import is_user_verified, get_channels_summary
 
 logger = logging.getLogger(__name__)
 
@@ -9,8 +9,8 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat_id = update.effective_chat.id
     logger.info(f"Start command from chat {chat_id}")
     
-    if is_user_verified(chat_id):
-        summary = get_channels_summary(chat_id)
+    if await is_user_verified(chat_id):
+        summary = await get_channels_summary(chat_id)
         await update.message.reply_text(
             "Hello! 👋\n\n"
             "Tum already signup + verified ho.\n\n"
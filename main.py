@@ -1,32 +1,53 @@
+import time
+
+# Cold-start report ke liye: imports se pehle ka timestamp
+_BOOT_STARTED = time.perf_counter()
+
+import asyncio
 import logging
-from datetime import datetime
 
 from telegram import BotCommand
 from telegram.ext import (
     Application,
+    CallbackQueryHandler,
     CommandHandler,
+    ContextTypes,
     ConversationHandler,
     MessageHandler,
     filters,
 )
 
-from config import BOT_TOKEN, DB_PATH, SIGNUP_STATES, REMIND_STATES
-from database import set_db_path, init_db, get_pending_reminders
+from config import (
+    BOT_TOKEN, DB_PATH, SIGNUP_STATES, REMIND_STATES, OUTBOX_POLL_SECONDS,
+    COMPACT_INTERVAL_SECONDS,
+)
+from database import set_db_path, init_db, close_db, get_parse_rule_stats
+import async_db
 from utils.logger import setup_logging
+from utils.dispatcher import dispatcher
+from utils.notifications import smtp_pool
 
 from handlers.start import start
 from handlers.signup import (
     signup_start, choose_telegram, choose_email_enable,
     ask_email, ask_otp, signup_cancel
 )
+from handlers.bulk import import_command, import_document, export_reminders
 from handlers.reminders import (
     test_remind, remind_natural, remind_start, remind_ask_date, remind_ask_time,
-    remind_confirm, remind_save, remind_cancel, list_reminders,
-    cancel_reminder, send_reminder_job
+    remind_confirm, remind_save, remind_cancel, list_reminders, list_page_callback,
+    cancel_reminder, cancel_callback, send_reminder_job, drain_outbox_job, compact_reminders_job
 )
+from utils.nlp_parser import warm_up
+from utils.parse_service import parse_service
+
+_IMPORT_SECONDS = time.perf_counter() - _BOOT_STARTED
 
 logger = logging.getLogger(__name__)
 
+# Boot ke har step ka time (seconds) - post_init mein report hota hai
+startup_timings = {"imports": _IMPORT_SECONDS}
+
 async def set_bot_commands(application: Application):
     """Bot commands menu automatically set karo"""
     commands = [
@@ -35,7 +56,9 @@ async def set_bot_commands(application: Application):
         BotCommand("remind", "🤖 AI reminder (10 min baad, kal 5pm)"),
         BotCommand("remindstep", "Step-by-step reminder setup"),
         BotCommand("list", "Pending reminders dekho"),
-        BotCommand("cancel", "Reminder cancel karo (ID se)"),
+        BotCommand("cancel", "Reminders cancel karo (IDs ya all)"),
+        BotCommand("import", "JSONL/CSV file se reminders import karo"),
+        BotCommand("export", "Pending reminders file mein download karo"),
     ]
     
     await application.bot.set_my_commands(commands)
@@ -45,59 +68,86 @@ async def post_init(application: Application):
     """Bot start hone ke baad run hoga"""
     await set_bot_commands(application)
     logger.info("Post-initialization complete")
+    
+    startup_timings["total"] = time.perf_counter() - _BOOT_STARTED
+    logger.info(
+        "⏱️ Startup report: "
+        + " | ".join(f"{step} {seconds * 1000:.1f} ms" for step, seconds in startup_timings.items())
+    )
+
+async def prewarm_parsers(context: ContextTypes.DEFAULT_TYPE):
+    """Polling start hone ke baad dateparser / Gemini SDK background thread mein load karo"""
+    timings = await asyncio.to_thread(warm_up)
+    if parse_service.enabled:
+        timings["parse_workers"] = await parse_service.start()
+    logger.info(
+        "🔥 Parsers pre-warmed: "
+        + " | ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in timings.items())
+    )
+
+async def post_shutdown(application: Application):
+    """Bot band hote waqt DB aur SMTP connections close karo"""
+    await async_db.shutdown()
+    close_db()
+    smtp_pool.close()
+    parse_service.shutdown()
+    logger.info("Database connections closed")
 
 def restore_pending_reminders(application: Application):
-    """Bot restart ke baad pending reminders ko JobQueue mein wapas load karo"""
+    """Bot restart ke baad dispatcher ki pehli window DB se load karo"""
     logger.info("Restoring pending reminders from database...")
-    
-    rows = get_pending_reminders()
-    now = datetime.now()
-    restored = 0
-    skipped = 0
-    
-    for rid, chat_id, text, run_at_str, job_name in rows:
-        try:
-            run_at = datetime.fromisoformat(run_at_str)
-            
-            if run_at <= now:
-                logger.warning(f"Reminder {rid} time already passed, skipping")
-                skipped += 1
-                continue
-            
-            delay_seconds = (run_at - now).total_seconds()
-            
-            application.job_queue.run_once(
-                send_reminder_job,
-                when=delay_seconds,
-                chat_id=chat_id,
-                data={"text": text, "db_id": rid},
-                name=job_name,
-            )
-            
-            restored += 1
-            logger.info(f"Restored reminder {rid} for chat {chat_id}")
-            
-        except Exception as e:
-            logger.error(f"Failed to restore reminder {rid}: {e}")
-    
-    logger.info(f"✅ Restore complete: {restored} restored, {skipped} skipped")
+    stats = dispatcher.start(application.job_queue, send_reminder_job)
+    startup_timings["restore"] = stats["seconds"]
+    logger.info(
+        f"✅ Restore complete in {stats['seconds'] * 1000:.1f} ms: "
+        f"{stats['window']} in current window, "
+        f"{stats['missed']} missed queued for catch-up"
+    )
 
 def main():
     setup_logging()
     logger.info("🚀 Starting AI-Powered Reminder Bot...")
     
+    db_started = time.perf_counter()
     set_db_path(DB_PATH)
     init_db()
+    startup_timings["db_init"] = time.perf_counter() - db_started
+    
+    cache_stats = get_parse_rule_stats()
+    logger.info(
+        f"💾 Semantic parse cache: {cache_stats['entries']} rules, "
+        f"{cache_stats['gemini_calls_avoided']} Gemini calls avoided so far"
+    )
     
     application = (
         Application.builder()
         .token(BOT_TOKEN)
         .post_init(post_init)
+        .post_shutdown(post_shutdown)
         .build()
     )
     
     restore_pending_reminders(application)
     
+    # Failed deliveries ke retries aur crash ke baad bache outbox rows
+    application.job_queue.run_repeating(
+        drain_outbox_job,
+        interval=OUTBOX_POLL_SECONDS,
+        first=OUTBOX_POLL_SECONDS,
+        name="outbox_drain",
+    )
+    
+    # Sent/cancelled/failed reminders hot table se history mein
+    application.job_queue.run_repeating(
+        compact_reminders_job,
+        interval=COMPACT_INTERVAL_SECONDS,
+        first=COMPACT_INTERVAL_SECONDS,
+        name="reminder_compactor",
+    )
+    
+    # Heavy parsers lazily load hote hain; pehle /remind se pehle hi garam kar do
+    application.job_queue.run_once(prewarm_parsers, when=1, name="prewarm_parsers")
+    
     # SIGNUP conversation - Email only
     signup_conv = ConversationHandler(
         entry_points=[CommandHandler("signup", signup_start)],
@@ -148,7 +198,14 @@ def main():
     
     application.add_handler(CommandHandler("testremind", test_remind))
     application.add_handler(CommandHandler("list", list_reminders))
+    application.add_handler(CallbackQueryHandler(list_page_callback, pattern=r"^list:"))
     application.add_handler(CommandHandler("cancel", cancel_reminder))
+    application.add_handler(CallbackQueryHandler(cancel_callback, pattern=r"^cancel:"))
+    application.add_handler(CommandHandler("import", import_command))
+    application.add_handler(MessageHandler(
+        filters.Document.ALL & filters.CaptionRegex(r"^/import"), import_document
+    ))
+    application.add_handler(CommandHandler("export", export_reminders))
     
     logger.info("✅ Bot is running... Press Ctrl+C to stop.")
     print("\n" + "="*60)
@@ -168,6 +225,8 @@ def main():
     print("  /testremind - Test 20-second reminder")
     print("  /list       - View pending reminders")
     print("  /cancel     - Cancel a reminder")
+    print("  /import     - Bulk import (JSONL/CSV file)")
+    print("  /export     - Download pending reminders")
     print("="*60)
     print("🔥 Example AI commands:")
     print("  /remind 10 min baad meeting")
@@ -0,0 +1,118 @@
+"""
+utils.parse_cache regression tests - coincidental number matches se galat
+rules seekhe ja rahe the (0 / 12 baje, "in N weeks" ka anchored rule).
+
+Run: python -m pytest -q tests
+"""
+from datetime import datetime, timedelta
+
+from utils.parse_cache import ParseCache, apply_rule, build_template
+
+TIME_WORDS = frozenset({'kal', 'shaam', 'tomorrow', 'in', 'weeks', 'baad', 'at', 'min'})
+NOW = datetime(2026, 10, 16, 14, 7, 0)
+
+def make_cache():
+    return ParseCache(str.lower, TIME_WORDS, max_entries=100, ttl_seconds=3600)
+
+def parsed(target: datetime, text: str) -> dict:
+    return {
+        "success": True,
+        "datetime": target,
+        "reminder_text": text,
+        "parsed_as": f"📅 dateparser: {target}",
+    }
+
+def tomorrow_at(hour: int, minute: int = 0) -> datetime:
+    return (NOW + timedelta(days=1)).replace(hour=hour, minute=minute)
+
+def test_zero_hour_is_not_learned_as_minute_slot():
+    cache = make_cache()
+    # "0 baje" -> 12:00 (dateparser jaisa koi bhi odd result)
+    assert cache.store("kal shaam 0 baje gym", NOW, parsed(tomorrow_at(12), "gym")) is None
+    assert cache.lookup("kal shaam 9 baje gym", NOW) is None
+
+def test_zero_pm_is_not_learned():
+    cache = make_cache()
+    assert cache.store("tomorrow 0pm standup", NOW, parsed(tomorrow_at(12), "standup")) is None
+    assert cache.lookup("tomorrow 6pm standup", NOW) is None
+
+def test_twelve_is_not_learned():
+    cache = make_cache()
+    assert cache.store("kal 12 baje lunch", NOW, parsed(tomorrow_at(12), "lunch")) is None
+
+def test_minute_slot_needs_clock_token():
+    cache = make_cache()
+    # 7 == NOW.minute bhi hai aur 7 baje bhi - bina "#:#" ke minute slot nahi banta
+    rule = cache.store("kal 7 baje gym", NOW, parsed(tomorrow_at(7), "gym"))
+    assert rule is not None and rule["minute_slot"] is None
+    hit = cache.lookup("kal 9 baje gym", NOW)
+    assert hit["datetime"] == tomorrow_at(9)
+
+def test_clock_token_learns_hour_and_minute():
+    cache = make_cache()
+    assert cache.store("kal 9:45pm gym", NOW, parsed(tomorrow_at(21, 45), "gym")) is not None
+    hit = cache.lookup("kal 8:15pm gym", NOW)
+    assert hit["datetime"] == tomorrow_at(20, 15)
+
+def test_relative_phrase_never_gets_anchored_rule():
+    cache = make_cache()
+    # Parser ne "in 2 weeks" ko current hour (14) pe rakha: 2 == kuch nahi, par
+    # anchored fallback 'days=14, hour=14' seekh leta tha
+    target = (NOW + timedelta(days=14)).replace(minute=2)
+    assert cache.store("in 2 weeks review", NOW, parsed(target, "review")) is None
+
+def test_relative_offset_still_cached():
+    cache = make_cache()
+    target = NOW + timedelta(weeks=2)
+    rule = cache.store("in 2 weeks review", NOW, parsed(target, "review"))
+    assert rule["kind"] == 'offset'
+    assert cache.lookup("in 3 weeks review", NOW)["datetime"] == NOW + timedelta(weeks=3)
+
+def test_persisted_bad_rule_is_ignored():
+    # Fix se pehle seekha hua rule (persistent cache mein pada ho sakta hai)
+    template = build_template("kal shaam 9 baje gym", str.lower, TIME_WORDS)
+    bad_rule = {
+        "text": "original", "source": "📅 dateparser", "kind": "anchored", "days": 1,
+        "hour_slot": None, "hour": 12, "minute_slot": 0, "minute": 0,
+    }
+    assert apply_rule(bad_rule, template, NOW) is None
+
+def test_cache_hit_text_matches_uncached_parse_for_mixed_case():
+    cache = make_cache()
+    # Lowercase input ne template sikhaya: original == processed
+    regex_result = {
+        "success": True,
+        "datetime": NOW + timedelta(minutes=10),
+        "reminder_text": "meeting attend",
+        "parsed_as": "⚡ Regex: 10 minutes baad",
+    }
+    assert cache.store("10 min baad meeting attend", NOW, regex_result) is not None
+    # Regex mixed-case input ka processed (lowercase) text lautata hai - cache bhi wahi de
+    hit = cache.lookup("10 min baad Meeting Attend", NOW)
+    assert hit["reminder_text"] == "meeting attend"
+
+def test_gemini_taught_template_keeps_original_case():
+    cache = make_cache()
+    gemini_result = {
+        "success": True,
+        "datetime": NOW + timedelta(minutes=10),
+        "reminder_text": "meeting attend",
+        "parsed_as": "🤖 Gemini AI",
+    }
+    assert cache.store("10 min baad meeting attend", NOW, gemini_result) is not None
+    hit = cache.lookup("10 min baad Meeting Attend", NOW)
+    assert hit["reminder_text"] == "Meeting Attend"
+
+def test_gemini_minute_resolution_offset_is_learned():
+    cache = make_cache()
+    now = NOW.replace(second=42)
+    # Gemini ne "10 min baad" ko minute tak round karke diya (14:17, 14:17:42 nahi)
+    gemini_result = {
+        "success": True,
+        "datetime": (now + timedelta(minutes=10)).replace(second=0),
+        "reminder_text": "chai",
+        "parsed_as": "🤖 Gemini AI",
+    }
+    rule = cache.store("10 min baad chai", now, gemini_result)
+    assert rule["kind"] == 'offset' and rule["unit"] == 60
+    assert cache.lookup("25 min baad chai", now)["datetime"] == now + timedelta(minutes=25)
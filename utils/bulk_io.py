@@ -0,0 +1,136 @@
+"""
+Reminders ka bulk import / export (JSONL ya CSV), streaming.
+
+Import: lines ek-ek karke parse hote hain aur IMPORT_CHUNK_SIZE ke chunks
+mein DB tak jaate hain - poori file kabhi list mein nahi banti.
+Export: DB se keyset pages (run_at, id) mein padhta hai aur seedha file mein
+likhta hai - poori history memory mein load nahi hoti.
+
+Record format (dono formats mein same fields):
+    {"text": "gym jana", "run_at": "2026-10-20 17:00", "chat_id": 123}
+run_at local time "YYYY-MM-DD HH:MM[:SS]" ya epoch seconds. chat_id sirf
+admin CLI import mein chahiye; Telegram /import apne chat pe hi likhta hai.
+Telegram /import mein run_at khaali ho to text NL parser se jaata hai
+({"text": "kal 5 baje gym"}) - admin CLI mein run_at zaroori hai.
+"""
+import csv
+import json
+import logging
+from datetime import datetime
+
+from config import IMPORT_MAX_AHEAD_DAYS
+from database import from_epoch, to_epoch
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("jsonl", "csv")
+EXPORT_FIELDS = ("id", "chat_id", "text", "run_at")
+
+def detect_format(filename: str) -> str:
+    """File extension se format; .csv nahi hai to JSONL"""
+    return "csv" if filename.lower().endswith(".csv") else "jsonl"
+
+def _parse_run_at(value) -> int:
+    if isinstance(value, (int, float)) or str(value).strip().isdigit():
+        try:
+            run_at = int(value)
+            from_epoch(run_at)
+        except (OverflowError, OSError, ValueError):
+            raise ValueError(f"run_at range ke bahar hai: {value!r}")
+        return run_at
+    value = str(value).strip()
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M"):
+        try:
+            return to_epoch(datetime.strptime(value, fmt))
+        except ValueError:
+            continue
+    raise ValueError(f"run_at samajh nahi aaya: {value!r}")
+
+def _iter_raw(lines, fmt: str, errors: list):
+    """(line_no, dict) - text lines ke iterable se, streaming"""
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        try:
+            for record in reader:
+                yield reader.line_num, record
+        except csv.Error as e:
+            errors.append((reader.line_num, str(e)))
+        return
+    
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            errors.append((line_no, f"JSON galat hai: {e}"))
+            continue
+        if not isinstance(record, dict):
+            errors.append((line_no, "JSON object chahiye"))
+            continue
+        yield line_no, record
+
+def iter_import_records(lines, fmt: str, now: int, chat_id: int = None, errors: list = None,
+                        text_only: bool = False):
+    """
+    Valid (chat_id, text, run_at) tuples yield karo. Galat / past rows
+    skip hote hain aur (line_no, reason) errors list mein jaate hain.
+    chat_id diya ho to har row usi chat ki (file ka chat_id ignore).
+    text_only=True pe bina run_at wali rows (chat_id, text, None) aati hain -
+    caller text NL parser se parse karta hai.
+    """
+    errors = errors if errors is not None else []
+    max_run_at = now + IMPORT_MAX_AHEAD_DAYS * 86400
+    for line_no, record in _iter_raw(lines, fmt, errors):
+        try:
+            text = (record.get("text") or "").strip()
+            if not text:
+                raise ValueError("text khaali hai")
+            target_chat = chat_id if chat_id is not None else int(record["chat_id"])
+            raw_run_at = record.get("run_at")
+            if raw_run_at in (None, ""):
+                if not text_only:
+                    raise ValueError("run_at khaali hai")
+                yield target_chat, text, None
+                continue
+            run_at = _parse_run_at(raw_run_at)
+            if run_at <= now:
+                raise ValueError("run_at past mein hai")
+            if run_at > max_run_at:
+                raise ValueError(f"run_at {IMPORT_MAX_AHEAD_DAYS // 365} saal se zyada aage hai")
+        except (KeyError, TypeError, ValueError) as e:
+            errors.append((line_no, str(e)))
+            continue
+        yield target_chat, text, run_at
+
+def iter_chunks(records, size: int):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class ExportWriter:
+    """Export rows (id, chat_id, text, run_at epoch) ko text stream mein likho"""
+    def __init__(self, out, fmt: str):
+        self.out = out
+        self.fmt = fmt
+        self.count = 0
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.writer(out)
+            self._csv.writerow(EXPORT_FIELDS)
+    
+    def write_rows(self, rows):
+        for rid, chat_id, text, run_at in rows:
+            run_at_str = from_epoch(run_at).strftime("%Y-%m-%d %H:%M:%S")
+            if self._csv is not None:
+                self._csv.writerow((rid, chat_id, text, run_at_str))
+            else:
+                self.out.write(json.dumps({
+                    "id": rid, "chat_id": chat_id, "text": text, "run_at": run_at_str,
+                }, ensure_ascii=False) + "\n")
+            self.count += 1
@@ -0,0 +1,204 @@
+"""
+Windowed reminder dispatcher.
+
+Har reminder ke liye JobQueue job banane ki jagah, sirf agle
+DISPATCH_WINDOW_MINUTES ke due reminders ek in-memory heap mein rakhte hain.
+Ek repeating tick due reminders fire karta hai aur window aage badhne pe
+DB se indexed range query (run_at) se heap refill karta hai. Memory window
+size pe bounded rehti hai, total backlog pe nahi.
+
+Startup pe jo reminders bot offline hone ki wajah se miss ho gaye, woh
+catch-up job se chhote batches mein (rate-limited) deliver hote hain, taaki
+boot slow na ho aur koi reminder lose na ho.
+"""
+import heapq
+import logging
+import time
+
+import database
+from async_db import run_db
+from config import (
+    DISPATCH_WINDOW_MINUTES, DISPATCH_TICK_SECONDS, RESTORE_CHUNK_SIZE,
+    CATCHUP_BATCH_SIZE, CATCHUP_INTERVAL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Heap entry: [run_at, reminder_id, chat_id, text, active]
+_RUN_AT, _RID, _CHAT_ID, _TEXT, _ACTIVE = range(5)
+
+class ReminderDispatcher:
+    def __init__(self, window_seconds: int, tick_seconds: float):
+        self.window_seconds = window_seconds
+        self.tick_seconds = tick_seconds
+        # Invariant: run_at <= horizon wale saare pending reminders heap mein hain
+        self.horizon = 0
+        self._heap = []
+        self._entries = {}
+        self._job_queue = None
+        self._callback = None
+        # DB loads chalte waqt hue cancels yaad rakho, taaki load ka result
+        # unhe wapas heap mein na daal de
+        self._loads_in_flight = 0
+        self._cancelled_during_load = set()
+        # Catch-up: run_at <= catchup_until wale missed reminders, keyset cursor se
+        self.catchup_until = 0
+        self._catchup_key = (-1, 0)
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def start(self, job_queue, callback) -> dict:
+        """
+        Pehli window DB se stream karke load karo, tick job schedule karo,
+        aur missed reminders ke liye catch-up shuru karo. Stats return karta hai.
+        """
+        started = time.perf_counter()
+        self._job_queue = job_queue
+        self._callback = callback
+        
+        now = int(time.time())
+        self.horizon = now + self.window_seconds
+        for rows in database.iter_reminders_between(now, self.horizon, RESTORE_CHUNK_SIZE):
+            for rid, chat_id, text, run_at in rows:
+                entry = [run_at, rid, chat_id, text, True]
+                self._entries[rid] = entry
+                self._heap.append(entry)
+        # Bulk schedule: ek hi heapify, har row pe heappush nahi
+        heapq.heapify(self._heap)
+        
+        job_queue.run_repeating(
+            self._tick,
+            interval=self.tick_seconds,
+            first=self.tick_seconds,
+            name="reminder_dispatcher",
+        )
+        
+        self.catchup_until = now
+        missed = database.count_reminders_until(now)
+        if missed:
+            job_queue.run_repeating(
+                self._catchup_tick,
+                interval=CATCHUP_INTERVAL_SECONDS,
+                first=self.tick_seconds,
+                name="reminder_catchup",
+            )
+        
+        return {
+            "window": len(self),
+            "missed": missed,
+            "seconds": time.perf_counter() - started,
+        }
+    
+    def add(self, rid: int, chat_id: int, text: str, run_at: int):
+        """Naya saved reminder - window ke andar ho to heap mein daalo, warna DB refill layega"""
+        if run_at <= self.horizon and rid not in self._entries:
+            entry = [run_at, rid, chat_id, text, True]
+            self._entries[rid] = entry
+            heapq.heappush(self._heap, entry)
+    
+    def add_many(self, rows):
+        """Batch of (rid, chat_id, text, run_at) - ek pass, window ke bahar wale skip"""
+        self._push_rows(row for row in rows if row[3] <= self.horizon)
+    
+    def cancel(self, rid: int) -> bool:
+        """Reminder heap se hatao (lazy delete), O(1)"""
+        if self._loads_in_flight:
+            self._cancelled_during_load.add(rid)
+        entry = self._entries.pop(rid, None)
+        if entry is None:
+            return False
+        entry[_ACTIVE] = False
+        return True
+    
+    def cancel_many(self, rids) -> int:
+        """Bulk cancel - har id O(1). Return: kitne heap mein the"""
+        return sum(1 for rid in rids if self.cancel(rid))
+    
+    def _push_rows(self, rows):
+        for rid, chat_id, text, run_at in rows:
+            if rid in self._entries or rid in self._cancelled_during_load:
+                continue
+            entry = [run_at, rid, chat_id, text, True]
+            self._entries[rid] = entry
+            heapq.heappush(self._heap, entry)
+    
+    def _fire_due(self, now: float) -> int:
+        fired = 0
+        while self._heap and self._heap[0][_RUN_AT] <= now:
+            entry = heapq.heappop(self._heap)
+            if not entry[_ACTIVE]:
+                continue
+            del self._entries[entry[_RID]]
+            self._job_queue.run_once(
+                self._callback,
+                when=0,
+                chat_id=entry[_CHAT_ID],
+                data={
+                    "text": entry[_TEXT],
+                    "db_id": entry[_RID],
+                    "late": entry[_RUN_AT] <= self.catchup_until,
+                },
+                name=f"reminder_{entry[_RID]}",
+            )
+            fired += 1
+        return fired
+    
+    async def _load(self, func, *args):
+        """DB thread pe range query chalao aur result heap mein daalo"""
+        self._loads_in_flight += 1
+        try:
+            rows = await run_db(func, *args)
+            self._push_rows(rows)
+            return rows
+        finally:
+            self._loads_in_flight -= 1
+            if not self._loads_in_flight:
+                self._cancelled_during_load.clear()
+    
+    async def _refill(self, now: float):
+        old_horizon = self.horizon
+        new_horizon = int(now) + self.window_seconds
+        
+        # Horizon query se pehle badhao: beech mein save hua reminder ya to
+        # add() se aayega ya is query se (duplicate _entries se skip hota hai)
+        self.horizon = new_horizon
+        try:
+            rows = await self._load(database.get_reminders_between, old_horizon, new_horizon)
+        except Exception:
+            # Agle tick pe wahi range dobara try hogi
+            self.horizon = old_horizon
+            raise
+        
+        if rows:
+            logger.info(f"Dispatcher refilled {len(rows)} reminder(s) up to {new_horizon}")
+    
+    async def _tick(self, context):
+        now = time.time()
+        self._fire_due(now)
+        
+        # Aadhi window khatam hone pe agla hissa load karo
+        if self.horizon - now < self.window_seconds / 2:
+            await self._refill(now)
+            self._fire_due(time.time())
+
+    async def _catchup_tick(self, context):
+        """Missed reminders ka agla batch DB se lao aur turant fire karo"""
+        run_at, rid = self._catchup_key
+        rows = await self._load(
+            database.get_reminders_page, run_at, rid, self.catchup_until, CATCHUP_BATCH_SIZE
+        )
+        if not rows:
+            context.job.schedule_removal()
+            logger.info("✅ Catch-up complete: saare missed reminders queue ho gaye")
+            return
+        
+        last_rid, _, _, last_run_at = rows[-1]
+        self._catchup_key = (last_run_at, last_rid)
+        self._fire_due(time.time())
+        logger.info(f"Catch-up: {len(rows)} missed reminder(s) queued for delivery")
+
+dispatcher = ReminderDispatcher(
+    window_seconds=DISPATCH_WINDOW_MINUTES * 60,
+    tick_seconds=DISPATCH_TICK_SECONDS,
+)
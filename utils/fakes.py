@@ -0,0 +1,297 @@
+"""
+Local stand-ins for external services (benchmarks aur offline testing ke liye).
+
+SMTPSink: in-process SMTP server (aiosmtpd jaisa, sirf stdlib). Har message
+memory mein count/store karta hai. connect_delay se real server ka TLS
+handshake + login cost simulate hota hai.
+
+FakeGeminiModel: google.generativeai GenerativeModel jaisa interface
+(generate_content / generate_content_async), network ke bina. Single aur
+batch dono prompts samajhta hai, latency aur token count simulate karta hai,
+aur RecordingGeminiModel ke record kiye answers replay karta hai.
+"""
+import re
+import json
+import random
+import asyncio
+import socketserver
+import threading
+import time
+import logging
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+    
+    def handle(self):
+        sink = self.server.sink
+        with sink._lock:
+            sink.connections += 1
+        if sink.connect_delay:
+            time.sleep(sink.connect_delay)
+        self._reply("220 sink ESMTP ready")
+        
+        mail_from, rcpt_to = None, []
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode(errors="replace").rstrip("\r\n")
+            verb = line.split(" ", 1)[0].upper()
+            
+            if verb in ("EHLO", "HELO"):
+                self.wfile.write(b"250-sink\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n")
+            elif verb == "AUTH":
+                self._reply("235 2.7.0 Authentication successful")
+            elif verb == "MAIL":
+                mail_from, rcpt_to = line[10:].strip(), []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                rcpt_to.append(line[8:].strip())
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                body = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line in (b".\r\n", b".\n"):
+                        break
+                    body.append(data_line)
+                sink.record(mail_from, rcpt_to, b"".join(body))
+                self._reply("250 OK queued")
+            elif verb == "RSET":
+                mail_from, rcpt_to = None, []
+                self._reply("250 OK")
+            elif verb == "NOOP":
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+class _ThreadedServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class SMTPSink:
+    """Plain (non-TLS) SMTP sink: SMTP_USE_SSL=0 ke saath use karo"""
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 connect_delay: float = 0.0, keep_messages: bool = False):
+        self.connect_delay = connect_delay
+        self.keep_messages = keep_messages
+        self.messages = []
+        self.count = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = _ThreadedServer((host, port), _SMTPHandler)
+        self._server.sink = self
+        self._thread = None
+    
+    @property
+    def address(self):
+        return self._server.server_address
+    
+    def record(self, mail_from, rcpt_to, body: bytes):
+        with self._lock:
+            self.count += 1
+            if self.keep_messages:
+                self.messages.append((mail_from, rcpt_to, body))
+    
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="smtp-sink", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"SMTP sink listening on {self.address[0]}:{self.address[1]}")
+        return self
+    
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+# ========== GEMINI ==========
+
+_SINGLE_INPUT_RE = re.compile(r'Now parse: "(.*)"\s*$', re.S)
+_BATCH_INPUT_RE = re.compile(r'Inputs \(JSON array\):\s*(\[.*\])\s*$', re.S)
+
+def prompt_inputs(prompt: str):
+    """Prompt mein bheje gaye user texts (single ya batch), ya []"""
+    batch = _BATCH_INPUT_RE.search(prompt)
+    if batch:
+        return json.loads(batch.group(1))
+    single = _SINGLE_INPUT_RE.search(prompt)
+    return [single.group(1)] if single else []
+
+def load_recordings(path) -> dict:
+    """
+    Recordings JSONL: {"text", "offset_seconds", "reminder_text"} per line.
+    offset_seconds record ke waqt "now" se answer tak ka gap hai - replay pe
+    current time pe anchor hota hai. File na ho to khaali dict.
+    """
+    recordings = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    recordings[entry["text"]] = entry
+    except FileNotFoundError:
+        logger.warning(f"Gemini recordings not found: {path}")
+    return recordings
+
+def _token_count(text: str) -> int:
+    """Rough Gemini tokenizer estimate (~4 chars per token)"""
+    return max(1, len(text) // 4)
+
+class _UsageMetadata:
+    __slots__ = ("prompt_token_count", "candidates_token_count")
+    
+    def __init__(self, prompt_tokens: int, output_tokens: int):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = output_tokens
+
+class FakeGeminiResponse:
+    __slots__ = ("text", "usage_metadata")
+    
+    def __init__(self, text: str, prompt: str):
+        self.text = text
+        self.usage_metadata = _UsageMetadata(_token_count(prompt), _token_count(text))
+
+class FakeGeminiModel:
+    """
+    Recorded text ka answer replay hota hai; baaki har input ka answer: ek
+    ghante baad, poora text hi reminder_text.
+    latency = base_latency + per_token_latency * output tokens (Gemini output
+    tokens sequentially generate karta hai). failure_rate fraction calls
+    exception raise karti hain.
+    """
+    def __init__(self, base_latency: float = 0.3, per_token_latency: float = 0.002,
+                 failure_rate: float = 0.0, seed: int = None, recordings: dict = None):
+        self.recordings = recordings or {}
+        self.replayed = 0
+        self.base_latency = base_latency
+        self.per_token_latency = per_token_latency
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+    
+    def answer(self, text: str, now: datetime) -> dict:
+        recorded = self.recordings.get(text)
+        if recorded is not None:
+            self.replayed += 1
+            offset = recorded["offset_seconds"]
+            return {
+                "datetime": None if offset is None else
+                    (now + timedelta(seconds=offset)).strftime("%Y-%m-%d %H:%M"),
+                "reminder_text": recorded["reminder_text"],
+            }
+        return {
+            "datetime": (now + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M"),
+            "reminder_text": text,
+        }
+    
+    def _respond(self, prompt: str):
+        """(response, latency) - ya exception agar failure roll hua"""
+        now = datetime.now()
+        if _BATCH_INPUT_RE.search(prompt):
+            answer = [self.answer(text, now) for text in prompt_inputs(prompt)]
+        else:
+            texts = prompt_inputs(prompt)
+            answer = self.answer(texts[0], now) if texts else {
+                "datetime": None, "reminder_text": None,
+            }
+        response = FakeGeminiResponse(json.dumps(answer, ensure_ascii=False), prompt)
+        
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += response.usage_metadata.prompt_token_count
+            self.output_tokens += response.usage_metadata.candidates_token_count
+            failed = self._random.random() < self.failure_rate
+            if failed:
+                self.failures += 1
+        if failed:
+            raise RuntimeError("fake Gemini: 503 Service Unavailable")
+        latency = self.base_latency + self.per_token_latency * response.usage_metadata.candidates_token_count
+        return response, latency
+    
+    def generate_content(self, prompt: str):
+        response, latency = self._respond(prompt)
+        time.sleep(latency)
+        return response
+    
+    async def generate_content_async(self, prompt: str):
+        response, latency = self._respond(prompt)
+        await asyncio.sleep(latency)
+        return response
+    
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "replayed": self.replayed,
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+        }
+
+class RecordingGeminiModel:
+    """
+    Real model ke aage wrapper: har successful answer recordings JSONL mein
+    append karta hai, taaki baad mein FakeGeminiModel use replay kar sake.
+    """
+    def __init__(self, model, path):
+        self.model = model
+        self.path = path
+        self._lock = threading.Lock()
+    
+    def _record(self, prompt: str, response, now: datetime = None):
+        now = now or datetime.now()
+        texts = prompt_inputs(prompt)
+        try:
+            answer = json.loads(response.text.replace('```json', '').replace('```', '').strip())
+        except ValueError:
+            return
+        answers = answer if isinstance(answer, list) else [answer]
+        if len(answers) != len(texts):
+            return
+        
+        lines = []
+        for text, item in zip(texts, answers):
+            if not isinstance(item, dict):
+                continue
+            offset = None
+            if item.get("datetime"):
+                try:
+                    target = datetime.strptime(item["datetime"], "%Y-%m-%d %H:%M")
+                except ValueError:
+                    continue
+                offset = int((target - now.replace(second=0, microsecond=0)).total_seconds())
+            lines.append(json.dumps({
+                "text": text,
+                "offset_seconds": offset,
+                "reminder_text": item.get("reminder_text"),
+            }, ensure_ascii=False))
+        
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(line + "\n" for line in lines)
+    
+    def generate_content(self, prompt: str):
+        response = self.model.generate_content(prompt)
+        self._record(prompt, response)
+        return response
+    
+    async def generate_content_async(self, prompt: str):
+        if hasattr(self.model, "generate_content_async"):
+            response = await self.model.generate_content_async(prompt)
+        else:
+            response = await asyncio.to_thread(self.model.generate_content, prompt)
+        # File append event loop pe nahi; offsets answer aane ke time se
+        await asyncio.to_thread(self._record, prompt, response, datetime.now())
+        return response
@@ -1,16 +1,32 @@
 import os
 import json
+import time
+import asyncio
 import logging
 from datetime import datetime, timedelta
-import google.generativeai as genai
 
-from config import GEMINI_API_KEY
+from config import (
+    GEMINI_API_KEY, GEMINI_TIMEOUT_SECONDS, GEMINI_MAX_CONCURRENCY,
+    GEMINI_BREAKER_FAILURES, GEMINI_BREAKER_COOLDOWN_SECONDS,
+    GEMINI_BATCH_WINDOW_MS, GEMINI_BATCH_MAX_SIZE, GEMINI_BACKEND, GEMINI_RECORD,
+    GEMINI_RECORDINGS_PATH, GEMINI_FAKE_LATENCY_SECONDS, GEMINI_FAKE_FAILURE_RATE,
+)
 
 logger = logging.getLogger(__name__)
 
 # Initialize Gemini
-if GEMINI_API_KEY:
+if GEMINI_BACKEND == "fake":
+    from utils.fakes import FakeGeminiModel, load_recordings
+    model = FakeGeminiModel(
+        GEMINI_FAKE_LATENCY_SECONDS,
+        failure_rate=GEMINI_FAKE_FAILURE_RATE,
+        recordings=load_recordings(GEMINI_RECORDINGS_PATH),
+    )
+    logger.info(f"🧪 Fake Gemini backend ({len(model.recordings)} recorded answers)")
+elif GEMINI_API_KEY:
     try:
+        # SDK sirf real backend ke liye (import bhaari hai)
+        import google.generativeai as genai
         genai.configure(api_key=GEMINI_API_KEY)
         model = genai.GenerativeModel('gemini-2.5-flash-lite')
         logger.info("✅ Gemini AI initialized successfully")
@@ -21,29 +37,18 @@ else:
     model = None
     logger.warning("⚠️ Gemini API key not found, AI parsing disabled")
 
-def parse_with_gemini(text: str) -> dict:
-    """
-    Advanced AI parsing using Google Gemini
-    Handles complex Hindi-English mixed queries
-    """
-    if not model:
-        return {
-            "success": False, 
-            "error": "Gemini AI not configured. Add GEMINI_API_KEY to .env file"
-        }
-    
-    try:
-        current_datetime = datetime.now()
-        current_time_str = current_datetime.strftime("%Y-%m-%d %H:%M")
-        tomorrow = (current_datetime + timedelta(days=1)).strftime("%Y-%m-%d")
-        
-        prompt = f"""
-You are a smart reminder parser. Current date and time is: {current_time_str} (IST - Indian Standard Time)
+if GEMINI_RECORD and model is not None and GEMINI_BACKEND != "fake":
+    from utils.fakes import RecordingGeminiModel
+    model = RecordingGeminiModel(model, GEMINI_RECORDINGS_PATH)
+    logger.info(f"📼 Recording Gemini answers to {GEMINI_RECORDINGS_PATH}")
 
-Parse this reminder request and extract the exact datetime and reminder text:
-"{text}"
+NOT_UNDERSTOOD_ERROR = "Date/time samajh nahi aaya. Clear mention karo jaise: '10 min baad', 'kal 5pm'"
 
-IMPORTANT RULES:
+def _prompt_rules(current_datetime: datetime) -> str:
+    """Hinglish rules + defaults - single aur batch dono prompts mein same"""
+    tomorrow = (current_datetime + timedelta(days=1)).strftime("%Y-%m-%d")
+    
+    return f"""IMPORTANT RULES:
 1. Parse both Hindi and English words
 2. Common Hindi time words:
    - "baad" = after/later
@@ -82,7 +87,35 @@ IMPORTANT RULES:
    - If "raat/night" mentioned, use 9:00 PM
    - If only "kal/tomorrow" mentioned without time, assume 9:00 AM
    - If only "aaj/today" mentioned without time, assume 9:00 AM
+"""
+
+def _prompt_examples(current_datetime: datetime) -> str:
+    tomorrow = (current_datetime + timedelta(days=1)).strftime("%Y-%m-%d")
+    
+    return f"""Examples:
+Input: "10 min baad meeting attend karna"
+Output: {{"datetime": "{(current_datetime + timedelta(minutes=10)).strftime('%Y-%m-%d %H:%M')}", "reminder_text": "meeting attend karna"}}
+
+Input: "kal shaam 5 baje gym jana"
+Output: {{"datetime": "{tomorrow} 17:00", "reminder_text": "gym jana"}}
+
+Input: "tomorrow morning call karna"
+Output: {{"datetime": "{tomorrow} 09:00", "reminder_text": "call karna"}}
+
+Input: "2 hours baad khaana banana"
+Output: {{"datetime": "{(current_datetime + timedelta(hours=2)).strftime('%Y-%m-%d %H:%M')}", "reminder_text": "khaana banana"}}
+"""
+
+def build_prompt(text: str, current_datetime: datetime) -> str:
+    current_time_str = current_datetime.strftime("%Y-%m-%d %H:%M")
+    
+    prompt = f"""
+You are a smart reminder parser. Current date and time is: {current_time_str} (IST - Indian Standard Time)
 
+Parse this reminder request and extract the exact datetime and reminder text:
+"{text}"
+
+{_prompt_rules(current_datetime)}
 5. Return ONLY a valid JSON object (no markdown, no extra text):
 {{
   "datetime": "YYYY-MM-DD HH:MM",
@@ -95,75 +128,350 @@ IMPORTANT RULES:
   "reminder_text": null
 }}
 
-Examples:
-Input: "10 min baad meeting attend karna"
-Output: {{"datetime": "{(current_datetime + timedelta(minutes=10)).strftime('%Y-%m-%d %H:%M')}", "reminder_text": "meeting attend karna"}}
+{_prompt_examples(current_datetime)}
+Now parse: "{text}"
+"""
+    return prompt
 
-Input: "kal shaam 5 baje gym jana"
-Output: {{"datetime": "{tomorrow} 17:00", "reminder_text": "gym jana"}}
+BATCH_INPUTS_MARKER = "Inputs (JSON array):"
 
-Input: "tomorrow morning call karna"
-Output: {{"datetime": "{tomorrow} 09:00", "reminder_text": "call karna"}}
+def build_batch_prompt(texts, current_datetime: datetime) -> str:
+    """
+    Kai reminder texts ek prompt mein: rules/examples ek hi baar jaate hain,
+    inputs aur outputs JSON arrays (same order, same length).
+    """
+    current_time_str = current_datetime.strftime("%Y-%m-%d %H:%M")
+    
+    prompt = f"""
+You are a smart reminder parser. Current date and time is: {current_time_str} (IST - Indian Standard Time)
 
-Input: "2 hours baad khaana banana"
-Output: {{"datetime": "{(current_datetime + timedelta(hours=2)).strftime('%Y-%m-%d %H:%M')}", "reminder_text": "khaana banana"}}
+Parse EACH reminder request in the JSON array at the end and extract the exact datetime and reminder text for each one.
 
-Now parse: "{text}"
+{_prompt_rules(current_datetime)}
+5. Return ONLY a valid JSON array (no markdown, no extra text) with exactly one object per input, in the same order:
+[
+  {{"datetime": "YYYY-MM-DD HH:MM", "reminder_text": "the actual reminder message without time info, trimmed, in original language, preserving case, spaces, and punctuation"}}
+]
+
+6. For an input you cannot parse, put {{"datetime": null, "reminder_text": null}} at its position.
+
+{_prompt_examples(current_datetime)}
+{BATCH_INPUTS_MARKER}
+{json.dumps(list(texts), ensure_ascii=False)}
 """
-        
-        logger.info(f"Sending to Gemini: {text}")
-        
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
-        
-        logger.info(f"Gemini response: {result_text}")
-        
-        # Clean markdown code blocks if present
-        result_text = result_text.replace('``````', '').strip()
-        
-        # Parse JSON response
+    return prompt
+
+def interpret_response(result_text: str) -> dict:
+    """Gemini ka JSON answer reminder result dict mein convert karo"""
+    logger.info(f"Gemini response: {result_text}")
+    
+    # Clean markdown code blocks if present
+    result_text = result_text.replace('``````', '').strip()
+    
+    try:
         parsed = json.loads(result_text)
-        
-        if not parsed.get("datetime") or not parsed.get("reminder_text"):
-            logger.warning("Gemini returned null values")
-            return {
-                "success": False, 
-                "error": "Date/time samajh nahi aaya. Clear mention karo jaise: '10 min baad', 'kal 5pm'"
-            }
-        
-        # Convert to datetime object
-        reminder_dt = datetime.strptime(parsed["datetime"], "%Y-%m-%d %H:%M")
-        
-        # Validate future time
-        if reminder_dt <= datetime.now():
-            logger.warning(f"Gemini returned past time: {reminder_dt}")
-            return {
-                "success": False, 
-                "error": "Ye time already nikal gaya hai. Future time do."
-            }
-        
-        logger.info(f"✅ Gemini successfully parsed: {reminder_dt}")
-        
-        return {
-            "success": True,
-            "datetime": reminder_dt,
-            "reminder_text": parsed["reminder_text"].strip(),
-            "parsed_as": "🤖 Gemini AI"
-        }
-        
     except json.JSONDecodeError as e:
         logger.error(f"JSON parse error: {e}, Response: {result_text}")
         return {
             "success": False,
             "error": "AI response parse nahi hua, dobara try karo"
         }
+    return interpret_parsed(parsed)
+
+def interpret_parsed(parsed: dict) -> dict:
+    if not parsed.get("datetime") or not parsed.get("reminder_text"):
+        logger.warning("Gemini returned null values")
+        return {
+            "success": False, 
+            "error": NOT_UNDERSTOOD_ERROR
+        }
+    
+    # Convert to datetime object
+    reminder_dt = datetime.strptime(parsed["datetime"], "%Y-%m-%d %H:%M")
+    
+    # Validate future time
+    if reminder_dt <= datetime.now():
+        logger.warning(f"Gemini returned past time: {reminder_dt}")
+        return {
+            "success": False, 
+            "error": "Ye time already nikal gaya hai. Future time do."
+        }
+    
+    logger.info(f"✅ Gemini successfully parsed: {reminder_dt}")
+    
+    return {
+        "success": True,
+        "datetime": reminder_dt,
+        "reminder_text": parsed["reminder_text"].strip(),
+        "parsed_as": "🤖 Gemini AI"
+    }
+
+# ========== ASYNC CLIENT ==========
+
+class GeminiUnavailable(Exception):
+    """Circuit open hai - Gemini call kiye bina fail"""
+
+class CircuitBreaker:
+    """
+    Lagataar `failure_threshold` failures ke baad open ho jata hai aur
+    `cooldown` seconds tak calls skip karta hai. Cooldown ke baad ek trial
+    call jaane deta hai (half-open); woh pass hui to phir se closed.
+    """
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+    
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+    
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at < self.cooldown or self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+    
+    def release_trial(self):
+        """Trial call cancel hui (shutdown / batch cancel) - result na success na failure"""
+        self._trial_in_flight = False
+    
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+    
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning(
+                    f"⚠️ Gemini circuit open after {self.failures} failures, "
+                    f"skipping for {self.cooldown}s"
+                )
+            self.opened_at = time.monotonic()
+
+breaker = CircuitBreaker(GEMINI_BREAKER_FAILURES, GEMINI_BREAKER_COOLDOWN_SECONDS)
+_slots = None
+
+def _release_slot(call):
+    _slots.release()
+    # Timeout ke baad fail hua thread: exception yahin consume karo (warning na aaye)
+    if not call.cancelled():
+        call.exception()
+
+async def _call_model(prompt: str):
+    await _slots.acquire()
+    try:
+        if hasattr(model, "generate_content_async"):
+            call = asyncio.ensure_future(model.generate_content_async(prompt))
+            threaded = False
+        else:
+            call = asyncio.ensure_future(asyncio.to_thread(model.generate_content, prompt))
+            threaded = True
+    except BaseException:
+        _slots.release()
+        raise
+    # Slot tab tak busy jab tak call sach mein khatam na ho: timeout pe thread
+    # chalta rehta hai, use free slot gina to concurrency cap toot jaata hai
+    call.add_done_callback(_release_slot)
+    if threaded:
+        return await asyncio.shield(call)
+    return await call
+
+async def generate_async(prompt: str) -> str:
+    """
+    Ek Gemini call: concurrency cap, hard timeout aur circuit breaker ke saath.
+    Timeout slot ke wait + call dono pe hai. Circuit open ho ya call fail ho
+    to exception raise karta hai.
+    """
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+    
+    if not breaker.allow():
+        raise GeminiUnavailable("circuit open")
+    
+    try:
+        response = await asyncio.wait_for(_call_model(prompt), timeout=GEMINI_TIMEOUT_SECONDS)
+        text = response.text.strip()
+    except asyncio.CancelledError:
+        # BaseException hai - warna half-open trial flag hamesha ke liye set reh jaata
+        breaker.release_trial()
+        raise
+    except Exception:
+        breaker.record_failure()
+        raise
+    
+    breaker.record_success()
+    return text
+
+async def parse_with_gemini_async(text: str) -> dict:
+    """
+    Advanced AI parsing using Google Gemini (async - event loop block nahi karta).
+    Timeout / circuit open pe turant wahi Hinglish error lautata hai.
+    """
+    if not model:
+        return {
+            "success": False, 
+            "error": "Gemini AI not configured. Add GEMINI_API_KEY to .env file"
+        }
+    
+    try:
+        logger.info(f"Sending to Gemini (async): {text}")
+        result_text = await generate_async(build_prompt(text, datetime.now()))
+    except GeminiUnavailable:
+        logger.warning("Gemini circuit open, skipping AI parse")
+        return {"success": False, "error": NOT_UNDERSTOOD_ERROR}
+    except asyncio.TimeoutError:
+        logger.error(f"Gemini timed out after {GEMINI_TIMEOUT_SECONDS}s")
+        return {"success": False, "error": NOT_UNDERSTOOD_ERROR}
     except Exception as e:
         logger.error(f"Gemini parsing error: {e}")
+        return {"success": False, "error": NOT_UNDERSTOOD_ERROR}
+    
+    try:
+        return interpret_response(result_text)
+    except ValueError as e:
+        logger.error(f"Gemini returned bad datetime: {e}")
+        return {"success": False, "error": NOT_UNDERSTOOD_ERROR}
+
+# ========== MICRO-BATCHING ==========
+
+def interpret_batch_response(result_text: str, expected: int):
+    """
+    Batch answer ko per-input results mein todo. Array malformed ho ya
+    length match na kare to None (caller single calls pe wapas jaata hai).
+    """
+    logger.info(f"Gemini batch response: {result_text}")
+    result_text = result_text.replace('```json', '').replace('```', '').strip()
+    
+    try:
+        parsed = json.loads(result_text)
+    except json.JSONDecodeError as e:
+        logger.error(f"Batch JSON parse error: {e}")
+        return None
+    if not isinstance(parsed, list) or len(parsed) != expected:
+        logger.error(f"Batch answer shape mismatch: expected {expected} items")
+        return None
+    
+    results = []
+    for item in parsed:
+        if not isinstance(item, dict):
+            results.append({"success": False, "error": NOT_UNDERSTOOD_ERROR})
+            continue
+        try:
+            results.append(interpret_parsed(item))
+        except ValueError as e:
+            logger.error(f"Gemini returned bad datetime: {e}")
+            results.append({"success": False, "error": NOT_UNDERSTOOD_ERROR})
+    return results
+
+class GeminiBatcher:
+    """
+    Fallback parses ko `window` seconds tak collect karke ek prompt mein
+    bhejta hai (max `max_size` texts). Har caller ko apna result milta hai.
+    Ek hi request ho, ya batch answer kharab aaye, to single calls.
+    """
+    def __init__(self, window: float, max_size: int):
+        self.window = window
+        self.max_size = max_size
+        self._pending = []
+        self._flush_task = None
+        self._inflight = set()
+        self.calls = 0
+        self.batched_items = 0
+        self.fallbacks = 0
+    
+    async def parse(self, text: str) -> dict:
+        if self.window <= 0 or self.max_size <= 1:
+            self.calls += 1
+            return await parse_with_gemini_async(text)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((text, future))
+        
+        if len(self._pending) >= self.max_size:
+            self._flush_now()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        return await future
+    
+    def _take_pending(self):
+        batch, self._pending = self._pending, []
+        return batch
+    
+    def _flush_now(self):
+        if self._flush_task is not None:
+            # Window timer abhi so raha hai - uska batch yahin flush ho raha hai
+            self._flush_task.cancel()
+            self._flush_task = None
+        task = asyncio.create_task(self._flush(self._take_pending()))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+    
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+        self._flush_task = None
+        await self._flush(self._take_pending())
+    
+    async def _flush(self, batch):
+        if not batch:
+            return
+        texts = [text for text, _ in batch]
+        try:
+            results = await self._run(texts)
+        except Exception as e:
+            logger.error(f"Gemini batch error: {e}")
+            results = [{"success": False, "error": NOT_UNDERSTOOD_ERROR}] * len(batch)
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+    
+    async def _run(self, texts):
+        if len(texts) == 1:
+            self.calls += 1
+            return [await parse_with_gemini_async(texts[0])]
+        if not model:
+            return await asyncio.gather(*(parse_with_gemini_async(text) for text in texts))
+        
+        logger.info(f"Sending batch of {len(texts)} to Gemini")
+        self.calls += 1
+        try:
+            result_text = await generate_async(build_batch_prompt(texts, datetime.now()))
+        except (GeminiUnavailable, asyncio.TimeoutError) as e:
+            logger.warning(f"Gemini batch skipped: {e!r}")
+            return [{"success": False, "error": NOT_UNDERSTOOD_ERROR}] * len(texts)
+        
+        results = interpret_batch_response(result_text, len(texts))
+        if results is not None:
+            self.batched_items += len(texts)
+            return results
+        
+        # Batch answer kaam ka nahi - har text alag se
+        self.fallbacks += 1
+        self.calls += len(texts)
+        return await asyncio.gather(*(parse_with_gemini_async(text) for text in texts))
+    
+    def stats(self) -> dict:
         return {
-            "success": False,
-            "error": f"AI error: {str(e)}"
+            "calls": self.calls,
+            "batched_items": self.batched_items,
+            "fallbacks": self.fallbacks,
         }
 
+batcher = GeminiBatcher(GEMINI_BATCH_WINDOW_MS / 1000, GEMINI_BATCH_MAX_SIZE)
+
+async def parse_with_gemini_batched(text: str) -> dict:
+    """parse_with_gemini_async, par micro-batcher ke through"""
+    return await batcher.parse(text)
+
 def is_gemini_available() -> bool:
     """Check if Gemini is configured and available"""
     return model is not None
@@ -1,7 +1,7 @@
 import logging
 import sys
 
-def setup_logging():
+def setup_logging(stream=None):
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
     
@@ -10,8 +10,8 @@ def setup_logging():
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
-    # Sirf console handler 
-    console_handler = logging.StreamHandler(sys.stdout)
+    # Sirf console handler (admin CLI stderr deta hai - stdout pe export data jaata hai)
+    console_handler = logging.StreamHandler(stream or sys.stdout)
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
     
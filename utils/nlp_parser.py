@@ -1,306 +1,374 @@
 import re
 import logging
+import time
 from datetime import datetime, timedelta
-import dateparser
+
+import async_db
+from config import (
+    PARSE_CACHE_MAX_ENTRIES, PARSE_CACHE_TTL_SECONDS, SEMANTIC_CACHE_MAX_ENTRIES,
+)
+from database import to_epoch
+from utils.parse_cache import ParseCache, apply_rule
+from utils.parse_service import parse_service
 
 logger = logging.getLogger(__name__)
 
-def parse_natural_reminder(text: str) -> dict:
-    """
-    Natural language se reminder parse karo
-    Multi-step parsing: Regex → dateparser → Gemini AI
-    """
-    
-    # Hinglish to English mapping
-    hinglish_replacements = {
-        r'\bbaad\b': 'after',
-        r'\bpehle\b': 'before',
-        r'\bkal\b': 'tomorrow',
-        r'\bparso\b': 'day after tomorrow',
-        r'\baaj\b': 'today',
-        r'\bsubah\b': 'morning',
-        r'\bshaam\b': 'evening',
-        r'\braat\b': 'night',
-        r'\bdopahar\b': 'afternoon',
-        r'\bmin\b': 'minutes',
-        r'\bghante\b': 'hours',
-        r'\bdin\b': 'days',
-        r'\bhafta\b': 'week',
-        r'\bmahina\b': 'month',
+# ========== HINGLISH NORMALIZER ==========
+# Ek hi tokenizer pass: har word lookup table se replace (14 re.sub nahi)
+
+HINGLISH_WORDS = {
+    'baad': 'after',
+    'pehle': 'before',
+    'kal': 'tomorrow',
+    'parso': 'day after tomorrow',
+    'aaj': 'today',
+    'subah': 'morning',
+    'shaam': 'evening',
+    'raat': 'night',
+    'dopahar': 'afternoon',
+    'min': 'minutes',
+    'ghante': 'hours',
+    'din': 'days',
+    'hafta': 'week',
+    'mahina': 'month',
+}
+
+_WORD_RE = re.compile(r'\w+')
+
+def _replace_word(match) -> str:
+    word = match.group()
+    return HINGLISH_WORDS.get(word, word)
+
+def normalize_hinglish(text: str) -> str:
+    """Lowercase + Hinglish words ko English mein, single pass"""
+    return _WORD_RE.sub(_replace_word, text.lower())
+
+# ========== TEMPLATE BUILDERS ==========
+# Har builder ko template ke groups, template ka poora match aur `now` milta hai
+
+def _success(target_dt: datetime, reminder_text: str, parsed_as: str) -> dict:
+    return {
+        "success": True,
+        "datetime": target_dt,
+        "reminder_text": reminder_text,
+        "parsed_as": parsed_as,
     }
+
+def _time_passed(error: str = "Ye time already nikal gaya hai") -> dict:
+    return {"success": False, "error": error}
+
+def _build_minutes_after(groups, full_match, now):
+    minutes = int(groups[0])
+    return _success(now + timedelta(minutes=minutes), groups[3].strip(),
+                    f"⚡ Regex: {minutes} minutes baad")
+
+def _build_hours_after(groups, full_match, now):
+    hours = int(groups[0])
+    return _success(now + timedelta(hours=hours), groups[3].strip(),
+                    f"⚡ Regex: {hours} hours baad")
+
+def _build_days_after(groups, full_match, now):
+    days = int(groups[0])
+    return _success(now + timedelta(days=days), groups[3].strip(),
+                    f"⚡ Regex: {days} days baad")
+
+def _build_tomorrow_exact_time(groups, full_match, now):
+    hour = int(groups[1])
+    minute = int(groups[2])
     
-    processed_text = text.lower()
+    # PM/AM detection from suffix
+    if 'pm' in full_match.lower():
+        if hour < 12:
+            hour += 12
+    elif 'am' in full_match.lower():
+        if hour == 12:
+            hour = 0
     
-    # Hinglish ko English mein convert karo
-    for hindi, english in hinglish_replacements.items():
-        processed_text = re.sub(hindi, english, processed_text, flags=re.IGNORECASE)
+    # Validate hour
+    if hour >= 24:
+        hour = hour % 24
     
-    logger.info(f"Original: {text} | Processed: {processed_text}")
+    tomorrow = now + timedelta(days=1)
+    target_dt = tomorrow.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return _success(target_dt, groups[3].strip(), f"⚡ Regex: kal {hour}:{minute:02d}")
+
+def _build_tomorrow_time(groups, full_match, now):
+    hour = int(groups[1])
+    time_suffix = groups[2]
     
-    # ========== STEP 1: IMPROVED REGEX PATTERNS (ORDER MATTERS!) ==========
+    # PM/AM detection
+    if time_suffix and ('pm' in time_suffix.lower() or 'baje' in time_suffix.lower()):
+        if hour < 12:
+            hour += 12
+    elif time_suffix and 'am' in time_suffix.lower():
+        if hour == 12:
+            hour = 0
     
-    patterns = [
-        # Relative time - highest priority
-        (r'(\d+)\s*(min|minute|minutes)\s*(baad|after|later)\s+(.+)', 'minutes_after'),
-        (r'(\d+)\s*(ghante|hours?|hrs?)\s*(baad|after|later)\s+(.+)', 'hours_after'),
-        (r'(\d+)\s*(din|days?)\s*(baad|after|later)\s+(.+)', 'days_after'),
-        
-        # Tomorrow with exact time (HH:MM format) - before simple time
-        (r'(kal|tomorrow)\s+(?:raat|night|ko)?\s*(\d{1,2}):(\d{2})\s*(?:pe|baje|pm|am)?\s+(.+)', 'tomorrow_exact_time'),
-        
-        # Tomorrow with hour only
-        (r'(kal|tomorrow)\s+(?:raat|night|shaam|evening|subah|morning)?\s*(\d+)\s*(baje|pm|am)\s+(.+)', 'tomorrow_time'),
-        
-        # Today night time
-        (r'(aaj|today)\s+(?:raat|night)\s+(\d+)\s*(baje|pm|am)?\s+(.+)', 'today_night_time'),
-        
-        # Today with time
-        (r'(aaj|today)\s+(\d+)\s*(baje|pm|am)?\s+(.+)', 'today_time'),
-        
-        # Exact time format HH:MM (without day) - check if it's for today
-        (r'^(\d{1,2}):(\d{2})\s+(.+)', 'exact_time_today'),
+    # Validate
+    if hour >= 24:
+        hour = hour % 24
+    
+    tomorrow = now + timedelta(days=1)
+    target_dt = tomorrow.replace(hour=hour, minute=0, second=0, microsecond=0)
+    return _success(target_dt, groups[3].strip(), f"⚡ Regex: kal {hour}:00")
+
+def _build_today_night_time(groups, full_match, now):
+    hour = int(groups[1])
+    
+    # Night = PM
+    if hour < 12:
+        hour += 12
+    
+    if hour >= 24:
+        hour = 23
+    
+    target_dt = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if target_dt <= now:
+        return _time_passed("Ye time aaj already nikal gaya hai")
+    return _success(target_dt, groups[3].strip(), f"⚡ Regex: aaj raat {hour}:00")
+
+def _build_today_time(groups, full_match, now):
+    hour = int(groups[1])
+    time_suffix = groups[2]
+    
+    if time_suffix and ('pm' in time_suffix.lower() or 'baje' in time_suffix.lower()):
+        if hour < 12:
+            hour += 12
+    
+    if hour >= 24:
+        hour = hour % 24
+    
+    target_dt = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if target_dt <= now:
+        return _time_passed("Ye time aaj already nikal gaya hai")
+    return _success(target_dt, groups[3].strip(), f"⚡ Regex: aaj {hour}:00")
+
+def _build_exact_time_today(groups, full_match, now):
+    hour = int(groups[0])
+    minute = int(groups[1])
+    
+    # Validate
+    if hour >= 24:
+        hour = hour % 24
+    
+    target_dt = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target_dt <= now:
+        return _time_passed()
+    return _success(target_dt, groups[2].strip(), f"⚡ Regex: aaj {hour}:{minute:02d}")
+
+def _build_time_today(groups, full_match, now):
+    hour = int(groups[0])
+    time_suffix = groups[1].lower()
+    
+    if 'pm' in time_suffix:
+        if hour < 12:
+            hour += 12
+        elif hour >= 12:
+            hour = hour % 12 + 12
+    elif 'am' in time_suffix:
+        if hour == 12:
+            hour = 0
+    
+    # Validate
+    if hour >= 24:
+        hour = 23
+    
+    target_dt = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if target_dt <= now:
+        return _time_passed()
+    return _success(target_dt, groups[2].strip(), f"⚡ Regex: aaj {hour}:00")
+
+# ========== TEMPLATE ENGINE ==========
+# (name, pattern, builder) - ORDER MATTERS! Upar wale templates ki priority zyada
+
+TEMPLATES = [
+    # Relative time - highest priority
+    ('minutes_after', r'(\d+)\s*(min|minute|minutes)\s*(baad|after|later)\s+(.+)', _build_minutes_after),
+    ('hours_after', r'(\d+)\s*(ghante|hours?|hrs?)\s*(baad|after|later)\s+(.+)', _build_hours_after),
+    ('days_after', r'(\d+)\s*(din|days?)\s*(baad|after|later)\s+(.+)', _build_days_after),
+    
+    # Tomorrow with exact time (HH:MM format) - before simple time
+    ('tomorrow_exact_time', r'(kal|tomorrow)\s+(?:raat|night|ko)?\s*(\d{1,2}):(\d{2})\s*(?:pe|baje|pm|am)?\s+(.+)', _build_tomorrow_exact_time),
+    
+    # Tomorrow with hour only
+    ('tomorrow_time', r'(kal|tomorrow)\s+(?:raat|night|shaam|evening|subah|morning)?\s*(\d+)\s*(baje|pm|am)\s+(.+)', _build_tomorrow_time),
+    
+    # Today night time
+    ('today_night_time', r'(aaj|today)\s+(?:raat|night)\s+(\d+)\s*(baje|pm|am)?\s+(.+)', _build_today_night_time),
+    
+    # Today with time
+    ('today_time', r'(aaj|today)\s+(\d+)\s*(baje|pm|am)?\s+(.+)', _build_today_time),
+    
+    # Exact time format HH:MM (without day) - check if it's for today
+    ('exact_time_today', r'^(\d{1,2}):(\d{2})\s+(.+)', _build_exact_time_today),
+    
+    # Simple time (5pm, 10am) - lowest priority
+    ('time_today', r'^(\d+)\s*(pm|am|baje)\s+(.+)', _build_time_today),
+]
+
+def _compile_templates(templates):
+    """
+    Saare templates ek alternation regex mein. Har alternative `^.*?` se
+    shuru hota hai (anchored templates ke liye sirf `^`), isliye regex engine
+    pehle template ko har position pe try karta hai, phir doosre ko -
+    bilkul purane "pattern by pattern re.search" wali priority.
+    """
+    parts = []
+    dispatch = {}
+    group_index = 1
+    for name, pattern, builder in templates:
+        if pattern.startswith('^'):
+            body, prefix = pattern[1:], ''
+        else:
+            body, prefix = pattern, '(?s:.*?)'
+        parts.append(f'{prefix}(?P<{name}>{body})')
         
-        # Simple time (5pm, 10am) - lowest priority
-        (r'^(\d+)\s*(pm|am|baje)\s+(.+)', 'time_today'),
-    ]
+        n_groups = re.compile(body).groups
+        dispatch[name] = (group_index + 1, group_index + 1 + n_groups, builder)
+        group_index += 1 + n_groups
+    
+    return re.compile('^(?:' + '|'.join(parts) + ')', re.IGNORECASE), dispatch
+
+_TEMPLATE_RE, _TEMPLATE_DISPATCH = _compile_templates(TEMPLATES)
+# Builder fail hone pe (jaise 25:99) baaki templates alag-alag try hote hain
+_TEMPLATE_FALLBACKS = [
+    (name, re.compile(pattern, re.IGNORECASE), builder)
+    for name, pattern, builder in TEMPLATES
+]
+_TEMPLATE_INDEX = {name: i for i, (name, _, _) in enumerate(TEMPLATES)}
+
+def _build_template(name: str, builder, groups, matched: str, now: datetime):
+    try:
+        return builder(groups, matched, now)
+    except (ValueError, IndexError) as e:
+        logger.error(f"Regex parse error in {name}: {e}")
+        return None
+
+def match_template(processed_text: str, now: datetime):
+    """Normalized text pe template engine chalao. Match nahi hua to None"""
+    match = _TEMPLATE_RE.match(processed_text)
+    if not match:
+        return None
+    
+    name = match.lastgroup
+    first, last, builder = _TEMPLATE_DISPATCH[name]
+    logger.info(f"✅ Regex matched: {name}")
+    
+    result = _build_template(name, builder, match.groups()[first - 1:last - 1], match.group(name), now)
+    if result is not None:
+        return result
     
-    for pattern, pattern_type in patterns:
-        match = re.search(pattern, processed_text, re.IGNORECASE)
+    # Rare path: purane loop ki tarah agla pattern try karo
+    for name, pattern, builder in _TEMPLATE_FALLBACKS[_TEMPLATE_INDEX[name] + 1:]:
+        match = pattern.search(processed_text)
         if match:
-            logger.info(f"✅ Regex matched: {pattern_type}")
-            
-            try:
-                if pattern_type == 'minutes_after':
-                    minutes = int(match.group(1))
-                    reminder_text = match.group(4).strip()
-                    target_dt = datetime.now() + timedelta(minutes=minutes)
-                    
-                    return {
-                        "success": True,
-                        "datetime": target_dt,
-                        "reminder_text": reminder_text,
-                        "parsed_as": f"⚡ Regex: {minutes} minutes baad"
-                    }
-                
-                elif pattern_type == 'hours_after':
-                    hours = int(match.group(1))
-                    reminder_text = match.group(4).strip()
-                    target_dt = datetime.now() + timedelta(hours=hours)
-                    
-                    return {
-                        "success": True,
-                        "datetime": target_dt,
-                        "reminder_text": reminder_text,
-                        "parsed_as": f"⚡ Regex: {hours} hours baad"
-                    }
-                
-                elif pattern_type == 'days_after':
-                    days = int(match.group(1))
-                    reminder_text = match.group(4).strip()
-                    target_dt = datetime.now() + timedelta(days=days)
-                    
-                    return {
-                        "success": True,
-                        "datetime": target_dt,
-                        "reminder_text": reminder_text,
-                        "parsed_as": f"⚡ Regex: {days} days baad"
-                    }
-                
-                elif pattern_type == 'tomorrow_exact_time':
-                    hour = int(match.group(2))
-                    minute = int(match.group(3))
-                    reminder_text = match.group(4).strip()
-                    
-                    # PM/AM detection from suffix
-                    full_match = match.group(0)
-                    if 'pm' in full_match.lower():
-                        if hour < 12:
-                            hour += 12
-                    elif 'am' in full_match.lower():
-                        if hour == 12:
-                            hour = 0
-                    
-                    # Validate hour
-                    if hour >= 24:
-                        hour = hour % 24
-                    
-                    tomorrow = datetime.now() + timedelta(days=1)
-                    target_dt = tomorrow.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                    
-                    return {
-                        "success": True,
-                        "datetime": target_dt,
-                        "reminder_text": reminder_text,
-                        "parsed_as": f"⚡ Regex: kal {hour}:{minute:02d}"
-                    }
-                
-                elif pattern_type == 'tomorrow_time':
-                    hour = int(match.group(2))
-                    time_suffix = match.group(3)
-                    reminder_text = match.group(4).strip()
-                    
-                    # PM/AM detection
-                    if time_suffix and ('pm' in time_suffix.lower() or 'baje' in time_suffix.lower()):
-                        if hour < 12:
-                            hour += 12
-                    elif time_suffix and 'am' in time_suffix.lower():
-                        if hour == 12:
-                            hour = 0
-                    
-                    # Validate
-                    if hour >= 24:
-                        hour = hour % 24
-                    
-                    tomorrow = datetime.now() + timedelta(days=1)
-                    target_dt = tomorrow.replace(hour=hour, minute=0, second=0, microsecond=0)
-                    
-                    return {
-                        "success": True,
-                        "datetime": target_dt,
-                        "reminder_text": reminder_text,
-                        "parsed_as": f"⚡ Regex: kal {hour}:00"
-                    }
-                
-                elif pattern_type == 'today_night_time':
-                    hour = int(match.group(2))
-                    time_suffix = match.group(3)
-                    reminder_text = match.group(4).strip()
-                    
-                    # Night = PM
-                    if hour < 12:
-                        hour += 12
-                    
-                    if hour >= 24:
-                        hour = 23
-                    
-                    target_dt = datetime.now().replace(hour=hour, minute=0, second=0, microsecond=0)
-                    
-                    if target_dt <= datetime.now():
-                        return {
-                            "success": False,
-                            "error": "Ye time aaj already nikal gaya hai"
-                        }
-                    
-                    return {
-                        "success": True,
-                        "datetime": target_dt,
-                        "reminder_text": reminder_text,
-                        "parsed_as": f"⚡ Regex: aaj raat {hour}:00"
-                    }
-                
-                elif pattern_type == 'today_time':
-                    hour = int(match.group(2))
-                    time_suffix = match.group(3)
-                    reminder_text = match.group(4).strip()
-                    
-                    if time_suffix and ('pm' in time_suffix.lower() or 'baje' in time_suffix.lower()):
-                        if hour < 12:
-                            hour += 12
-                    
-                    if hour >= 24:
-                        hour = hour % 24
-                    
-                    target_dt = datetime.now().replace(hour=hour, minute=0, second=0, microsecond=0)
-                    
-                    if target_dt <= datetime.now():
-                        return {
-                            "success": False,
-                            "error": "Ye time aaj already nikal gaya hai"
-                        }
-                    
-                    return {
-                        "success": True,
-                        "datetime": target_dt,
-                        "reminder_text": reminder_text,
-                        "parsed_as": f"⚡ Regex: aaj {hour}:00"
-                    }
-                
-                elif pattern_type == 'exact_time_today':
-                    hour = int(match.group(1))
-                    minute = int(match.group(2))
-                    reminder_text = match.group(3).strip()
-                    
-                    # Validate
-                    if hour >= 24:
-                        hour = hour % 24
-                    
-                    target_dt = datetime.now().replace(hour=hour, minute=minute, second=0, microsecond=0)
-                    
-                    if target_dt <= datetime.now():
-                        return {
-                            "success": False,
-                            "error": "Ye time already nikal gaya hai"
-                        }
-                    
-                    return {
-                        "success": True,
-                        "datetime": target_dt,
-                        "reminder_text": reminder_text,
-                        "parsed_as": f"⚡ Regex: aaj {hour}:{minute:02d}"
-                    }
-                
-                elif pattern_type == 'time_today':
-                    hour = int(match.group(1))
-                    time_suffix = match.group(2).lower()
-                    reminder_text = match.group(3).strip()
-                    
-                    if 'pm' in time_suffix:
-                        if hour < 12:
-                            hour += 12
-                        elif hour >= 12:
-                            hour = hour % 12 + 12
-                    elif 'am' in time_suffix:
-                        if hour == 12:
-                            hour = 0
-                    
-                    # Validate
-                    if hour >= 24:
-                        hour = 23
-                    
-                    target_dt = datetime.now().replace(hour=hour, minute=0, second=0, microsecond=0)
-                    
-                    if target_dt <= datetime.now():
-                        return {
-                            "success": False,
-                            "error": "Ye time already nikal gaya hai"
-                        }
-                    
-                    return {
-                        "success": True,
-                        "datetime": target_dt,
-                        "reminder_text": reminder_text,
-                        "parsed_as": f"⚡ Regex: aaj {hour}:00"
-                    }
-            
-            except (ValueError, IndexError) as e:
-                logger.error(f"Regex parse error in {pattern_type}: {e}")
-                continue  # Try next pattern
+            logger.info(f"✅ Regex matched: {name}")
+            result = _build_template(name, builder, match.groups(), match.group(0), now)
+            if result is not None:
+                return result
+    return None
+
+# ========== DATE SPAN DETECTOR ==========
+# Ek scan mein text ke shuru/end ka date-time span dhoondo, phir sirf us span
+# pe dateparser chalao (pehle har word-prefix pe 10 baar chalta tha)
+
+DATEPARSER_SETTINGS = {
+    'PREFER_DATES_FROM': 'future',
+    'TIMEZONE': 'Asia/Kolkata',
+    'RETURN_AS_TIMEZONE_AWARE': False,
+}
+DATEPARSER_LANGUAGES = ['en', 'hi']
+
+# Normalized (English) text ke time words
+TIME_WORDS = frozenset("""
+    today tomorrow tonight day after before next this coming at on in by
+    morning evening night afternoon noon midnight am pm baje oclock o'clock
+    minute minutes min mins hour hours hr hrs day days week weeks month months
+    year years later ago weekend
+    monday tuesday wednesday thursday friday saturday sunday
+    mon tue tues wed thu thur thurs fri sat sun
+    january february march april may june july august september october
+    november december jan feb mar apr jun jul aug sep sept oct nov dec
+""".split())
+
+# Span ke end pe ye connector words date ka hissa nahi hote
+_SPAN_CONNECTORS = frozenset({'at', 'on', 'in', 'by', 'this', 'next', 'coming'})
+
+_TIME_TOKEN_RE = re.compile(
+    r'\d{1,2}(?::\d{2})?(?:am|pm)?'        # 5, 5pm, 10:30, 10:30pm
+    r'|\d{1,2}(?:st|nd|rd|th)'              # 21st
+    r'|\d{1,4}[-/.]\d{1,2}(?:[-/.]\d{1,4})?'  # 2025-11-18, 18/11
+)
+
+# Span mein kam se kam ek aisa token chahiye - akela number / ordinal
+# ("room 5", "chapter 3", "on 1st") dateparser month samajh leta hai
+_TIME_ANCHOR_RE = re.compile(
+    r'\d{1,2}(?::\d{2})?(?:am|pm)'          # 5pm, 10:30pm
+    r'|\d{1,2}:\d{2}'                      # 10:30
+    r'|\d{1,4}[-/.]\d{1,2}(?:[-/.]\d{1,4})?'  # 2025-11-18, 18/11
+)
+
+def _is_time_token(word: str) -> bool:
+    return word in TIME_WORDS or _TIME_TOKEN_RE.fullmatch(word) is not None
+
+def _has_time_anchor(words) -> bool:
+    return any(
+        (word in TIME_WORDS and word not in _SPAN_CONNECTORS)
+        or _TIME_ANCHOR_RE.fullmatch(word) is not None
+        for word in words
+    )
+
+def _trim_connectors(words):
+    while words and words[-1] in _SPAN_CONNECTORS:
+        words = words[:-1]
+    return words
+
+def find_date_spans(words, max_span: int = 10):
+    """
+    (date_words, text_words) candidates, zyada likely pehle:
+    shuru ka time-token span, end ka span, ya shuru ka span ek word chhota.
+    Har candidate pe ek dateparser call lagti hai - maximum 2.
+    """
+    prefix = 0
+    while prefix < min(max_span, len(words)) and _is_time_token(words[prefix]):
+        prefix += 1
     
-    # ========== STEP 2: Try dateparser library ==========
+    suffix = 0
+    while (suffix < min(max_span, len(words) - prefix)
+           and _is_time_token(words[len(words) - 1 - suffix])):
+        suffix += 1
     
-    logger.info("🔍 Trying dateparser library...")
+    candidates = []
+    if prefix:
+        candidates.append((_trim_connectors(words[:prefix]), words[prefix:]))
+    if suffix:
+        candidates.append((_trim_connectors(words[len(words) - suffix:]),
+                           _trim_connectors(words[:len(words) - suffix])))
+    elif prefix > 1:
+        candidates.append((_trim_connectors(words[:prefix - 1]), words[prefix - 1:]))
     
-    words = processed_text.split()
+    return [(d, t) for d, t in candidates if d and _has_time_anchor(d)][:2]
+
+def parse_with_dateparser(processed_text: str, original_text: str):
+    """Date span dateparser se parse karo. Kuch nahi mila to None"""
+    # Lazy import: dateparser + locale data load hone mein startup ka
+    # sabse bada hissa jaata tha (warm_up() background mein pehle hi kar deta hai)
+    import dateparser
     
-    for i in range(min(10, len(words)), 0, -1):
-        date_part = ' '.join(words[:i])
-        potential_text = ' '.join(words[i:]).strip()
-        
+    for date_words, text_words in find_date_spans(processed_text.split()):
+        date_part = ' '.join(date_words)
         parsed_date = dateparser.parse(
             date_part,
-            settings={
-                'PREFER_DATES_FROM': 'future',
-                'TIMEZONE': 'Asia/Kolkata',
-                'RETURN_AS_TIMEZONE_AWARE': False,
-            },
-            languages=['en', 'hi']
+            settings=DATEPARSER_SETTINGS,
+            languages=DATEPARSER_LANGUAGES,
         )
         
         if parsed_date and parsed_date > datetime.now():
             logger.info(f"✅ dateparser success: {date_part} -> {parsed_date}")
             
+            potential_text = ' '.join(text_words).strip()
             if not potential_text or len(potential_text) < 3:
-                potential_text = text
+                potential_text = original_text
             
             return {
                 "success": True,
@@ -308,16 +376,139 @@ def parse_natural_reminder(text: str) -> dict:
                 "reminder_text": potential_text,
                 "parsed_as": f"📚 dateparser: {parsed_date.strftime('%Y-%m-%d %H:%M')}"
             }
+    return None
+
+def warm_up(gemini: bool = True) -> dict:
+    """
+    Heavy parsers pehle se load karo (dateparser locales, Gemini SDK), taaki
+    pehle /remind user ko cold import ka wait na karna pade. Blocking hai -
+    background thread mein chalao. Return: har step ke seconds.
+    """
+    timings = {}
+    
+    start = time.perf_counter()
+    import dateparser
+    dateparser.parse("tomorrow 5pm", settings=DATEPARSER_SETTINGS, languages=DATEPARSER_LANGUAGES)
+    timings["dateparser"] = time.perf_counter() - start
+    
+    if gemini:
+        start = time.perf_counter()
+        try:
+            import utils.gemini_parser  # noqa: F401
+        except ImportError as e:
+            logger.warning(f"Gemini module not loaded: {e}")
+        timings["gemini"] = time.perf_counter() - start
+    
+    return timings
+
+parse_cache = ParseCache(
+    normalize_hinglish, TIME_WORDS,
+    max_entries=PARSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=PARSE_CACHE_TTL_SECONDS,
+)
+
+async def parse_natural_reminder_async(text: str) -> dict:
+    """
+    Natural language se reminder parse karo.
+    Cache → Regex + dateparser → semantic cache → Gemini AI (async, timeout
+    + circuit breaker ke saath) - event loop block nahi hota
+    """
+    now = datetime.now()
+    template = parse_cache.template(text)
+    
+    cached = parse_cache.lookup(text, now, template)
+    if cached is not None:
+        logger.info(f"♻️ Parse cache hit: {template.key}")
+        return cached
+    
+    # PARSE_WORKERS > 0 pe process pool mein, warna inline
+    result = await parse_service.parse_local(text)
+    if result is not None:
+        parse_cache.store(text, now, result, template)
+        return result
+    
+    if template is not None:
+        result = await _semantic_lookup(template, now)
+        if result is not None:
+            return result
+    
+    result = await _gemini_fallback_async(text)
+    rule = parse_cache.store(text, now, result, template)
+    if rule is not None:
+        await _semantic_save(template, rule, now)
+    return result
+
+# ========== SEMANTIC CACHE (SQLite) ==========
+# Gemini answers se seekhe rules DB mein rehte hain - same shape wala agla
+# text (restart ke baad bhi) bina network call ke parse ho jata hai
+
+async def _semantic_lookup(template, now: datetime):
+    try:
+        rule = await async_db.get_parse_rule(template.key)
+        if rule is None:
+            return None
+        result = apply_rule(rule, template, now)
+        if result is None:
+            return None
+        await async_db.record_parse_rule_hit(template.key, to_epoch(now))
+    except Exception as e:
+        logger.error(f"Semantic cache lookup failed: {e}")
+        return None
+    
+    parse_cache.remember(template, rule)
+    logger.info(f"💾 Semantic cache hit, Gemini skipped: {template.key}")
+    return result
+
+async def _semantic_save(template, rule: dict, now: datetime):
+    try:
+        await async_db.save_parse_rule(
+            template.key, rule, to_epoch(now), SEMANTIC_CACHE_MAX_ENTRIES
+        )
+    except Exception as e:
+        logger.error(f"Semantic cache save failed: {e}")
+
+def parse_local(text: str):
+    """
+    Regex + dateparser (bina network ke). Result dict (success ya error),
+    ya None agar dono se kuch nahi mila aur Gemini try karna chahiye.
+    """
+    processed_text = normalize_hinglish(text)
+    logger.info(f"Original: {text} | Processed: {processed_text}")
     
-    # ========== STEP 3: Fallback to Gemini AI ==========
+    # ========== STEP 1: COMPILED TEMPLATE ENGINE ==========
     
-    logger.info("🤖 Trying Gemini AI as final fallback...")
+    result = match_template(processed_text, datetime.now())
+    if result is not None:
+        return result
+    
+    # ========== STEP 2: Try dateparser library ==========
+    
+    logger.info("🔍 Trying dateparser library...")
+    
+    return parse_with_dateparser(processed_text, text)
+
+# ========== STEP 3: Fallback to Gemini AI ==========
+
+def _not_understood() -> dict:
+    return {
+        "success": False,
+        "error": "Date/time samajh nahi aaya. 😕\n\n"
+                 "Clear mention karo jaise:\n"
+                 "• 10 min baad meeting\n"
+                 "• kal shaam 5 baje gym\n"
+                 "• tomorrow 11:50 pm call\n"
+                 "• 2 hours baad khaana\n\n"
+                 "Ya /remindstep se step-by-step set karo"
+    }
+
+async def _gemini_fallback_async(text: str) -> dict:
+    logger.info("🤖 Trying Gemini AI (async) as final fallback...")
     
     try:
-        from utils.gemini_parser import parse_with_gemini, is_gemini_available
+        from utils.gemini_parser import parse_with_gemini_batched, is_gemini_available
         
         if is_gemini_available():
-            gemini_result = parse_with_gemini(text)
+            gemini_result = await parse_with_gemini_batched(text)
             if gemini_result["success"]:
                 logger.info("✅ Gemini AI successfully parsed")
                 return gemini_result
@@ -330,15 +521,4 @@ def parse_natural_reminder(text: str) -> dict:
     except Exception as e:
         logger.error(f"Gemini error: {e}")
     
-    # ========== All methods failed ==========
-    
-    return {
-        "success": False,
-        "error": "Date/time samajh nahi aaya. 😕\n\n"
-                 "Clear mention karo jaise:\n"
-                 "• 10 min baad meeting\n"
-                 "• kal shaam 5 baje gym\n"
-                 "• tomorrow 11:50 pm call\n"
-                 "• 2 hours baad khaana\n\n"
-                 "Ya /remindstep se step-by-step set karo"
-    }
+    return _not_understood()
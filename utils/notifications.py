@@ -1,12 +1,149 @@
+import asyncio
 import logging
 import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
-from config import GMAIL_EMAIL, GMAIL_APP_PASSWORD
+from config import (
+    GMAIL_EMAIL, GMAIL_APP_PASSWORD, SMTP_HOST, SMTP_PORT, SMTP_USE_SSL,
+    SMTP_POOL_SIZE, SMTP_TIMEOUT_SECONDS, SMTP_NOOP_AFTER_SECONDS,
+    SMTP_MAX_IDLE_SECONDS, SMTP_BACKEND, SMTP_SINK_CONNECT_DELAY_SECONDS,
+)
 
 logger = logging.getLogger(__name__)
 
+# Connection toot gaya ho to naye connection pe dobara try karne layak errors
+_STALE_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+class SMTPPool:
+    """
+    Logged-in SMTP sessions ka pool. Har email pe naya TLS handshake + login
+    karne ki jagah idle connection reuse hota hai; zyada der idle raha to
+    NOOP se check, aur stale nikla to reconnect.
+    """
+    def __init__(self, host: str, port: int, use_ssl: bool, username: str,
+                 password: str, size: int, timeout: float = SMTP_TIMEOUT_SECONDS):
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.username = username
+        self.password = password
+        self.sender = username or "reminder-bot@localhost"
+        self.timeout = timeout
+        self._idle = []  # (server, last_used) - LIFO, taaki warm connection pehle mile
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+    
+    def _open(self):
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        server = smtp_class(self.host, self.port, timeout=self.timeout)
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        logger.info(f"Opened SMTP connection to {self.host}:{self.port}")
+        return server
+    
+    @staticmethod
+    def _discard(server):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+    
+    def _is_alive(self, server, last_used: float) -> bool:
+        idle_for = time.monotonic() - last_used
+        if idle_for > SMTP_MAX_IDLE_SECONDS:
+            return False
+        if idle_for > SMTP_NOOP_AFTER_SECONDS:
+            try:
+                return server.noop()[0] == 250
+            except Exception:
+                return False
+        return True
+    
+    def _acquire(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                server, last_used = self._idle.pop()
+            if self._is_alive(server, last_used):
+                return server
+            self._discard(server)
+        return self._open()
+    
+    @contextmanager
+    def connection(self):
+        """Pool se ek live connection lo; kaam ke baad wapas pool mein"""
+        self._slots.acquire()
+        server = None
+        try:
+            server = self._acquire()
+            yield server
+        except Exception:
+            if server is not None:
+                self._discard(server)
+                server = None
+            raise
+        finally:
+            if server is not None:
+                with self._lock:
+                    self._idle.append((server, time.monotonic()))
+            self._slots.release()
+    
+    def send_many(self, messages):
+        """
+        (to, MIMEMultipart) list ek hi connection pe bhejo.
+        Beech mein connection toota to baaki messages naye connection pe.
+        """
+        pending = list(messages)
+        reconnected = False
+        while pending:
+            try:
+                with self.connection() as server:
+                    while pending:
+                        to, msg = pending[0]
+                        server.sendmail(self.sender, to, msg.as_string())
+                        pending.pop(0)
+            except _STALE_ERRORS:
+                if reconnected:
+                    raise
+                reconnected = True
+                logger.warning("SMTP connection stale, reconnecting")
+    
+    def send(self, to: str, msg):
+        self.send_many([(to, msg)])
+    
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            self._discard(server)
+
+if SMTP_BACKEND == "sink":
+    # Offline mode: emails in-process sink mein, Gmail tak kuch nahi jaata
+    from utils.fakes import SMTPSink
+    smtp_sink = SMTPSink(connect_delay=SMTP_SINK_CONNECT_DELAY_SECONDS).start()
+    smtp_pool = SMTPPool(
+        *smtp_sink.address, use_ssl=False, username=None, password=None,
+        size=SMTP_POOL_SIZE,
+    )
+else:
+    smtp_sink = None
+    smtp_pool = SMTPPool(
+        SMTP_HOST, SMTP_PORT, SMTP_USE_SSL, GMAIL_EMAIL, GMAIL_APP_PASSWORD,
+        size=SMTP_POOL_SIZE,
+    )
+
+# Blocking smtplib calls yahan chalti hain, event loop pe nahi.
+# Pool size jitne workers: har worker ke paas ek SMTP connection
+_email_executor = ThreadPoolExecutor(
+    max_workers=SMTP_POOL_SIZE, thread_name_prefix="smtp"
+)
+
 def send_email_otp(email: str, otp: str):
     """Gmail SMTP se email OTP bhejo"""
     try:
@@ -40,9 +177,7 @@ def send_email_otp(email: str, otp: str):
         html_part = MIMEText(html_body, 'html')
         msg.attach(html_part)
         
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-            server.login(GMAIL_EMAIL, GMAIL_APP_PASSWORD)
-            server.sendmail(GMAIL_EMAIL, email, msg.as_string())
+        smtp_pool.send(email, msg)
         
         logger.info(f"Email OTP sent to {email}")
         print(f"✅ Email OTP sent to {email}")
@@ -81,12 +216,23 @@ def send_email_reminder(email: str, text: str):
         html_part = MIMEText(html_body, 'html')
         msg.attach(html_part)
         
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-            server.login(GMAIL_EMAIL, GMAIL_APP_PASSWORD)
-            server.sendmail(GMAIL_EMAIL, email, msg.as_string())
+        smtp_pool.send(email, msg)
         
         logger.info(f"Email reminder sent to {email}")
         print(f"✅ Reminder email sent to {email}")
     except Exception as e:
         logger.error(f"Failed to send email reminder to {email}: {e}")
         print(f"❌ Email reminder failed: {e}")
+        raise
+
+# ========== ASYNC WRAPPERS ==========
+
+async def send_email_otp_async(email: str, otp: str):
+    """send_email_otp, SMTP worker thread pe - event loop block nahi hota"""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_email_executor, send_email_otp, email, otp)
+
+async def send_email_reminder_async(email: str, text: str):
+    """send_email_reminder, SMTP worker thread pe - event loop block nahi hota"""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_email_executor, send_email_reminder, email, text)
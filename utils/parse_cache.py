@@ -0,0 +1,291 @@
+"""
+/remind parse cache.
+
+Key normalized template hota hai: numbers "#" slots ban jaate hain aur
+reminder text "*" slot, jaise "10 min baad meeting" -> "# minutes after *".
+Value absolute datetime nahi, ek rule hai (relative offset, ya day offset /
+weekday + hour/minute), jo hit pe current time pe dobara anchor hota hai -
+regex, dateparser ya Gemini chalaye bina.
+"""
+import re
+import time
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+SLOT_NUMBER = '#'
+SLOT_TEXT = '*'
+
+_DIGITS_RE = re.compile(r'\d+')
+# Number wale tokens jinke shape cache ho sakte hain (5, 5pm, 10:30, 10:30pm)
+_TIME_SHAPES = frozenset({'#', '#am', '#pm', '#:#', '#:#am', '#:#pm'})
+# Absolute dates (18 november) ka rule relative nahi banta - cache mat karo
+_MONTH_WORDS = frozenset("""
+    january february march april may june july august september october
+    november december jan feb mar apr jun jul aug sep sept oct nov dec
+""".split())
+_WEEKDAYS = {
+    'monday': 0, 'mon': 0, 'tuesday': 1, 'tue': 1, 'tues': 1,
+    'wednesday': 2, 'wed': 2, 'thursday': 3, 'thu': 3, 'thur': 3, 'thurs': 3,
+    'friday': 4, 'fri': 4, 'saturday': 5, 'sat': 5, 'sunday': 6, 'sun': 6,
+}
+# Ye words dikhe to pehle relative offset rule try hota hai
+_RELATIVE_CUES = frozenset({
+    'after', 'later', 'minute', 'minutes', 'min', 'mins', 'hour', 'hours',
+    'hr', 'hrs', 'days', 'week', 'weeks',
+})
+_OFFSET_UNITS = (60, 3600, 86400, 7 * 86400)
+# Hinglish filler jo time phrase ka hissa hote hain ("kal ko 5 baje pe")
+_FILLER_WORDS = frozenset({'baje', 'ko', 'pe', 'ke', 'se', 'tak'})
+
+class Template:
+    """Ek input ka skeleton + slot values"""
+    __slots__ = ("key", "numbers", "text_original", "text_processed", "weekday")
+    
+    def __init__(self, key, numbers, text_original, text_processed, weekday):
+        self.key = key
+        self.numbers = numbers
+        self.text_original = text_original
+        self.text_processed = text_processed
+        self.weekday = weekday
+
+def build_template(text: str, normalize, time_words):
+    """
+    Text ko template mein todo. Exactly ek text slot hona chahiye aur koi
+    absolute date nahi - warna None (cache nahi hoga).
+    """
+    parts, numbers = [], []
+    text_original, text_processed = [], []
+    text_runs = 0
+    weekday = None
+    
+    for token in text.split():
+        norm = normalize(token)
+        if _DIGITS_RE.search(norm):
+            shape = _DIGITS_RE.sub(SLOT_NUMBER, norm)
+            if shape not in _TIME_SHAPES:
+                return None
+            numbers.extend(int(n) for n in _DIGITS_RE.findall(norm))
+            parts.append(shape)
+        elif norm in _MONTH_WORDS:
+            return None
+        elif norm in time_words or norm in _FILLER_WORDS or ' ' in norm:
+            if norm in _WEEKDAYS:
+                weekday = _WEEKDAYS[norm]
+            parts.append(norm)
+        else:
+            if not parts or parts[-1] != SLOT_TEXT:
+                parts.append(SLOT_TEXT)
+                text_runs += 1
+            text_original.append(token)
+            text_processed.append(norm)
+    
+    if text_runs != 1:
+        return None
+    return Template(
+        ' '.join(parts), tuple(numbers),
+        ' '.join(text_original), ' '.join(text_processed), weekday,
+    )
+
+def _hour_class(hour: int):
+    """1-11 aur 13-23 alag classes (am/pm shift inhi pe alag hota hai); 0/12 ambiguous"""
+    if 1 <= hour <= 11:
+        return 'lo'
+    if 13 <= hour <= 23:
+        return 'hi'
+    return None
+
+def _anchored_ok(template: Template, rule: dict) -> bool:
+    """
+    Anchored/weekday rule ka structure sahi hai? Minute slot sirf clock token
+    (10:30) se aata hai, aur relative phrases ("2 weeks baad") ka rule sirf
+    offset ho sakta hai - warna number ka coincidental match cache mein
+    galat rule bana deta hai. Persistent cache se aaye purane rules bhi
+    isi se guzarte hain.
+    """
+    key_parts = template.key.split()
+    if set(key_parts) & _RELATIVE_CUES:
+        return False
+    if rule["minute_slot"] is not None and not any('#:#' in part for part in key_parts):
+        return False
+    return True
+
+def infer_rule(template: Template, now: datetime, result: dict):
+    """
+    Successful parse se rule nikalo. Rule dict JSON-serializable hota hai
+    (persistent cache mein bhi store ho sake). Kuch fit nahi hua to None.
+    """
+    target = result["datetime"]
+    source = result.get("parsed_as", "").split(":")[0].strip()
+    reminder_text = result["reminder_text"].strip()
+    matches_original = reminder_text == template.text_original
+    matches_processed = reminder_text == template.text_processed
+    if matches_original and matches_processed:
+        # Dono same (lowercase input) - jo parser ne diya wahi: Gemini original
+        # case rakhta hai, regex / dateparser processed text lautate hain
+        text_source = 'original' if 'Gemini' in source else 'processed'
+    elif matches_original:
+        text_source = 'original'
+    elif matches_processed:
+        text_source = 'processed'
+    else:
+        return None
+    
+    rule = {"text": text_source, "source": source}
+    numbers = template.numbers
+    key_words = set(template.key.split())
+    
+    if key_words & _RELATIVE_CUES and len(numbers) == 1:
+        delta = (target - now).total_seconds()
+        # Gemini "YYYY-MM-DD HH:MM" deta hai (seconds kat jaate hain) - store() ke
+        # replay check jitni 60s tolerance; regex / dateparser second-exact hain
+        tolerance = 60 if 'Gemini' in source else 5
+        for i, n in enumerate(numbers):
+            for unit in _OFFSET_UNITS:
+                if n and abs(n * unit - delta) <= tolerance:
+                    rule.update(kind='offset', slot=i, unit=unit)
+                    return rule
+    
+    # Anchored: din (offset ya weekday) + hour/minute (slot se ya fixed).
+    # 0 / 12 ambiguous hain (hour? minute? am/pm?) - aise input se seekho mat
+    if any(n in (0, 12) for n in numbers):
+        return None
+    day_delta = (target.date() - now.date()).days
+    if template.weekday is not None:
+        # Sirf agla (1-6 din) occurrence - "aaj" ya "agle hafte" wala ambiguous hai
+        if target.weekday() != template.weekday or not 1 <= day_delta <= 6:
+            return None
+        rule.update(kind='weekday', weekday=template.weekday)
+    else:
+        rule.update(kind='anchored', days=day_delta)
+    
+    rule.update(hour_slot=None, hour=target.hour, minute_slot=None, minute=target.minute)
+    for i, n in enumerate(numbers):
+        if _hour_class(n) and target.hour in (n, n + 12):
+            rule.update(hour_slot=i, hour=target.hour - n, hour_class=_hour_class(n))
+            break
+    for j, n in enumerate(numbers):
+        if j != rule["hour_slot"] and n == target.minute:
+            rule.update(minute_slot=j, minute=0)
+            break
+    
+    # Har number kisi slot mein use hona chahiye, warna rule us number ko ignore karega
+    used = {rule["hour_slot"], rule["minute_slot"]} - {None}
+    if len(used) != len(numbers) or not _anchored_ok(template, rule):
+        return None
+    return rule
+
+def apply_rule(rule: dict, template: Template, now: datetime):
+    """Rule ko current time pe anchor karo. Fit nahi hua to None"""
+    numbers = template.numbers
+    
+    if rule["kind"] == 'offset':
+        target = now + timedelta(seconds=numbers[rule["slot"]] * rule["unit"])
+    else:
+        if not _anchored_ok(template, rule):
+            return None
+        hour = rule["hour"]
+        if rule["hour_slot"] is not None:
+            n = numbers[rule["hour_slot"]]
+            if _hour_class(n) != rule["hour_class"]:
+                return None
+            hour += n
+        minute = rule["minute"]
+        if rule["minute_slot"] is not None:
+            minute = numbers[rule["minute_slot"]]
+        if not (0 <= hour < 24 and 0 <= minute < 60):
+            return None
+        
+        if rule["kind"] == 'weekday':
+            days = (rule["weekday"] - now.weekday()) % 7
+            if days == 0:
+                return None
+        else:
+            days = rule["days"]
+        target = (now + timedelta(days=days)).replace(
+            hour=hour, minute=minute, second=0, microsecond=0
+        )
+    
+    if target <= now:
+        return None
+    
+    text = template.text_original if rule["text"] == 'original' else template.text_processed
+    return {
+        "success": True,
+        "datetime": target,
+        "reminder_text": text,
+        "parsed_as": f"♻️ Cache ({rule['source']}): {target.strftime('%Y-%m-%d %H:%M')}",
+    }
+
+class ParseCache:
+    """LRU + TTL cache: template key -> rule"""
+    def __init__(self, normalize, time_words, max_entries: int, ttl_seconds: float):
+        self.normalize = normalize
+        self.time_words = time_words
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def template(self, text: str):
+        return build_template(text, self.normalize, self.time_words)
+    
+    def lookup(self, text: str, now: datetime, template: Template = None):
+        """Hit pe re-anchored result, warna None"""
+        template = template or self.template(text)
+        entry = self._entries.get(template.key) if template else None
+        
+        if entry is not None:
+            rule, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[template.key]
+            else:
+                result = apply_rule(rule, template, now)
+                if result is not None:
+                    self._entries.move_to_end(template.key)
+                    self.hits += 1
+                    return result
+        
+        self.misses += 1
+        return None
+    
+    def store(self, text: str, now: datetime, result: dict, template: Template = None):
+        """Successful parse se rule seekho; verify karo ki wahi result dobara banta hai"""
+        if not result.get("success"):
+            return None
+        template = template or self.template(text)
+        if template is None:
+            return None
+        
+        rule = infer_rule(template, now, result)
+        if rule is None:
+            return None
+        replay = apply_rule(rule, template, now)
+        if (replay is None
+                or abs((replay["datetime"] - result["datetime"]).total_seconds()) > 60):
+            return None
+        
+        self.remember(template, rule)
+        return rule
+    
+    def remember(self, template: Template, rule: dict):
+        """Pehle se verified rule (jaise persistent cache se) memory mein daalo"""
+        self._entries[template.key] = (rule, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(template.key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,124 @@
+"""
+Optional process-pool parse service.
+
+dateparser pure-Python aur CPU-bound hai; event loop thread pe chale to ek
+slow parse baaki sab users ke updates rok deta hai. PARSE_WORKERS > 0 hone pe
+regex + dateparser (nlp_parser.parse_local) alag processes mein chalta hai:
+workers start pe hi dateparser load kar lete hain, queue bounded hai aur har
+request ka timeout hai. PARSE_WORKERS = 0 pe sab pehle jaisa inline.
+"""
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from config import PARSE_WORKERS, PARSE_QUEUE_SIZE, PARSE_TIMEOUT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+def _init_worker():
+    """Worker process start hote hi dateparser + locales load (pehla parse fast ho)"""
+    from utils.nlp_parser import warm_up
+    warm_up(gemini=False)
+
+def _ping() -> int:
+    return 0
+
+def _parse_in_worker(text: str):
+    from utils.nlp_parser import parse_local
+    return parse_local(text)
+
+class ParseService:
+    """
+    parse_local() ko process pool pe chalata hai. Timeout ya pool crash pe
+    None lautata hai (caller Gemini fallback pe chala jaata hai).
+    """
+    def __init__(self, workers: int, queue_size: int, timeout: float):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._pool = None
+        self._slots = None
+        self.timeouts = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+    
+    def _ensure_pool(self):
+        if self._pool is None:
+            # spawn: bot ke threads (DB, SMTP, JobQueue) ke beech fork safe nahi
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._pool
+    
+    async def start(self) -> float:
+        """Saare workers spawn + warm karo. Return: seconds"""
+        if not self.enabled:
+            return 0.0
+        start = time.perf_counter()
+        pool = self._ensure_pool()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(pool, _ping) for _ in range(self.workers)
+        ))
+        seconds = time.perf_counter() - start
+        logger.info(f"🧵 Parse service ready: {self.workers} workers in {seconds * 1000:.1f} ms")
+        return seconds
+    
+    async def parse_local(self, text: str):
+        if not self.enabled:
+            from utils.nlp_parser import parse_local
+            return parse_local(text)
+        
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.queue_size)
+        
+        try:
+            # Timeout queue wait + parse dono pe: full queue = backpressure
+            return await asyncio.wait_for(self._submit(text), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(f"Local parse timed out after {self.timeout}s: {text}")
+            return None
+        except BrokenProcessPool:
+            logger.error("Parse worker crashed, restarting pool")
+            self.shutdown()
+            return None
+    
+    async def _submit(self, text: str):
+        await self._slots.acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            call = loop.run_in_executor(self._ensure_pool(), _parse_in_worker, text)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Timeout pe worker parse karta rehta hai - slot tab tak busy, warna
+        # PARSE_QUEUE_SIZE pool backlog ko bound nahi karta
+        call.add_done_callback(self._release_slot)
+        return await asyncio.shield(call)
+    
+    def _release_slot(self, call):
+        self._slots.release()
+        # Timed-out call ka result / exception koi nahi padhega
+        if not call.cancelled():
+            call.exception()
+    
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+    
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "timeouts": self.timeouts,
+        }
+
+parse_service = ParseService(PARSE_WORKERS, PARSE_QUEUE_SIZE, PARSE_TIMEOUT_SECONDS)
@@ -0,0 +1,196 @@
+"""
+Telegram send rate limiter.
+
+Global aur per-chat token buckets. Limit se zyada sends queue mein rukte
+hain; chats ke beech round-robin hota hai taaki ek chat ke 100 reminders
+baaki sabko na roke. Telegram RetryAfter bhejta hai to poora sender utni
+der pause hota hai aur message queue ke aage wapas lagta hai.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+
+from telegram.error import RetryAfter
+
+from config import (
+    TELEGRAM_GLOBAL_RATE, TELEGRAM_PER_CHAT_RATE, TELEGRAM_PER_CHAT_BURST,
+    TELEGRAM_MAX_RETRY_AFTER,
+)
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def delay(self, now: float) -> float:
+        """Ek token milne mein kitne seconds (0 = abhi available)"""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+    
+    def consume(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+    
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+class TelegramSendLimiter:
+    def __init__(self, global_rate: float, per_chat_rate: float, per_chat_burst: float,
+                 max_retry_after: int = TELEGRAM_MAX_RETRY_AFTER):
+        self.per_chat_rate = per_chat_rate
+        self.per_chat_burst = per_chat_burst
+        self.max_retry_after = max_retry_after
+        self._global = TokenBucket(global_rate, global_rate)
+        self._buckets = {}   # chat_id -> TokenBucket
+        self._queues = {}    # chat_id -> deque of pending sends
+        self._ready = deque()  # queued sends wale chats, round-robin order
+        self._paused_until = 0.0
+        self._wakeup = None
+        self._worker = None
+        self._inflight = set()
+    
+    def pending(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+    
+    async def send_message(self, bot, chat_id: int, text: str, **kwargs):
+        """bot.send_message jaisa hi, par rate limits ke andar queue hoke"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._enqueue(chat_id, [bot, text, kwargs, future, 0], front=False)
+        
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._worker = loop.create_task(self._run())
+        self._wakeup.set()
+        return await future
+    
+    def _enqueue(self, chat_id: int, item, front: bool):
+        queue = self._queues.get(chat_id)
+        if queue is None:
+            queue = self._queues[chat_id] = deque()
+            if front:
+                self._ready.appendleft(chat_id)
+            else:
+                self._ready.append(chat_id)
+        if front:
+            queue.appendleft(item)
+        else:
+            queue.append(item)
+    
+    def _bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._buckets[chat_id] = TokenBucket(
+                self.per_chat_rate, self.per_chat_burst
+            )
+        return bucket
+    
+    def _prune_buckets(self, now: float):
+        """Full buckets wale idle chats bhool jao - memory bounded rahe"""
+        for chat_id in [c for c, b in self._buckets.items()
+                        if c not in self._queues and b.is_full(now)]:
+            del self._buckets[chat_id]
+    
+    def _next_chat(self, now: float):
+        """Round-robin mein pehla chat jiska bucket ready hai, warna (None, min wait)"""
+        min_wait = float("inf")
+        for _ in range(len(self._ready)):
+            chat_id = self._ready.popleft()
+            wait = self._bucket(chat_id).delay(now)
+            if wait <= 0:
+                return chat_id, 0.0
+            self._ready.append(chat_id)
+            min_wait = min(min_wait, wait)
+        return None, min_wait
+    
+    async def _sleep(self, seconds: float):
+        """Sleep, par naya send aaye to jaldi jaag jao"""
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+    
+    async def _run(self):
+        sends = 0
+        while True:
+            if not self._ready:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            
+            wait = self._global.delay(now)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            
+            chat_id, wait = self._next_chat(now)
+            if chat_id is None:
+                await self._sleep(wait)
+                continue
+            
+            queue = self._queues[chat_id]
+            item = queue.popleft()
+            if queue:
+                self._ready.append(chat_id)
+            else:
+                del self._queues[chat_id]
+            
+            if item[3].cancelled():
+                continue
+            
+            self._global.consume(now)
+            self._bucket(chat_id).consume(now)
+            task = asyncio.create_task(self._send(chat_id, item))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+            
+            sends += 1
+            if sends % 1000 == 0:
+                self._prune_buckets(now)
+    
+    async def _send(self, chat_id: int, item):
+        bot, text, kwargs, future, retries = item
+        try:
+            message = await bot.send_message(chat_id=chat_id, text=text, **kwargs)
+        except RetryAfter as e:
+            retry_after = e.retry_after
+            seconds = (retry_after.total_seconds()
+                       if hasattr(retry_after, "total_seconds") else float(retry_after))
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            logger.warning(f"Telegram RetryAfter {seconds}s (chat {chat_id}), pausing sends")
+            
+            if retries >= self.max_retry_after:
+                if not future.done():
+                    future.set_exception(e)
+                return
+            item[4] = retries + 1
+            self._enqueue(chat_id, item, front=True)
+            self._wakeup.set()
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(message)
+
+telegram_limiter = TelegramSendLimiter(
+    TELEGRAM_GLOBAL_RATE, TELEGRAM_PER_CHAT_RATE, TELEGRAM_PER_CHAT_BURST,
+)